@@ -0,0 +1,78 @@
+"""Compile a game directory into a binary world cache for fast startup."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from engine.game_engine import compile_world
+from engine.loader import GameLoader
+from engine.world.regions import RegionIndex
+
+
+def show_progress(category: str, files_done: int, files_total: int):
+    end = "\n" if files_done == files_total else ""
+    print(f"\r  loading {category}: {files_done}/{files_total} files", end=end, flush=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Compile game data into a world cache",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "The cache is written next to the game directory and used\n"
+            "automatically while it matches the game's JSON files. A cache\n"
+            "written elsewhere with -o is used by passing --world-cache to\n"
+            "the game or server."
+        ),
+    )
+    arg_parser.add_argument(
+        "game_dir",
+        help="Path to game data directory",
+    )
+    arg_parser.add_argument(
+        "-o", "--output",
+        help="Cache file to write (default: <game_dir>.worldcache)",
+    )
+    arg_parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=1,
+        help="Processes to parse game files with (default: 1)",
+    )
+    arg_parser.add_argument(
+        "--regions",
+        action="store_true",
+        help="Also write the region index used by lazily loaded worlds",
+    )
+    arg_parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report files loaded per category while compiling",
+    )
+
+    args = arg_parser.parse_args()
+
+    loader = GameLoader(
+        args.game_dir,
+        workers=args.workers,
+        progress=show_progress if args.progress else None,
+    )
+    start = time.perf_counter()
+    try:
+        path = compile_world(args.game_dir, args.output, loader)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Failed to compile game: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    for stats in loader.stats.values():
+        print(f"  {stats}")
+    print(f"Wrote {path} ({path.stat().st_size / 1024:.1f} KB) in {elapsed * 1000:.0f} ms")
+    if args.regions:
+        index = RegionIndex.build(loader)
+        print(f"Wrote {index.write()} ({len(index.region_bytes)} regions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,87 @@ import sys
 from cli.text_interface import TextInterface
 from engine.game_engine import GameEngine
 from engine.parser.fallback_parser import FallbackParser
+from engine.parser.hybrid_parser import HybridParser
 
 
 def create_parser_from_args(args) -> "ParserInterface":
     """Create the appropriate parser based on CLI arguments."""
-    if args.parser == "llm":
-        if not args.model:
-            print("Error: --model is required when using --parser llm")
+    if args.parser in ("llm", "hybrid"):
+        server_url = getattr(args, "llm_server_url", None)
+        if not args.model and not server_url:
+            print(f"Error: --model is required when using --parser {args.parser}")
             sys.exit(1)
         from engine.parser.llm_parser import LLMParser
-        return LLMParser(model_path=args.model)
-    return FallbackParser()
+        if server_url:
+            from engine.parser.batching import InferenceScheduler, LlamaServerBackend
+            scheduler = InferenceScheduler(LlamaServerBackend(server_url))
+            parser = LLMParser(scheduler=scheduler, few_shot=getattr(args, "few_shot", None))
+        elif getattr(args, "llm_workers", None):
+            from engine.parser.worker_pool import LLMWorkerPool
+            pool = LLMWorkerPool(args.model, workers=args.llm_workers)
+            parser = LLMParser(scheduler=pool, few_shot=getattr(args, "few_shot", None))
+        else:
+            parser = LLMParser(model_path=args.model, few_shot=getattr(args, "few_shot", None))
+        if args.parser == "hybrid":
+            parser = HybridParser(parser)
+    else:
+        parser = FallbackParser()
+
+    if getattr(args, "intent_model", None):
+        from engine.parser.intent_parser import IntentModel, IntentParser
+        parser = IntentParser(IntentModel.load(args.intent_model), parser)
+
+    if args.parse_cache or args.parse_cache_file:
+        from engine.parser.parse_cache import CachingParser, ParseCache
+        cache = ParseCache(path=args.parse_cache_file)
+        namespace = args.model or getattr(args, "llm_server_url", None) or args.parser
+        parser = CachingParser(parser, cache, namespace=namespace)
+    return parser
+
+
+def add_few_shot_arg(arg_parser: argparse.ArgumentParser):
+    arg_parser.add_argument(
+        "--few-shot",
+        type=int,
+        metavar="K",
+        help="Prompt the LLM with the K bundled examples most like each input "
+             "instead of the fixed ones",
+    )
+
+
+def add_parse_cache_args(arg_parser: argparse.ArgumentParser):
+    arg_parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Reuse parse results for repeated commands in the same context",
+    )
+    arg_parser.add_argument(
+        "--parse-cache-file",
+        help="Also keep the parse cache in this SQLite file across restarts",
+    )
+
+
+def add_world_cache_arg(arg_parser: argparse.ArgumentParser):
+    arg_parser.add_argument(
+        "--world-cache",
+        metavar="PATH",
+        help="World cache written by 'compile -o PATH' "
+             "(default: <game_dir>.worldcache)",
+    )
+
+
+def create_interface_from_args(args) -> TextInterface:
+    """Keyboard input, or speech from a WAV file or microphone with --voice."""
+    if not args.voice:
+        return TextInterface(debug=args.debug)
+    from cli.voice import MicrophoneSource, VoiceInput, VoiceInterface, WavSource, WhisperTranscriber
+    if args.voice == "mic":
+        source = MicrophoneSource()
+    else:
+        # Played back at speaking pace, so latencies are those of live speech
+        source = WavSource(args.voice, realtime=True)
+    transcriber = WhisperTranscriber(args.whisper_model)
+    return VoiceInterface(VoiceInput(source, transcriber), debug=args.debug)
 
 
 def main():
@@ -32,13 +102,31 @@ def main():
     )
     arg_parser.add_argument(
         "--parser",
-        choices=["fallback", "llm"],
+        choices=["fallback", "llm", "hybrid"],
         default="fallback",
-        help="Parser to use (default: fallback)",
+        help="Parser to use; hybrid only calls the LLM for input the "
+             "keyword parser is unsure of (default: fallback)",
     )
     arg_parser.add_argument(
         "--model",
-        help="Path to LLM model file (required for --parser llm)",
+        help="Path to LLM model file (required for --parser llm/hybrid)",
+    )
+    arg_parser.add_argument(
+        "--intent-model",
+        help="Intent model from scripts/train_intent.py, tried before the parser",
+    )
+    add_few_shot_arg(arg_parser)
+    add_parse_cache_args(arg_parser)
+    add_world_cache_arg(arg_parser)
+    arg_parser.add_argument(
+        "--voice",
+        metavar="WAV|mic",
+        help="Speak commands instead of typing: a 16-bit WAV file, or 'mic'",
+    )
+    arg_parser.add_argument(
+        "--whisper-model",
+        default="base.en",
+        help="faster-whisper model name or path for --voice (default: base.en)",
     )
     arg_parser.add_argument(
         "--debug",
@@ -53,12 +141,12 @@ def main():
 
     args = arg_parser.parse_args()
 
-    # Create interface
-    interface = TextInterface(debug=args.debug)
-
     # Create parser
     parser = create_parser_from_args(args)
 
+    # Create interface (after the parser, which may exit on bad arguments)
+    interface = create_interface_from_args(args)
+
     # Create engine
     try:
         engine = GameEngine(
@@ -66,11 +154,26 @@ def main():
             parser=parser,
             save_dir=args.save_dir,
             debug=args.debug,
+            cache_path=args.world_cache,
         )
     except (FileNotFoundError, ValueError) as e:
         interface.show_error(f"Failed to load game: {e}")
+        interface.close()
         sys.exit(1)
 
+    # With a model behind the parser, start parsing while the player types
+    if args.parser in ("llm", "hybrid"):
+        interface.on_partial = engine.speculate
+
+    try:
+        play(engine, interface)
+    finally:
+        # Stops the microphone with --voice
+        interface.close()
+
+
+def play(engine: GameEngine, interface: TextInterface):
+    """Run the game loop until the player quits."""
     # Start game
     intro = engine.start_game()
     interface.show_title(engine.world.config.title)
@@ -83,6 +186,7 @@ def main():
             continue
 
         output = engine.process_input(input_text)
+        interface.turn_done()
 
         if output == "__QUIT__":
             # Show final score
@@ -94,6 +198,14 @@ def main():
                 rank,
             )
             interface.show_text("Thank you for playing!")
+            stats = engine.speculator.stats
+            if stats.started:
+                interface.show_debug(
+                    f"Speculative parses: {stats.hit_rate:.0%} hit rate, "
+                    f"{stats.saved_seconds * 1000:.0f} ms of parsing done before Enter"
+                )
+            for line in engine.parser.stats():
+                interface.show_debug(line)
             break
 
         if not engine.state.player_alive:
@@ -2,17 +2,33 @@
 
 from __future__ import annotations
 
+import codecs
+import os
+import select
+import sys
+from typing import Callable
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
 
+# Seconds without a keystroke after which the line so far is reported
+TYPING_PAUSE = 0.3
+
+
 class TextInterface:
-    """Rich-powered terminal interface for the game."""
+    """Rich-powered terminal interface for the game.
+
+    With ``on_partial`` set and a terminal on stdin, input is read key by
+    key and the line typed so far is passed to ``on_partial`` whenever the
+    player pauses, e.g. so the game can start parsing it.
+    """
 
     def __init__(self, debug: bool = False):
         self.console = Console()
         self.debug = debug
+        self.on_partial: Callable[[str], None] | None = None
 
     def show_title(self, title: str):
         self.console.print()
@@ -48,6 +64,9 @@ class TextInterface:
 
     def get_input(self) -> str:
         try:
+            if self.on_partial is not None and _is_posix_terminal():
+                self.console.print("[bold yellow]> [/bold yellow]", end="")
+                return self._read_keys().strip()
             result = self.console.input("[bold yellow]> [/bold yellow]")
             return result.strip()
         except EOFError:
@@ -56,6 +75,59 @@ class TextInterface:
             self.console.print()
             return "quit"
 
+    def _read_keys(self) -> str:
+        """Read one line in cbreak mode, with backspace and Ctrl-U editing."""
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        line: list[str] = []
+        reported = ""
+        escape = False
+        self.console.file.flush()
+        try:
+            tty.setcbreak(fd)
+            while True:
+                ready, _, _ = select.select([fd], [], [], TYPING_PAUSE)
+                if not ready:
+                    text = "".join(line)
+                    if text != reported:
+                        reported = text
+                        self.on_partial(text)
+                    continue
+                for char in decoder.decode(os.read(fd, 64)):
+                    if escape:
+                        # Skip cursor keys and the like: ESC [ ... letter
+                        escape = char == "[" or not char.isalpha() and char != "~"
+                    elif char == "\x1b":
+                        escape = True
+                    elif char in "\r\n":
+                        self.console.file.write("\n")
+                        return "".join(line)
+                    elif char == "\x04" and not line:
+                        raise EOFError
+                    elif char in "\x7f\b":
+                        if line:
+                            line.pop()
+                            self.console.file.write("\b \b")
+                    elif char == "\x15":
+                        self.console.file.write("\b \b" * len(line))
+                        line.clear()
+                    elif char.isprintable():
+                        line.append(char)
+                        self.console.file.write(char)
+                self.console.file.flush()
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    def turn_done(self):
+        """Called once the game has answered the last input."""
+
+    def close(self):
+        """Release input devices; called once the game is over."""
+
     def show_death(self):
         self.console.print()
         self.console.print("[bold red]   **** You have died ****[/bold red]")
@@ -67,3 +139,7 @@ class TextInterface:
         )
         self.console.print(f"This gives you the rank of {rank}.")
         self.console.print()
+
+
+def _is_posix_terminal() -> bool:
+    return os.name == "posix" and sys.stdin.isatty()
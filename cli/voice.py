@@ -0,0 +1,382 @@
+"""Voice input: streaming speech-to-text in front of the text parser.
+
+Audio comes from a WAV file or the microphone in 30 ms frames. An energy
+VAD cuts it into utterances, a background thread transcribes each one with
+faster-whisper as soon as it ends, and the game reads the transcripts like
+typed lines. Requires the ``voice`` extra (faster-whisper, plus
+sounddevice for the microphone).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import queue
+import threading
+import time
+import wave
+from array import array
+from typing import Iterator, Protocol
+
+from cli.text_interface import TextInterface
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+# Failed transcriptions in a row after which voice input gives up
+MAX_TRANSCRIPTION_ERRORS = 3
+
+
+class Utterance:
+    """One stretch of speech, its transcript and when each stage finished.
+
+    Times are ``time.perf_counter()`` values: ``ended_at`` when the VAD
+    closed the utterance, ``transcribed_at`` when its text was ready,
+    ``taken_at`` when the game picked it up.
+    """
+
+    def __init__(self, samples: array, ended_at: float):
+        self.samples = samples
+        self.ended_at = ended_at
+        self.text = ""
+        self.transcribed_at = 0.0
+        self.taken_at = 0.0
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / SAMPLE_RATE
+
+
+class Transcriber(Protocol):
+    def transcribe(self, samples: array) -> str:
+        """Text spoken in 16 kHz mono 16-bit ``samples``."""
+        ...
+
+
+class WhisperTranscriber:
+    """faster-whisper model, loaded locally once (no network after download)."""
+
+    def __init__(self, model: str = "base.en", device: str = "cpu", compute_type: str = "int8"):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError(
+                "faster-whisper is required for voice input. "
+                "Install with: pip install 'adventure-game[voice]'"
+            )
+        self.model = WhisperModel(model, device=device, compute_type=compute_type)
+
+    def transcribe(self, samples: array) -> str:
+        import numpy as np
+
+        audio = np.frombuffer(samples.tobytes(), dtype=np.int16).astype(np.float32) / 32768
+        # Utterances are already cut by our VAD; greedy decoding keeps it fast
+        segments, _ = self.model.transcribe(
+            audio, beam_size=1, language="en", without_timestamps=True
+        )
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+def read_wav(path: str) -> array:
+    """16 kHz mono 16-bit samples of a PCM WAV file, mixed down and resampled."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+        channels = f.getnchannels()
+        rate = f.getframerate()
+        samples = array("h", f.readframes(f.getnframes()))
+    if channels > 1:
+        samples = array("h", (
+            sum(samples[i:i + channels]) // channels
+            for i in range(0, len(samples), channels)
+        ))
+    if rate != SAMPLE_RATE:
+        # Linear interpolation; plenty for speech recognition
+        step = rate / SAMPLE_RATE
+        count = int(len(samples) / step)
+        resampled = array("h")
+        for n in range(count):
+            pos = n * step
+            i = int(pos)
+            nxt = samples[i + 1] if i + 1 < len(samples) else samples[i]
+            resampled.append(int(samples[i] + (nxt - samples[i]) * (pos - i)))
+        samples = resampled
+    return samples
+
+
+class WavSource:
+    """Frames of a WAV file; with ``realtime`` at the pace it was recorded."""
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.samples = read_wav(path)
+        self.realtime = realtime
+
+    def __iter__(self) -> Iterator[array]:
+        start = time.perf_counter()
+        for n, i in enumerate(range(0, len(self.samples), FRAME_SAMPLES)):
+            if self.realtime:
+                delay = start + n * FRAME_MS / 1000 - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield self.samples[i:i + FRAME_SAMPLES]
+
+
+class MicrophoneSource:
+    """Frames from an input device, until ``close``."""
+
+    def __init__(self, device: int | str | None = None):
+        try:
+            import sounddevice
+        except ImportError:
+            raise ImportError(
+                "sounddevice is required for microphone input. "
+                "Install with: pip install 'adventure-game[voice]'"
+            )
+        self._frames: queue.Queue[array | None] = queue.Queue()
+        self._stream = sounddevice.RawInputStream(
+            samplerate=SAMPLE_RATE,
+            blocksize=FRAME_SAMPLES,
+            channels=1,
+            dtype="int16",
+            device=device,
+            callback=lambda data, frames, when, status: self._frames.put(array("h", bytes(data))),
+        )
+
+    def __iter__(self) -> Iterator[array]:
+        self._stream.start()
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            yield frame
+
+    def close(self):
+        self._stream.stop()
+        self._stream.close()
+        self._frames.put(None)
+
+
+class EnergyVAD:
+    """Splits frames into utterances by RMS energy.
+
+    Speech starts when a frame is louder than ``threshold`` and ends after
+    ``min_silence_ms`` of quieter frames; bursts shorter than
+    ``min_speech_ms`` (clicks, bumps) are dropped. ``padding_ms`` of audio
+    is kept on both sides so word edges are not clipped.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 500.0,
+        min_silence_ms: int = 400,
+        min_speech_ms: int = 150,
+        padding_ms: int = 150,
+    ):
+        self.threshold = threshold
+        self.silence_frames = max(1, min_silence_ms // FRAME_MS)
+        self.speech_frames = max(1, min_speech_ms // FRAME_MS)
+        self.padding_frames = padding_ms // FRAME_MS
+        self._before: list[array] = []
+        self._current: list[array] | None = None
+        self._voiced = 0
+        self._quiet = 0
+
+    def feed(self, frame: array) -> Utterance | None:
+        """Add one frame; returns an utterance when this frame ended one."""
+        loud = _rms(frame) >= self.threshold
+        if self._current is None:
+            if loud:
+                self._current = self._before + [frame]
+                self._voiced, self._quiet = 1, 0
+            else:
+                self._before = (self._before + [frame])[-self.padding_frames:] if self.padding_frames else []
+            return None
+
+        self._current.append(frame)
+        if loud:
+            self._voiced += 1
+            self._quiet = 0
+            return None
+        self._quiet += 1
+        if self._quiet < self.silence_frames:
+            return None
+        return self._finish()
+
+    def flush(self) -> Utterance | None:
+        """End the utterance in progress, if any (end of input)."""
+        return self._finish() if self._current is not None else None
+
+    def _finish(self) -> Utterance | None:
+        frames = self._current
+        # Keep only ``padding`` of the trailing silence
+        trailing = self._quiet - self.padding_frames
+        if trailing > 0:
+            frames = frames[:-trailing]
+        self._current = None
+        self._before = []
+        if self._voiced < self.speech_frames:
+            return None
+        samples = array("h")
+        for frame in frames:
+            samples.extend(frame)
+        return Utterance(samples, time.perf_counter())
+
+
+def _rms(frame: array) -> float:
+    if not frame:
+        return 0.0
+    return math.sqrt(sum(s * s for s in frame) / len(frame))
+
+
+class VoiceInput:
+    """Runs VAD and transcription on background threads.
+
+    A listening thread reads the source and lets the VAD cut it into
+    utterances; a transcription thread transcribes each one as soon as it
+    ends. Listening goes on meanwhile, so a microphone's buffer is drained
+    and a realtime source keeps pace however long decoding takes, and the
+    game may still be handling the previous utterance. ``next_utterance``
+    returns them in order, and None once input has stopped.
+
+    An utterance that fails to transcribe is logged and skipped; after
+    MAX_TRANSCRIPTION_ERRORS failures in a row, or if the source fails,
+    input stops. ``stop_reason`` then says why, and ``error`` holds the
+    exception if there was one. ``close`` stops listening.
+    """
+
+    def __init__(self, source, transcriber: Transcriber, vad: EnergyVAD | None = None):
+        self.source = source
+        self.transcriber = transcriber
+        self.vad = vad or EnergyVAD()
+        self.stop_reason: str | None = None
+        self.error: Exception | None = None
+        self._failures = 0
+        self._closed = False
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        # Ended utterances waiting for transcription, then transcribed ones
+        self._ended: queue.Queue[Utterance | None] = queue.Queue()
+        self._utterances: queue.Queue[Utterance | None] = queue.Queue()
+        self._listener = threading.Thread(target=self._listen, name="voice-listen", daemon=True)
+        self._transcriber = threading.Thread(
+            target=self._transcribe_all, name="voice-transcribe", daemon=True
+        )
+        self._listener.start()
+        self._transcriber.start()
+
+    def next_utterance(self, timeout: float | None = None) -> Utterance | None:
+        utterance = self._utterances.get(timeout=timeout)
+        if utterance is not None:
+            utterance.taken_at = time.perf_counter()
+        return utterance
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stopped.set()
+        if hasattr(self.source, "close"):
+            self.source.close()
+
+    def _listen(self):
+        try:
+            for frame in self.source:
+                if self._stopped.is_set():
+                    return
+                self._queue_ended(self.vad.feed(frame))
+            self._queue_ended(self.vad.flush())
+        except Exception as e:
+            logger.exception("Voice input stopped")
+            self._stop(f"Voice input stopped: {e}", e)
+        finally:
+            self._ended.put(None)
+
+    def _queue_ended(self, utterance: Utterance | None):
+        if utterance is not None:
+            self._ended.put(utterance)
+
+    def _transcribe_all(self):
+        try:
+            while (utterance := self._ended.get()) is not None:
+                self._transcribe(utterance)
+            self._stop("Voice input ended.")
+        except Exception as e:
+            logger.exception("Voice input stopped")
+            self._stop(f"Voice input stopped: {e}", e)
+            self.close()
+        finally:
+            self._utterances.put(None)
+
+    def _transcribe(self, utterance: Utterance):
+        try:
+            utterance.text = self.transcriber.transcribe(utterance.samples)
+        except Exception as e:
+            self._failures += 1
+            if self._failures >= MAX_TRANSCRIPTION_ERRORS:
+                raise
+            logger.warning("Could not transcribe an utterance, still listening: %s", e)
+            return
+        self._failures = 0
+        utterance.transcribed_at = time.perf_counter()
+        if utterance.text:
+            self._utterances.put(utterance)
+
+    def _stop(self, reason: str, error: Exception | None = None):
+        """Record why input stopped; the first reason wins."""
+        with self._lock:
+            if self.stop_reason is None:
+                self.stop_reason = reason
+                self.error = error
+        self._stopped.set()
+
+
+class VoiceInterface(TextInterface):
+    """TextInterface that takes its input from a VoiceInput.
+
+    Each transcript is echoed as if typed, and after the game has answered
+    ``turn_done`` prints the utterance's latency from the end of speech:
+    transcription, waiting for the game, and the game's own turn.
+    """
+
+    def __init__(self, voice: VoiceInput, debug: bool = False):
+        super().__init__(debug=debug)
+        self.voice = voice
+        self._utterance: Utterance | None = None
+        self.latencies: list[float] = []
+
+    def get_input(self) -> str:
+        try:
+            utterance = self.voice.next_utterance()
+        except KeyboardInterrupt:
+            utterance = None
+        self._utterance = utterance
+        if utterance is None:
+            self.console.print()
+            if self.voice.error is not None:
+                self.show_error(self.voice.stop_reason)
+            elif self.voice.stop_reason:
+                self.show_text(self.voice.stop_reason)
+            return "quit"
+        self.console.print(f"[bold yellow]> [/bold yellow]{utterance.text}")
+        return utterance.text
+
+    def turn_done(self):
+        utterance = self._utterance
+        if utterance is None:
+            return
+        self._utterance = None
+        done = time.perf_counter()
+        total = done - utterance.ended_at
+        self.latencies.append(total)
+        self.console.print(
+            f"[dim]voice: {total * 1000:.0f} ms after speech ended "
+            f"(transcribe {(utterance.transcribed_at - utterance.ended_at) * 1000:.0f} ms, "
+            f"queued {(utterance.taken_at - utterance.transcribed_at) * 1000:.0f} ms, "
+            f"turn {(done - utterance.taken_at) * 1000:.0f} ms)[/dim]"
+        )
+
+    def close(self):
+        self.voice.close()
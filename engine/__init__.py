@@ -2,6 +2,6 @@
 
 from __future__ import annotations
 
-from engine.game_engine import GameEngine
+from engine.game_engine import GameEngine, GameRuntime, GameSession
 
-__all__ = ["GameEngine"]
+__all__ = ["GameEngine", "GameRuntime", "GameSession"]
@@ -7,6 +7,7 @@ from engine.actions.action_registry import ActionRegistry
 from engine.actions.action_resolver import ActionResolver, ResolvedAction
 from engine.actions.preconditions import PreconditionChecker
 from engine.actions.effects import EffectApplier
+from engine.actions.event_compiler import CompiledEvent, EventCompiler
 from engine.actions.builtin_actions import registry as builtin_registry
 
 __all__ = [
@@ -17,5 +18,7 @@ __all__ = [
     "ResolvedAction",
     "PreconditionChecker",
     "EffectApplier",
+    "CompiledEvent",
+    "EventCompiler",
     "builtin_registry",
 ]
@@ -0,0 +1,214 @@
+"""Compile event conditions and effects into pre-bound closures."""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from engine.models.enums import ConditionType, EffectType, ObjectProperty
+from engine.models.event import Condition, Effect, Event
+from engine.state.game_state import GameState
+
+# (state, verb_id, direct_object_id) -> condition holds
+ConditionFn = Callable[[GameState, Optional[str], Optional[str]], bool]
+# state -> message to display, if any
+EffectFn = Callable[[GameState], Optional[str]]
+
+
+class CompiledEvent:
+    """An event whose conditions and effects are ready-to-call closures."""
+
+    __slots__ = ("event", "conditions", "effects")
+
+    def __init__(
+        self, event: Event, conditions: list[ConditionFn], effects: list[EffectFn]
+    ):
+        self.event = event
+        self.conditions = conditions
+        self.effects = effects
+
+    def check(
+        self,
+        state: GameState,
+        verb_id: str | None = None,
+        direct_object_id: str | None = None,
+    ) -> bool:
+        for condition in self.conditions:
+            if not condition(state, verb_id, direct_object_id):
+                return False
+        return True
+
+    def apply(self, state: GameState) -> list[str]:
+        messages = []
+        for effect in self.effects:
+            msg = effect(state)
+            if msg:
+                messages.append(msg)
+        return messages
+
+
+class EventCompiler:
+    """Turns events into CompiledEvents with operands converted up front.
+
+    The closures behave exactly like PreconditionChecker.check and
+    EffectApplier.apply. Operands that fail to convert (an unknown property
+    name, a non-numeric counter value) raise the same error those would,
+    but only when the condition or effect is actually evaluated.
+    """
+
+    def compile_event(self, event: Event) -> CompiledEvent:
+        return CompiledEvent(
+            event,
+            [self.compile_condition(c) for c in event.conditions],
+            [self.compile_effect(e) for e in event.effects],
+        )
+
+    def compile_condition(self, condition: Condition) -> ConditionFn:
+        t = condition.type
+        target = condition.target
+        value = condition.value
+
+        if t == ConditionType.PLAYER_IN_ROOM:
+            return lambda state, verb_id, obj_id: state.current_room == target
+        elif t == ConditionType.PLAYER_HAS_ITEM:
+            return lambda state, verb_id, obj_id: target in state.inventory
+        elif t == ConditionType.OBJECT_IN_ROOM:
+            if value:
+                room = str(value)
+                return lambda state, verb_id, obj_id: (
+                    state.get_object_location(target) == room
+                )
+            return lambda state, verb_id, obj_id: (
+                state.get_object_location(target) == state.current_room
+            )
+        elif t == ConditionType.OBJECT_HAS_PROPERTY:
+            prop = _convert(ObjectProperty, value)
+            if isinstance(prop, _Deferred):
+                return prop
+            return lambda state, verb_id, obj_id: state.has_object_property(target, prop)
+        elif t == ConditionType.FLAG_SET:
+            return lambda state, verb_id, obj_id: target in state.flags
+        elif t == ConditionType.FLAG_NOT_SET:
+            return lambda state, verb_id, obj_id: target not in state.flags
+        elif t == ConditionType.COUNTER_GTE:
+            n = _convert(int, value)
+            if isinstance(n, _Deferred):
+                return n
+            return lambda state, verb_id, obj_id: state.counters.get(target, 0) >= n
+        elif t == ConditionType.COUNTER_LTE:
+            n = _convert(int, value)
+            if isinstance(n, _Deferred):
+                return n
+            return lambda state, verb_id, obj_id: state.counters.get(target, 0) <= n
+        elif t == ConditionType.COUNTER_EQ:
+            n = _convert(int, value)
+            if isinstance(n, _Deferred):
+                return n
+            return lambda state, verb_id, obj_id: state.counters.get(target, 0) == n
+        elif t == ConditionType.ACTION_IS:
+            return lambda state, verb_id, obj_id: verb_id == target
+        elif t == ConditionType.ACTION_TARGET_IS:
+            return lambda state, verb_id, obj_id: obj_id == target
+        return lambda state, verb_id, obj_id: False
+
+    def compile_effect(self, effect: Effect) -> EffectFn:
+        t = effect.type
+        target = effect.target
+        value = effect.value
+
+        if t == EffectType.PRINT_MESSAGE:
+            message = str(value)
+            return lambda state: message
+        elif t == EffectType.MOVE_OBJECT:
+            destination = str(value)
+            if destination == "player":
+                def move_to_player(state: GameState) -> None:
+                    state.set_object_location(target, destination)
+                    if target not in state.inventory:
+                        state.inventory.append(target)
+                    state.set_object_location(target, None)
+                return move_to_player
+
+            def move_object(state: GameState) -> None:
+                state.set_object_location(target, destination)
+                if target in state.inventory:
+                    state.inventory.remove(target)
+            return move_object
+        elif t == EffectType.MOVE_PLAYER:
+            def move_player(state: GameState) -> None:
+                state.current_room = target
+            return move_player
+        elif t == EffectType.SET_FLAG:
+            return lambda state: state.flags.add(target)
+        elif t == EffectType.CLEAR_FLAG:
+            return lambda state: state.flags.discard(target)
+        elif t == EffectType.INCREMENT_COUNTER:
+            step = _convert(int, value or 1)
+            if isinstance(step, _Deferred):
+                return step
+
+            def increment_counter(state: GameState) -> None:
+                state.counters[target] = state.counters.get(target, 0) + step
+            return increment_counter
+        elif t == EffectType.SET_COUNTER:
+            n = _convert(int, value)
+            if isinstance(n, _Deferred):
+                return n
+
+            def set_counter(state: GameState) -> None:
+                state.counters[target] = n
+            return set_counter
+        elif t == EffectType.ADD_SCORE:
+            points = _convert(int, value)
+            if isinstance(points, _Deferred):
+                return points
+
+            def add_score(state: GameState) -> None:
+                state.score += points
+            return add_score
+        elif t == EffectType.SET_OBJECT_PROPERTY:
+            prop = _convert(ObjectProperty, value)
+            if isinstance(prop, _Deferred):
+                return prop
+            return lambda state: state.add_object_property(target, prop)
+        elif t == EffectType.CLEAR_OBJECT_PROPERTY:
+            prop = _convert(ObjectProperty, value)
+            if isinstance(prop, _Deferred):
+                return prop
+            return lambda state: state.remove_object_property(target, prop)
+        elif t == EffectType.KILL_PLAYER:
+            message = str(value) if value else "You have died."
+
+            def kill_player(state: GameState) -> str:
+                state.player_alive = False
+                return message
+            return kill_player
+        elif t == EffectType.DESTROY_OBJECT:
+            def destroy_object(state: GameState) -> None:
+                state.set_object_location(target, "destroyed")
+                if target in state.inventory:
+                    state.inventory.remove(target)
+            return destroy_object
+        elif t == EffectType.REVEAL_OBJECT:
+            return lambda state: state.remove_object_property(target, ObjectProperty.HIDDEN)
+        return lambda state: None
+
+
+class _Deferred:
+    """Stands in for a closure whose operand failed to convert at compile time."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def __call__(self, *args):
+        raise self.error
+
+
+def _convert(kind: type, value: str | int | bool):
+    try:
+        if kind is int:
+            return int(value)
+        return kind(str(value))
+    except (TypeError, ValueError) as e:
+        return _Deferred(e)
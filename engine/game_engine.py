@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import itertools
+import random
+from pathlib import Path
+
 from engine.actions.action_handler import ActionResult
 from engine.actions.action_resolver import ActionResolver, ResolvedAction
 from engine.actions.builtin_actions import _get_room_description, registry as builtin_registry
@@ -12,42 +16,95 @@ from engine.loader.validator import Validator
 from engine.models.command import ParsedCommand
 from engine.models.enums import ObjectProperty, TriggerType
 from engine.parser.parser_interface import ParserContext, ParserInterface
+from engine.parser.speculation import SpeculationStats, Speculator, likely_complete
 from engine.state.game_state import GameState, NPCState, ObjectState
-from engine.state.state_manager import StateManager
+from engine.state.state_manager import SLOT_PATTERN, StateManager
 from engine.world.combat import CombatSystem
 from engine.world.darkness import DarknessSystem
 from engine.world.npc_controller import NPCController
+from engine.world.regions import RegionIndex, RegionalWorld
 from engine.world.scoring import ScoringSystem
 from engine.world.world import World
+from engine.world.world_cache import WorldCache, gc_paused
 
+# Versions for ParserContexts, unique across sessions
+_context_versions = itertools.count()
 
-class GameEngine:
-    """Main game engine that orchestrates all systems."""
 
-    def __init__(
-        self,
-        game_dir: str,
-        parser: ParserInterface,
-        save_dir: str = "saves",
-        debug: bool = False,
-    ):
-        self.parser = parser
-        self.debug = debug
-        self.state_manager = StateManager(save_dir)
+def load_game_data(game_dir: str, loader: GameLoader | None = None) -> GameData:
+    """Load and validate a game directory. Raises ValueError if invalid.
 
-        # Load and validate game data
+    Pass a configured ``loader`` for parallel loading or progress reporting.
+    """
+    if loader is None:
         loader = GameLoader(game_dir)
-        self.game_data: GameData = loader.load()
-        validator = Validator()
-        errors = validator.validate(self.game_data)
-        if errors:
-            raise ValueError(
-                f"Game data validation failed:\n"
-                + "\n".join(f"  - {e.message}" for e in errors)
-            )
+    data = loader.load()
+    validator = Validator()
+    errors = validator.validate(data)
+    if errors:
+        raise ValueError(
+            f"Game data validation failed:\n"
+            + "\n".join(f"  - {e.message}" for e in errors)
+        )
+    return data
+
+
+def load_world(
+    game_dir: str, use_cache: bool = True, cache_path: str | None = None
+) -> World:
+    """Build the World for ``game_dir``.
+
+    Uses the compiled cache written by ``compile_world`` (at ``cache_path``,
+    by default next to the game directory) when it matches the current game
+    data, otherwise loads and validates the JSON sources.
+    """
+    if use_cache:
+        world = WorldCache(game_dir, cache_path).load()
+        if world is not None:
+            return world
+    with gc_paused():
+        return World(load_game_data(game_dir))
+
+
+def load_regional_world(game_dir: str, memory_budget: int) -> RegionalWorld:
+    """Build a World that loads rooms region by region on demand.
+
+    The region index is rebuilt, after a full validating load, whenever
+    the room files no longer match it.
+    """
+    loader = GameLoader(game_dir)
+    index = RegionIndex.load(loader)
+    if index is None:
+        load_game_data(game_dir, loader)
+        index = RegionIndex.build(loader)
+        index.write()
+    with gc_paused():
+        data = loader.load(rooms=False)
+    return RegionalWorld(data, index, loader, memory_budget)
+
+
+def compile_world(
+    game_dir: str, cache_path: str | None = None, loader: GameLoader | None = None
+) -> Path:
+    """Load and validate ``game_dir`` and write its compiled world cache."""
+    with gc_paused():
+        world = World(load_game_data(game_dir, loader))
+    return WorldCache(game_dir, cache_path).write(world)
+
+
+class GameRuntime:
+    """Everything about a game that every session can share.
+
+    Built once per game directory: the World with its indexes and compiled
+    events, the stateless rule systems, and a template initial state that
+    new sessions copy instead of rebuilding.
+    """
+
+    def __init__(self, world: World):
+        self.world = world
+        self.game_data: GameData = world.data
 
         # Initialize systems
-        self.world = World(self.game_data)
         self.resolver = ActionResolver(self.world)
         self.preconditions = PreconditionChecker()
         self.effects = EffectApplier()
@@ -57,8 +114,45 @@ class GameEngine:
         self.combat = CombatSystem(self.world)
         self.action_registry = builtin_registry
 
-        # Initialize state
-        self.state = self._create_initial_state()
+        self.initial_state = self._create_initial_state()
+
+    @classmethod
+    def load(
+        cls,
+        game_dir: str,
+        region_budget: int | None = None,
+        cache_path: str | None = None,
+    ) -> GameRuntime:
+        """Load, validate and index ``game_dir`` (or read its compiled cache,
+        see ``load_world``).
+
+        With ``region_budget`` (bytes of room files), rooms are loaded
+        lazily by region instead; see RegionalWorld.
+        """
+        if region_budget is not None:
+            return cls(load_regional_world(game_dir, region_budget))
+        return cls(load_world(game_dir, cache_path=cache_path))
+
+    def new_state(self) -> GameState:
+        """Return a fresh copy of the initial game state."""
+        return self.initial_state.clone()
+
+    def new_session(
+        self,
+        parser: ParserInterface,
+        save_dir: str = "saves",
+        debug: bool = False,
+        seed: int | None = None,
+        speculation_stats: SpeculationStats | None = None,
+    ) -> GameSession:
+        return GameSession(
+            self,
+            parser,
+            save_dir=save_dir,
+            debug=debug,
+            seed=seed,
+            speculation_stats=speculation_stats,
+        )
 
     def _create_initial_state(self) -> GameState:
         """Create the initial game state from game data."""
@@ -87,6 +181,48 @@ class GameEngine:
         state.visited_rooms.add(state.current_room)
         return state
 
+
+class GameSession:
+    """One player's game on a shared GameRuntime.
+
+    Holds only what differs between players: the GameState, a private RNG
+    for NPC and combat rolls, the parser handle and the save directory.
+
+    ``speculate`` takes the line the player is still typing; when it looks
+    complete it is parsed in the background, and ``process_input`` reuses
+    that parse if the final line turns out the same (see Speculator).
+    """
+
+    def __init__(
+        self,
+        runtime: GameRuntime,
+        parser: ParserInterface,
+        save_dir: str = "saves",
+        debug: bool = False,
+        seed: int | None = None,
+        speculation_stats: SpeculationStats | None = None,
+    ):
+        self.runtime = runtime
+        self.parser = parser
+        self.speculator = Speculator(parser, speculation_stats)
+        self.debug = debug
+        self.state_manager = StateManager(save_dir)
+        self.rng = random.Random(seed)
+        self.state = runtime.new_state()
+        # Parser context of the last turn and the (state, room, version) it
+        # was built for
+        self._context: ParserContext | None = None
+        self._context_source: tuple[GameState, str, int] | None = None
+        runtime.world.attach_session(self)
+
+    @property
+    def world(self) -> World:
+        return self.runtime.world
+
+    @property
+    def scoring(self) -> ScoringSystem:
+        return self.runtime.scoring
+
     def start_game(self) -> str:
         """Start the game and return intro text + first room description."""
         parts = []
@@ -109,7 +245,37 @@ class GameEngine:
         context = self._build_parser_context()
 
         # Parse input
-        command = self.parser.parse(input_text, context)
+        command = self.speculator.parse(input_text, context)
+        return self._execute(command)
+
+    async def process_input_async(self, input_text: str) -> str:
+        """Like ``process_input`` but awaits the parser, for event-loop callers."""
+        if not self.state.player_alive:
+            return "You are dead. Type 'quit' to exit or 'restore' to load a save."
+
+        context = self._build_parser_context()
+        command = await self.speculator.parse_async(input_text, context)
+        return self._execute(command)
+
+    def speculate(self, partial_text: str) -> bool:
+        """Start parsing ``partial_text`` if it looks like a whole command.
+        Returns whether a new speculation started."""
+        context = self._speculation_context(partial_text)
+        return context is not None and self.speculator.speculate(partial_text, context)
+
+    def speculate_async(self, partial_text: str) -> bool:
+        """``speculate`` for callers on an event loop."""
+        context = self._speculation_context(partial_text)
+        return context is not None and self.speculator.speculate_async(partial_text, context)
+
+    def _speculation_context(self, partial_text: str) -> ParserContext | None:
+        if not self.state.player_alive:
+            return None
+        context = self._build_parser_context()
+        return context if likely_complete(partial_text, context) else None
+
+    def _execute(self, command: ParsedCommand) -> str:
+        """Run a parsed command against this session and return its output."""
         if self.debug:
             print(f"[DEBUG] Parsed: {command.model_dump()}")
 
@@ -119,7 +285,7 @@ class GameEngine:
             return meta_result
 
         # Resolve command to exact targets
-        resolved = self.resolver.resolve(command, self.state)
+        resolved = self.runtime.resolver.resolve(command, self.state)
         if isinstance(resolved, str):
             return resolved  # Error message
 
@@ -142,12 +308,14 @@ class GameEngine:
         )
 
         # Check darkness before action (only allow certain verbs in dark)
-        if self.darkness.is_dark(self.state, self.world):
+        if self.runtime.darkness.is_dark(self.state, self.world):
             allowed_in_dark = {"look", "inventory", "turn_on", "quit", "save", "restore", "score", "wait"}
             if resolved.verb_id not in allowed_in_dark:
                 # Going is allowed but risky
                 if resolved.verb_id != "go":
-                    return self.darkness.get_dark_description(self.state, self.world)
+                    return self.runtime.darkness.get_dark_description(
+                        self.state, self.world
+                    )
 
         # Run pre-action events
         event_messages = self._run_events(
@@ -162,7 +330,7 @@ class GameEngine:
                 return "\n".join(event_messages) if event_messages else ""
 
         # Execute action handler
-        handler = self.action_registry.get_handler(resolved.verb_id)
+        handler = self.runtime.action_registry.get_handler(resolved.verb_id)
         if not handler:
             return f"I don't know how to do that."
 
@@ -186,7 +354,7 @@ class GameEngine:
         system_messages = self._tick_systems()
 
         # Check scoring
-        _, score_msg = self.scoring.check_treasure_score(self.state)
+        _, score_msg = self.runtime.scoring.check_treasure_score(self.state)
 
         # Compile output
         all_messages = list(event_messages)
@@ -200,6 +368,23 @@ class GameEngine:
         return "\n".join(msg for msg in all_messages if msg)
 
     def _build_parser_context(self) -> ParserContext:
+        """Context for the parser, rebuilt only after something it shows changed.
+
+        Object, inventory, property and NPC changes all move
+        ``GameState.version``; together with the current room (and the
+        state object, replaced by restore) it decides whether last turn's
+        context still holds.
+        """
+        state = self.state
+        source = (state, state.current_room, state.version)
+        cached = self._context_source
+        if cached is not None and cached[0] is state and cached[1:] == source[1:]:
+            return self._context
+        self._context = self._new_parser_context()
+        self._context_source = source
+        return self._context
+
+    def _new_parser_context(self) -> ParserContext:
         """Build context for the parser with visible objects, exits, etc."""
         room = self.world.get_room(self.state.current_room)
 
@@ -237,11 +422,6 @@ class GameEngine:
                 if not exit_.hidden:
                     exits.append(exit_.direction.value)
 
-        # Valid verbs
-        verb_names = []
-        for verb in self.world.all_verbs():
-            verb_names.extend(verb.names[:2])  # First 2 names for each verb
-
         # NPCs
         npc_names = []
         for npc_id in self.state.npc_in_room(self.state.current_room):
@@ -253,20 +433,27 @@ class GameEngine:
             visible_objects=visible,
             inventory=inv_names,
             exits=exits,
-            valid_verbs=verb_names,
+            valid_verbs=self.world.parser_verbs,
             npc_names=npc_names,
             object_aliases=aliases,
+            version=next(_context_versions),
         )
 
     def _handle_meta_command(self, command: ParsedCommand) -> str | None:
         """Handle save/restore/quit commands. Returns message or None."""
-        if command.verb == "save":
+        if command.verb in ("save", "restore"):
             slot = command.direct_object or "quicksave"
+            if not SLOT_PATTERN.fullmatch(slot):
+                return (
+                    f"'{slot}' is not a valid save slot. "
+                    "Use letters, digits, '-' and '_' only."
+                )
+
+        if command.verb == "save":
             self.state_manager.save(self.state, slot)
             return f"Game saved to slot '{slot}'."
 
         if command.verb == "restore":
-            slot = command.direct_object or "quicksave"
             try:
                 self.state = self.state_manager.load(slot)
                 room_desc = _get_room_description(
@@ -281,21 +468,37 @@ class GameEngine:
     def _run_events(self, trigger: TriggerType, **context) -> list[str]:
         """Run events matching the trigger and return messages."""
         messages = []
-        events = self.world.get_events_for_trigger(trigger)
-
-        for event in events:
+        index = self.world.get_event_index(trigger)
+        verb_id = context.get("verb_id")
+        direct_object_id = context.get("direct_object_id")
+        room_id = self.state.current_room
+        positions = index.candidates(verb_id, direct_object_id, room_id)
+
+        i = 0
+        while i < len(positions):
+            pos = positions[i]
+            i += 1
+            compiled = index.compiled[pos]
+            event = compiled.event
             if event.once and event.id in self.state.fired_events:
                 continue
 
-            if self.preconditions.check_all(event.conditions, self.state, **context):
-                effect_messages = self.effects.apply_all(event.effects, self.state)
-                messages.extend(effect_messages)
+            if compiled.check(self.state, verb_id, direct_object_id):
+                messages.extend(compiled.apply(self.state))
                 if event.once:
                     self.state.fired_events.add(event.id)
 
                 if self.debug:
                     print(f"[DEBUG] Event fired: {event.id}")
 
+                # An effect moved the player: later events see the new room
+                if self.state.current_room != room_id:
+                    room_id = self.state.current_room
+                    positions = index.candidates(
+                        verb_id, direct_object_id, room_id, start=pos + 1
+                    )
+                    i = 0
+
         return messages
 
     def _tick_systems(self) -> list[str]:
@@ -311,17 +514,17 @@ class GameEngine:
         messages.extend(turn_messages)
 
         # Light source fuel
-        light_msg = self.darkness.tick_light_sources(self.state, self.world)
+        light_msg = self.runtime.darkness.tick_light_sources(self.state, self.world)
         if light_msg:
             messages.append(light_msg)
 
         # Darkness/grue check
-        dark_msg = self.darkness.tick(self.state, self.world)
+        dark_msg = self.runtime.darkness.tick(self.state, self.world)
         if dark_msg:
             messages.append(dark_msg)
 
         # NPC behavior
-        npc_messages = self.npc_controller.tick(self.state)
+        npc_messages = self.runtime.npc_controller.tick(self.state, self.rng)
         messages.extend(npc_messages)
 
         # Combat from hostile NPCs
@@ -333,8 +536,35 @@ class GameEngine:
                 and npc_state.location == self.state.current_room
                 and npc.attitude.value == "hostile"
             ):
-                combat_msg = self.combat.npc_attack_player(npc.id, self.state)
+                combat_msg = self.runtime.combat.npc_attack_player(
+                    npc.id, self.state, self.rng
+                )
                 if combat_msg:
                     messages.append(combat_msg)
 
         return messages
+
+
+class GameEngine(GameSession):
+    """Single-player engine: a GameSession with its own GameRuntime."""
+
+    def __init__(
+        self,
+        game_dir: str,
+        parser: ParserInterface,
+        save_dir: str = "saves",
+        debug: bool = False,
+        world: World | None = None,
+        cache_path: str | None = None,
+    ):
+        """Create an engine for ``game_dir``.
+
+        Pass an already built ``world`` to share it between engines;
+        ``game_dir`` is then not read again. To serve many players, build
+        one GameRuntime and call ``new_session`` instead. ``cache_path``
+        is the world cache to use, as passed to ``compile_world``.
+        """
+        if world is None:
+            world = load_world(game_dir, cache_path=cache_path)
+        super().__init__(GameRuntime(world), parser, save_dir=save_dir, debug=debug)
+        self.game_data: GameData = world.data
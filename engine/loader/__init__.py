@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from engine.loader.game_loader import GameData, GameLoader
+from engine.loader.game_loader import CategoryStats, GameData, GameLoader
 from engine.loader.validator import ValidationError, Validator
 
-__all__ = ["GameData", "GameLoader", "ValidationError", "Validator"]
+__all__ = ["CategoryStats", "GameData", "GameLoader", "ValidationError", "Validator"]
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import json
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
 
 from engine.models import (
     Event,
@@ -14,6 +18,12 @@ from engine.models import (
     VerbDefinition,
 )
 
+# Item files larger than this are decoded one array element at a time
+STREAM_THRESHOLD = 64 * 1024 * 1024
+_STREAM_CHUNK_SIZE = 1024 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITER = re.compile(r"[ \t\n\r]*[,\]]")
+
 
 class GameData:
     """Container for all loaded game data."""
@@ -35,19 +45,57 @@ class GameData:
         self.events = events
 
 
+class CategoryStats:
+    """Files, items, bytes and wall time spent loading one subdirectory."""
+
+    def __init__(self, category: str):
+        self.category = category
+        self.files = 0
+        self.items = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (
+            f"{self.category}: {self.items} items from {self.files} files "
+            f"({self.bytes / (1024 * 1024):.1f} MB) in {self.seconds * 1000:.0f} ms"
+        )
+
+
 class GameLoader:
-    """Reads a game directory and produces validated GameData."""
+    """Reads a game directory and produces validated GameData.
 
-    def __init__(self, game_dir: str | Path):
+    With ``workers`` > 1 each subdirectory's files are parsed and validated
+    in a process pool; items keep the same order as a sequential load.
+    ``progress`` is called as ``progress(category, files_done, files_total)``
+    after every file, and per-category timings are left in ``stats``.
+    """
+
+    def __init__(
+        self,
+        game_dir: str | Path,
+        workers: int = 1,
+        progress: Callable[[str, int, int], None] | None = None,
+    ):
         self.game_dir = Path(game_dir)
+        self.workers = workers
+        self.progress = progress
+        self.stats: dict[str, CategoryStats] = {}
 
-    def load(self) -> GameData:
+    def load(self, rooms: bool = True) -> GameData:
+        """Load the game; ``rooms=False`` leaves rooms to ``load_region``."""
+        self.stats = {}
         config = self._load_config()
-        rooms = self._load_items("rooms", Room)
-        objects = self._load_items("objects", GameObject)
-        npcs = self._load_items("npcs", NPC)
-        verbs = self._load_items("verbs", VerbDefinition)
-        events = self._load_items("events", Event)
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            rooms = self._load_items("rooms", Room, executor) if rooms else []
+            objects = self._load_items("objects", GameObject, executor)
+            npcs = self._load_items("npcs", NPC, executor)
+            verbs = self._load_items("verbs", VerbDefinition, executor)
+            events = self._load_items("events", Event, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
         return GameData(
             config=config,
             rooms=rooms,
@@ -57,6 +105,14 @@ class GameLoader:
             events=events,
         )
 
+    def region_files(self) -> list[Path]:
+        """The files under ``rooms/``; each one is a region of the world."""
+        return sorted((self.game_dir / "rooms").glob("*.json"))
+
+    def load_region(self, file_path: Path) -> list[Room]:
+        """Load the rooms of one file returned by ``region_files``."""
+        return _load_file(file_path, Room)
+
     def _load_config(self) -> GameConfig:
         config_path = self.game_dir / "game.json"
         if not config_path.exists():
@@ -65,17 +121,104 @@ class GameLoader:
             data = json.load(f)
         return GameConfig(**data)
 
-    def _load_items(self, subdir: str, model_class: type):
+    def _load_items(
+        self, subdir: str, model_class: type, executor: Executor | None = None
+    ):
         dir_path = self.game_dir / subdir
         items = []
         if not dir_path.exists():
             return items
-        for file_path in sorted(dir_path.glob("*.json")):
-            with open(file_path) as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                for item_data in data:
-                    items.append(model_class(**item_data))
-            else:
-                items.append(model_class(**data))
+        stats = self.stats[subdir] = CategoryStats(subdir)
+        start = time.perf_counter()
+        file_paths = sorted(dir_path.glob("*.json"))
+        if executor is not None and len(file_paths) > 1:
+            results = executor.map(
+                _load_file, file_paths, [model_class] * len(file_paths),
+                chunksize=max(1, len(file_paths) // (self.workers * 4)),
+            )
+        else:
+            results = (_load_file(p, model_class) for p in file_paths)
+        for done, (file_path, file_items) in enumerate(zip(file_paths, results), 1):
+            items.extend(file_items)
+            stats.files += 1
+            stats.bytes += file_path.stat().st_size
+            if self.progress is not None:
+                self.progress(subdir, done, len(file_paths))
+        stats.items = len(items)
+        stats.seconds = time.perf_counter() - start
         return items
+
+
+def _load_file(file_path: Path, model_class: type) -> list:
+    """Parse and validate every item in one JSON file.
+
+    Module-level so process pool workers can run it.
+    """
+    with open(file_path) as f:
+        if file_path.stat().st_size > STREAM_THRESHOLD and _peek(f) == "[":
+            # Validate as we decode so the raw dicts never exist all at once
+            return [model_class(**item_data) for item_data in iter_json_array(f)]
+        data = json.load(f)
+    if isinstance(data, list):
+        return [model_class(**item_data) for item_data in data]
+    return [model_class(**data)]
+
+
+def _peek(f: TextIO) -> str:
+    """First non-whitespace character of ``f``, which is rewound afterwards."""
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            f.seek(0)
+            return char
+
+
+def iter_json_array(f: TextIO, chunk_size: int = _STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array read incrementally from ``f``.
+
+    Only the current chunk and the element being decoded are held in memory.
+    Raises ValueError if the document is not a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def next_token() -> str:
+        # Skip whitespace, reading more input as needed; "" at end of file
+        nonlocal buf, pos, eof
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            chunk = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+    if next_token() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if next_token() == "]":
+        return
+    while True:
+        if not next_token():
+            raise ValueError("Unterminated JSON array")
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # A number may be cut short at the chunk boundary ("12" of
+                # "12.5"), so only trust it once a delimiter follows
+                if eof or buf[pos] in '{["' or _DELIMITER.match(buf, end):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            chunk = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+        yield item
+        pos = end
+        token = next_token()
+        if token == "]":
+            return
+        if token != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {token!r}")
+        pos += 1
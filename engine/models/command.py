@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class ParsedCommand(BaseModel):
@@ -17,3 +17,17 @@ class ParsedCommand(BaseModel):
     preposition: str | None = None
     raw_input: str = ""
     direction: str | None = None
+
+    # Not a field, so it stays out of the schema and of serialized commands
+    _fell_back: bool = PrivateAttr(default=False)
+
+    @property
+    def fell_back(self) -> bool:
+        """Whether a parser gave up and answered with its stand-in parse
+        (LLMParser's keyword fallback after a timeout or model error).
+        Such a command is a one-off: it must not be cached."""
+        return self._fell_back
+
+    @fell_back.setter
+    def fell_back(self, value: bool):
+        self._fell_back = value
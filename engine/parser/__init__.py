@@ -4,5 +4,14 @@ from __future__ import annotations
 
 from engine.parser.parser_interface import ParserContext, ParserInterface
 from engine.parser.fallback_parser import FallbackParser
+from engine.parser.hybrid_parser import HybridParser
+from engine.parser.intent_parser import IntentModel, IntentParser
 
-__all__ = ["ParserContext", "ParserInterface", "FallbackParser"]
+__all__ = [
+    "ParserContext",
+    "ParserInterface",
+    "FallbackParser",
+    "HybridParser",
+    "IntentModel",
+    "IntentParser",
+]
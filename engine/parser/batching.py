@@ -0,0 +1,177 @@
+"""Batch LLM requests from many sessions into shared inference calls."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Protocol
+
+from engine.parser.grammar import GrammarCache, compile_request
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerBusyError(Exception):
+    """Raised by ``submit`` when a scheduler has no room for more requests."""
+
+
+class BatchBackend(Protocol):
+    """Runs one batch of chat completions and returns their contents in order."""
+
+    max_batch: int
+
+    def complete_batch(self, requests: list[dict[str, Any]]) -> list[str]:
+        """``requests`` are create_chat_completion keyword arguments."""
+        ...
+
+
+class LlamaBackend:
+    """Runs batches on an in-process llama_cpp.Llama, one request at a time.
+
+    llama-cpp-python's high-level API decodes a single sequence per
+    context, so with ``max_batch = 1`` this backend never batches: it
+    only serializes the sessions' requests. Batched throughput needs
+    LlamaServerBackend (the server's ``--llm-server-url``).
+    """
+
+    max_batch = 1
+
+    def __init__(self, llm: Any):
+        self.llm = llm
+        self._grammars = GrammarCache()
+
+    def complete_batch(self, requests: list[dict[str, Any]]) -> list[str]:
+        return [
+            self.llm.create_chat_completion(
+                **compile_request(request, self._grammars)
+            )["choices"][0]["message"]["content"]
+            for request in requests
+        ]
+
+
+class LlamaServerBackend:
+    """Sends each batch to a llama.cpp server started with ``--parallel N``.
+
+    The batch's requests go out concurrently, and the server decodes them
+    as one batch of sequences in its shared context (continuous batching).
+    """
+
+    def __init__(self, url: str, max_batch: int = 8, timeout: float = 30.0):
+        self.url = url.rstrip("/") + "/v1/chat/completions"
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_batch)
+
+    def complete_batch(self, requests: list[dict[str, Any]]) -> list[str]:
+        return list(self._pool.map(self._post, requests))
+
+    def _post(self, request: dict[str, Any]) -> str:
+        body = json.dumps(request).encode()
+        http_request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+            data = json.load(response)
+        return data["choices"][0]["message"]["content"]
+
+
+class _Pending:
+    def __init__(self, request: dict[str, Any], deadline: float | None):
+        self.request = request
+        self.deadline = deadline
+        self.future: Future[str] = Future()
+        self.submitted = time.perf_counter()
+
+
+class InferenceScheduler:
+    """Collects chat completion requests and runs them in batches.
+
+    A worker thread waits for the first request, keeps collecting for up
+    to ``window_ms`` or until ``backend.max_batch`` requests are queued,
+    then runs them with one ``complete_batch`` call and resolves every
+    caller's future. Safe to call ``submit`` from any thread. Requests
+    whose ``deadline`` (``time.monotonic()``) passes before their batch
+    starts are dropped.
+    """
+
+    def __init__(self, backend: BatchBackend, window_ms: float = 5.0):
+        self.backend = backend
+        self.window = window_ms / 1000
+        self._queue: list[_Pending] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        # Stats
+        self.batches = 0
+        self.requests = 0
+        self.batch_sizes: dict[int, int] = {}
+        self._worker = threading.Thread(target=self._run, name="inference-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, deadline: float | None = None, **request: Any) -> Future[str]:
+        """Queue one create_chat_completion request; the future yields its content."""
+        pending = _Pending(request, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("InferenceScheduler is closed")
+            self._queue.append(pending)
+            self._cond.notify()
+        return pending.future
+
+    def close(self):
+        """Finish queued requests and stop the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if not batch:
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+            try:
+                results = self.backend.complete_batch([p.request for p in batch])
+            except Exception as e:
+                logger.warning("Inference batch of %d failed: %s", len(batch), e)
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+            for pending, result in zip(batch, results):
+                pending.future.set_result(result)
+
+    def _next_batch(self) -> list[_Pending] | None:
+        """The next batch to run, or None once closed and drained."""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0].submitted + self.window
+            max_batch = max(1, self.backend.max_batch)
+            while len(self._queue) < max_batch and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._queue[:max_batch]
+            del self._queue[:max_batch]
+        # Callers that timed out and cancelled are dropped
+        batch = [p for p in batch if p.future.set_running_or_notify_cancel()]
+        now = time.monotonic()
+        for pending in batch:
+            if pending.deadline is not None and pending.deadline <= now:
+                pending.future.set_exception(TimeoutError("LLM request expired in the queue"))
+        return [p for p in batch if not p.future.done()]
@@ -0,0 +1,86 @@
+"""Bank of parser examples that few-shot prompts are selected from.
+
+Each entry is an input as a player might type or say it and the command
+JSON the parser should produce. Object names follow the prompt's fixed
+examples (brass lantern, small mailbox, troll, ...).
+"""
+
+from __future__ import annotations
+
+from engine.parser.prompt_builder import FEW_SHOT_EXAMPLES
+
+
+def _ex(text: str, output: str) -> dict[str, str]:
+    return {"input": text, "output": output}
+
+
+EXAMPLE_BANK: list[dict[str, str]] = FEW_SHOT_EXAMPLES + [
+    # take
+    _ex("grab the lantern", '{"verb": "take", "direct_object": "brass lantern"}'),
+    _ex("get sword", '{"verb": "take", "direct_object": "elvish sword"}'),
+    _ex("pick the leaflet up", '{"verb": "take", "direct_object": "leaflet"}'),
+    _ex("take everything", '{"verb": "take", "direct_object": "all"}'),
+    _ex("take the egg from the nest", '{"verb": "take from", "direct_object": "jewel-encrusted egg", "indirect_object": "bird nest", "preposition": "from"}'),
+    # drop
+    _ex("drop the sword", '{"verb": "drop", "direct_object": "elvish sword"}'),
+    _ex("put down the lamp", '{"verb": "drop", "direct_object": "brass lantern"}'),
+    _ex("get rid of this leaflet", '{"verb": "drop", "direct_object": "leaflet"}'),
+    # go
+    _ex("n", '{"verb": "go", "direction": "north"}'),
+    _ex("head south", '{"verb": "go", "direction": "south"}'),
+    _ex("climb up the stairs", '{"verb": "go", "direction": "up"}'),
+    _ex("walk to the east", '{"verb": "go", "direction": "east"}'),
+    _ex("lets go down there", '{"verb": "go", "direction": "down"}'),
+    _ex("go nw", '{"verb": "go", "direction": "northwest"}'),
+    # look / examine / read
+    _ex("look around", '{"verb": "look"}'),
+    _ex("where am i", '{"verb": "look"}'),
+    _ex("examine the mailbox", '{"verb": "examine", "direct_object": "small mailbox"}'),
+    _ex("look at the troll", '{"verb": "examine", "direct_object": "troll"}'),
+    _ex("what does the sword look like", '{"verb": "examine", "direct_object": "elvish sword"}'),
+    _ex("check out the uh lamp", '{"verb": "examine", "direct_object": "brass lantern"}'),
+    _ex("read the leaflet", '{"verb": "read", "direct_object": "leaflet"}'),
+    _ex("what is written on the leaflet", '{"verb": "read", "direct_object": "leaflet"}'),
+    # inventory
+    _ex("i", '{"verb": "inventory"}'),
+    _ex("what am i carrying", '{"verb": "inventory"}'),
+    _ex("check my stuff", '{"verb": "inventory"}'),
+    # open / close / unlock
+    _ex("open mailbox", '{"verb": "open", "direct_object": "small mailbox"}'),
+    _ex("can you open the door", '{"verb": "open", "direct_object": "wooden door"}'),
+    _ex("shut the mailbox", '{"verb": "close", "direct_object": "small mailbox"}'),
+    _ex("close the door behind me", '{"verb": "close", "direct_object": "wooden door"}'),
+    _ex("unlock the grate with the key", '{"verb": "unlock", "direct_object": "grating", "indirect_object": "skeleton key", "preposition": "with"}'),
+    _ex("use the key on the grate", '{"verb": "unlock", "direct_object": "grating", "indirect_object": "skeleton key", "preposition": "on"}'),
+    # turn on / off
+    _ex("turn on the lamp", '{"verb": "turn on", "direct_object": "brass lantern"}'),
+    _ex("light the lantern", '{"verb": "turn on", "direct_object": "brass lantern"}'),
+    _ex("switch the lamp off", '{"verb": "turn off", "direct_object": "brass lantern"}'),
+    _ex("put out the lantern", '{"verb": "turn off", "direct_object": "brass lantern"}'),
+    # put
+    _ex("put the leaflet in the mailbox", '{"verb": "put", "direct_object": "leaflet", "indirect_object": "small mailbox", "preposition": "in"}'),
+    _ex("place the egg on the table", '{"verb": "put", "direct_object": "jewel-encrusted egg", "indirect_object": "kitchen table", "preposition": "on"}'),
+    _ex("stick the sword in the case", '{"verb": "put", "direct_object": "elvish sword", "indirect_object": "trophy case", "preposition": "in"}'),
+    # attack
+    _ex("kill the troll", '{"verb": "attack", "direct_object": "troll"}'),
+    _ex("attack troll with sword", '{"verb": "attack", "direct_object": "troll", "indirect_object": "elvish sword", "preposition": "with"}'),
+    _ex("stab the troll", '{"verb": "attack", "direct_object": "troll"}'),
+    _ex("fight him", '{"verb": "attack", "direct_object": "troll"}'),
+    # eat
+    _ex("eat the lunch", '{"verb": "eat", "direct_object": "lunch"}'),
+    _ex("im hungry eat the sandwich", '{"verb": "eat", "direct_object": "lunch"}'),
+    # move
+    _ex("move the rug", '{"verb": "move", "direct_object": "oriental rug"}'),
+    _ex("push the rug aside", '{"verb": "move", "direct_object": "oriental rug"}'),
+    # wait / score / quit
+    _ex("wait", '{"verb": "wait"}'),
+    _ex("just hang on a sec", '{"verb": "wait"}'),
+    _ex("z", '{"verb": "wait"}'),
+    _ex("whats my score", '{"verb": "score"}'),
+    _ex("how am i doing", '{"verb": "score"}'),
+    _ex("quit", '{"verb": "quit"}'),
+    _ex("i want to stop playing", '{"verb": "quit"}'),
+    # save / restore
+    _ex("save the game as castle", '{"verb": "save", "direct_object": "castle"}'),
+    _ex("restore castle", '{"verb": "restore", "direct_object": "castle"}'),
+]
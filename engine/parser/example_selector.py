@@ -0,0 +1,85 @@
+"""Retrieval of the few-shot examples most like the player's input."""
+
+from __future__ import annotations
+
+import json
+import math
+from collections import Counter
+
+from engine.parser.example_bank import EXAMPLE_BANK
+from engine.parser.parse_cache import normalize_input
+
+NGRAM_SIZES = (2, 3, 4)
+
+
+def char_ngrams(text: str, sizes: tuple[int, ...] = NGRAM_SIZES) -> Counter:
+    """Character n-grams of normalized ``text``, padded with spaces at the ends."""
+    padded = f" {normalize_input(text)} "
+    grams: Counter = Counter()
+    for n in sizes:
+        for i in range(len(padded) - n + 1):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+
+class ExampleSelector:
+    """Character n-gram TF-IDF index over an example bank.
+
+    Inputs are compared by the cosine similarity of their n-gram vectors,
+    which tolerates typos, plurals and transcription slips ("pick up the
+    lamp" is close to "pick the leaflet up"). Scoring walks an inverted
+    index, so a query only touches examples sharing an n-gram with it.
+    """
+
+    def __init__(self, examples: list[dict[str, str]] | None = None):
+        self.examples = EXAMPLE_BANK if examples is None else examples
+        self.verbs = [json.loads(ex["output"])["verb"] for ex in self.examples]
+        counts = [char_ngrams(ex["input"]) for ex in self.examples]
+        document_frequency: Counter = Counter()
+        for grams in counts:
+            document_frequency.update(grams.keys())
+        total = len(self.examples)
+        self._idf = {
+            gram: math.log((1 + total) / (1 + df)) + 1
+            for gram, df in document_frequency.items()
+        }
+        # n-gram -> [(example index, weight)]
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        for i, grams in enumerate(counts):
+            for gram, weight in self._vector(grams).items():
+                self._postings.setdefault(gram, []).append((i, weight))
+
+    def rank(self, text: str) -> list[tuple[float, int]]:
+        """(similarity, example index) for every example sharing an n-gram
+        with ``text``, most similar first."""
+        scores: dict[int, float] = {}
+        for gram, weight in self._vector(char_ngrams(text)).items():
+            for i, example_weight in self._postings.get(gram, ()):
+                scores[i] = scores.get(i, 0.0) + weight * example_weight
+        return sorted(((s, i) for i, s in scores.items()), key=lambda item: (-item[0], item[1]))
+
+    def select(self, text: str, k: int) -> list[dict[str, str]]:
+        """The ``k`` examples most similar to ``text``."""
+        return [self.examples[i] for _, i in self.rank(text)[:k]]
+
+    def candidate_verbs(self, text: str, valid_verbs: list[str], neighbours: int = 10) -> list[str]:
+        """The verbs of ``valid_verbs`` the input most likely means.
+
+        Verbs named in the input come first, then those of its
+        ``neighbours`` nearest examples. All of ``valid_verbs`` when none
+        of them turn up.
+        """
+        normalized = f" {normalize_input(text)} "
+        candidates = [v for v in valid_verbs if f" {v} " in normalized]
+        by_id = {v.replace(" ", "_"): v for v in valid_verbs}
+        for _, i in self.rank(text)[:neighbours]:
+            verb = by_id.get(self.verbs[i].replace(" ", "_"))
+            if verb is not None and verb not in candidates:
+                candidates.append(verb)
+        return candidates or list(valid_verbs)
+
+    def _vector(self, grams: Counter) -> dict[str, float]:
+        """L2-normalized TF-IDF weights; n-grams unseen in the bank are dropped."""
+        weights = {g: c * self._idf[g] for g, c in grams.items() if g in self._idf}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {g: w / norm for g, w in weights.items()}
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import re
+import threading
 
 from engine.models.command import ParsedCommand
 from engine.models.enums import DIRECTION_ABBREVIATIONS, Direction
+from engine.parser.name_matcher import ARTICLES, NameMatcher
 from engine.parser.parser_interface import ParserContext, ParserInterface
 
 # Prepositions that split direct/indirect objects
@@ -74,6 +75,10 @@ DIRECTION_NAMES.update({
 class FallbackParser(ParserInterface):
     """Simple keyword/regex parser for use without an LLM."""
 
+    def __init__(self):
+        self._matcher = NameMatcher()
+        self._matcher_lock = threading.Lock()
+
     def parse(self, input_text: str, context: ParserContext) -> ParsedCommand:
         raw = input_text.strip()
         text = raw.lower()
@@ -184,23 +189,21 @@ class FallbackParser(ParserInterface):
         if not text:
             return None
 
-        text = text.strip()
+        words = text.split()
         # Remove articles
-        text = re.sub(r"^(the|a|an|some)\s+", "", text)
+        if words and words[0] in ARTICLES:
+            words = words[1:]
+        text = " ".join(words)
 
         if not text:
             return None
 
-        # Check visible objects and inventory for matches
-        all_objects = context.visible_objects + context.inventory
-        for obj_name in all_objects:
-            if text == obj_name.lower():
-                return obj_name
-
-        # Check NPC names
-        for npc_name in context.npc_names:
-            if text == npc_name.lower():
-                return npc_name
+        # Names and aliases of visible objects, inventory and NPCs
+        with self._matcher_lock:
+            self._matcher.sync(context)
+            name = self._matcher.match(text)
+        if name is not None:
+            return name
 
         # Return the cleaned text for the resolver to handle
         return text
@@ -0,0 +1,132 @@
+"""GBNF grammars that restrict LLM output to commands valid in a context."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from engine.models.enums import Direction
+from engine.parser.fallback_parser import PREPOSITIONS
+from engine.parser.parse_cache import context_key
+from engine.parser.parser_interface import ParserContext
+
+try:
+    from llama_cpp import LlamaGrammar
+except ImportError:
+    LlamaGrammar = None
+
+# Verbs handled by the engine itself, whose object is a free-form slot name
+SLOT_VERBS = ("save", "restore")
+
+
+def _literal(value: str) -> str:
+    """GBNF literal matching ``value`` as a JSON string."""
+    encoded = json.dumps(value)
+    return '"' + encoded.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _choice(values: list[str]) -> str:
+    return " | ".join(_literal(v) for v in sorted(set(values)))
+
+
+def build_grammar(context: ParserContext) -> str:
+    """GBNF for a ParsedCommand JSON object using only names from ``context``.
+
+    Verbs come from ``valid_verbs`` (any string if the game lists none),
+    objects from the visible objects, inventory and NPCs, and directions
+    from the Direction enum: moving through a missing exit is a valid
+    command that the engine answers. Fields appear in the order of the
+    prompt's examples. ``save``/``restore`` take any slot name.
+    """
+    objects = context.visible_objects + context.inventory + context.npc_names
+    verbs = [v for v in context.valid_verbs if v not in SLOT_VERBS]
+
+    fields = ['"{" ws "\\"verb\\":" ws verb']
+    if objects:
+        fields.append('( "," ws "\\"direct_object\\":" ws object )?')
+        fields.append('( "," ws "\\"indirect_object\\":" ws object )?')
+    fields.append('( "," ws "\\"preposition\\":" ws preposition )?')
+    fields.append('( "," ws "\\"direction\\":" ws direction )?')
+    fields.append('ws "}"')
+
+    rules = [
+        "root ::= command | slot-command",
+        "command ::= " + " ".join(fields),
+        'slot-command ::= "{" ws "\\"verb\\":" ws slot-verb '
+        '( "," ws "\\"direct_object\\":" ws string )? ws "}"',
+        "slot-verb ::= " + _choice(list(SLOT_VERBS)),
+        "verb ::= " + (_choice(verbs) if verbs else "string"),
+        "preposition ::= " + _choice(list(PREPOSITIONS)),
+        "direction ::= " + _choice([d.value for d in Direction]),
+        'string ::= "\\"" [a-zA-Z0-9 _-]* "\\""',
+        'ws ::= " "?',
+    ]
+    if objects:
+        rules.append("object ::= " + _choice(objects))
+    return "\n".join(rules) + "\n"
+
+
+class GrammarCache:
+    """Per-context grammar text and compiled grammars, both LRU-bounded.
+
+    Rooms repeat from turn to turn, so most turns reuse both the text
+    (keyed by the context hash) and the compiled LlamaGrammar (keyed by
+    the text). Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._texts: OrderedDict[str, str] = OrderedDict()
+        self._compiled: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.compiles = 0
+
+    def text(self, context: ParserContext) -> str:
+        key = context_key(context)
+        with self._lock:
+            text = self._texts.get(key)
+            if text is not None:
+                self._texts.move_to_end(key)
+                return text
+        text = build_grammar(context)
+        with self._lock:
+            self._remember(self._texts, key, text)
+        return text
+
+    def compile(self, text: str) -> Any:
+        """The LlamaGrammar for ``text``; requires llama-cpp-python."""
+        with self._lock:
+            grammar = self._compiled.get(text)
+            if grammar is not None:
+                self._compiled.move_to_end(text)
+                return grammar
+        if LlamaGrammar is None:
+            raise ImportError(
+                "llama-cpp-python is required to compile grammars. "
+                "Install with: pip install llama-cpp-python"
+            )
+        grammar = LlamaGrammar.from_string(text, verbose=False)
+        with self._lock:
+            self.compiles += 1
+            self._remember(self._compiled, text, grammar)
+        return grammar
+
+    def _remember(self, entries: OrderedDict, key: str, value: Any):
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+def compile_request(request: dict[str, Any], cache: GrammarCache) -> dict[str, Any]:
+    """``request`` with a GBNF text ``grammar`` replaced by its compiled form.
+
+    Requests carry grammar text so they can cross process and HTTP
+    boundaries; whoever calls llama_cpp compiles it.
+    """
+    grammar = request.get("grammar")
+    if not isinstance(grammar, str) or LlamaGrammar is None:
+        return request
+    return {**request, "grammar": cache.compile(grammar)}
@@ -0,0 +1,84 @@
+"""Hybrid parser: keyword parsing first, LLM only for uncertain input."""
+
+from __future__ import annotations
+
+import functools
+import logging
+
+from engine.models.command import ParsedCommand
+from engine.parser.fallback_parser import DIRECTION_NAMES, VERB_ALIASES, FallbackParser
+from engine.parser.parser_interface import ParserContext, ParserInterface, record_stats
+
+logger = logging.getLogger(__name__)
+
+
+class HybridParser(ParserInterface):
+    """Keyword parser first, LLM only when the keyword parse is unsure.
+
+    The FallbackParser result is trusted when the first word is a known
+    verb (VERB_ALIASES) or direction and every object it names matched a
+    visible object, inventory item, alias or NPC from the context exactly.
+    Anything else (filler words, unknown verbs, descriptive object
+    phrases) goes to ``llm_parser``.
+
+    ``turns`` counts parses and ``fast_path_turns`` those answered without
+    inference; ``fast_path_rate`` is their ratio.
+    """
+
+    def __init__(self, llm_parser: ParserInterface, fallback: FallbackParser | None = None):
+        self.llm_parser = llm_parser
+        self.fallback = fallback or FallbackParser()
+        self.turns = 0
+        self.fast_path_turns = 0
+
+    @property
+    def fast_path_rate(self) -> float:
+        return self.fast_path_turns / self.turns if self.turns else 0.0
+
+    def parse(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        command = self.fallback.parse(input_text, context)
+        fast_path = self.is_confident(input_text, command, context)
+        record_stats(functools.partial(self._count_turn, fast_path))
+        if fast_path:
+            return command
+        logger.debug("Escalating to LLM: %r", input_text)
+        return self.llm_parser.parse(input_text, context)
+
+    async def parse_async(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        command = self.fallback.parse(input_text, context)
+        fast_path = self.is_confident(input_text, command, context)
+        record_stats(functools.partial(self._count_turn, fast_path))
+        if fast_path:
+            return command
+        logger.debug("Escalating to LLM: %r", input_text)
+        return await self.llm_parser.parse_async(input_text, context)
+
+    def _count_turn(self, fast_path: bool):
+        self.turns += 1
+        if fast_path:
+            self.fast_path_turns += 1
+
+    def stats(self) -> list[str]:
+        lines = self.llm_parser.stats()
+        if self.turns:
+            lines.insert(0, f"Keyword fast path: {self.fast_path_rate:.0%} of {self.turns} parses")
+        return lines
+
+    def is_confident(
+        self, input_text: str, command: ParsedCommand, context: ParserContext
+    ) -> bool:
+        """Whether the keyword parse ``command`` can be used as-is."""
+        words = input_text.strip().lower().split()
+        if not words:
+            return True
+        if words[0] not in VERB_ALIASES and words[0] not in DIRECTION_NAMES:
+            return False
+
+        known = {name.lower() for name in context.visible_objects + context.inventory}
+        known.update(name.lower() for name in context.npc_names)
+        for aliases in context.object_aliases.values():
+            known.update(alias.lower() for alias in aliases)
+        for obj in (command.direct_object, command.indirect_object):
+            if obj is not None and obj.lower() not in known:
+                return False
+        return True
@@ -0,0 +1,290 @@
+"""Small learned intent classifier that answers before the LLM."""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import math
+import random
+import re
+import zlib
+
+from engine.models.command import ParsedCommand
+from engine.parser.fallback_parser import DIRECTION_NAMES, PREPOSITIONS
+from engine.parser.parser_interface import ParserContext, ParserInterface, record_stats
+
+logger = logging.getLogger(__name__)
+
+# Hash buckets for features; collisions are rare at the vocabulary of a game
+N_FEATURES = 1 << 18
+# Stands in for any object name, so verbs are learned independently of them
+OBJECT_TOKEN = "<obj>"
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode()) % N_FEATURES
+
+
+def featurize(text: str) -> list[int]:
+    """Hashed bag of words, word bigrams and the first word."""
+    words = _WORD.findall(text.lower().replace(OBJECT_TOKEN, " obj_ "))
+    if not words:
+        return [_hash("<empty>")]
+    features = [_hash("w=" + w) for w in words]
+    features += [_hash(f"b={a}_{b}") for a, b in zip(words, words[1:])]
+    features.append(_hash("first=" + words[0]))
+    return features
+
+
+@functools.lru_cache(maxsize=4096)
+def _name_pattern(name: str) -> re.Pattern:
+    """Whole-word pattern for a lowercase name; the same names recur every turn."""
+    return re.compile(rf"\b{re.escape(name)}\b")
+
+
+def mask_names(text: str, names: list[str]) -> str:
+    """Replace each of ``names`` in ``text`` with OBJECT_TOKEN."""
+    text = text.lower()
+    for name in sorted(names, key=len, reverse=True):
+        text = _name_pattern(name.lower()).sub(OBJECT_TOKEN, text)
+    return text
+
+
+class IntentModel:
+    """Multinomial logistic regression over hashed n-gram features.
+
+    ``weights`` maps a feature bucket to one weight per label; only
+    buckets seen in training are stored, so the model stays small.
+    ``object_rate`` is the share of each label's training commands that
+    had a direct object.
+    """
+
+    def __init__(
+        self,
+        labels: list[str],
+        weights: dict[int, list[float]],
+        bias: list[float],
+        object_rate: dict[str, float],
+    ):
+        self.labels = labels
+        self.weights = weights
+        self.bias = bias
+        self.object_rate = object_rate
+
+    @classmethod
+    def train(
+        cls,
+        commands: list[ParsedCommand],
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        seed: int = 0,
+    ) -> IntentModel:
+        """Fit on logged commands, using each one's ``raw_input`` as the text."""
+        labels = sorted({c.verb for c in commands})
+        index = {label: i for i, label in enumerate(labels)}
+        examples = [
+            (featurize(mask_names(c.raw_input, _objects(c))), index[c.verb])
+            for c in commands
+        ]
+        weights: dict[int, list[float]] = {}
+        bias = [0.0] * len(labels)
+        rng = random.Random(seed)
+        model = cls(labels, weights, bias, {})
+        for epoch in range(epochs):
+            rng.shuffle(examples)
+            rate = learning_rate / (1 + epoch)
+            for features, target in examples:
+                probs = model._probabilities(features)
+                for k in range(len(labels)):
+                    gradient = probs[k] - (1.0 if k == target else 0.0)
+                    if gradient == 0.0:
+                        continue
+                    bias[k] -= rate * gradient
+                    for f in features:
+                        row = weights.get(f)
+                        if row is None:
+                            row = weights[f] = [0.0] * len(labels)
+                        row[k] -= rate * gradient
+
+        with_object: dict[str, list[int]] = {}
+        for c in commands:
+            counts = with_object.setdefault(c.verb, [0, 0])
+            counts[0] += c.direct_object is not None
+            counts[1] += 1
+        model.object_rate = {verb: hits / total for verb, (hits, total) in with_object.items()}
+        return model
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """The most likely verb for (already masked) ``text`` and its probability."""
+        probs = self._probabilities(featurize(text))
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.labels[best], probs[best]
+
+    def _probabilities(self, features: list[int]) -> list[float]:
+        scores = list(self.bias)
+        for f in features:
+            row = self.weights.get(f)
+            if row is not None:
+                for k, w in enumerate(row):
+                    scores[k] += w
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "labels": self.labels,
+                    "bias": self.bias,
+                    "object_rate": self.object_rate,
+                    "weights": {str(k): v for k, v in self.weights.items()},
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> IntentModel:
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            labels=data["labels"],
+            weights={int(k): v for k, v in data["weights"].items()},
+            bias=data["bias"],
+            object_rate=data["object_rate"],
+        )
+
+
+class IntentParser(ParserInterface):
+    """Answers from an IntentModel when it is sure, else asks ``next_parser``.
+
+    The verb comes from the model; objects are tagged by finding the
+    context's object, alias and NPC names in the input (first match is the
+    direct object, second the indirect one, with the preposition between
+    them), and directions from the direction words. The result is used
+    when the verb's probability reaches ``min_confidence``, the verb is
+    one of the context's valid verbs, and the slots look complete: a
+    direction for "go", and an object for verbs that usually take one.
+
+    ``turns``/``fast_path_turns`` count parses and those answered here.
+    """
+
+    def __init__(
+        self,
+        model: IntentModel,
+        next_parser: ParserInterface,
+        min_confidence: float = 0.8,
+    ):
+        self.model = model
+        self.next_parser = next_parser
+        self.min_confidence = min_confidence
+        self.turns = 0
+        self.fast_path_turns = 0
+        # (context version, its names) of the last versioned context
+        self._last_names: tuple[int | None, dict[str, str]] = (None, {})
+
+    @property
+    def fast_path_rate(self) -> float:
+        return self.fast_path_turns / self.turns if self.turns else 0.0
+
+    def parse(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        command = self.classify(input_text, context)
+        fast_path = command is not None
+        record_stats(functools.partial(self._count_turn, fast_path))
+        if fast_path:
+            return command
+        logger.debug("Intent model unsure, passing on: %r", input_text)
+        return self.next_parser.parse(input_text, context)
+
+    async def parse_async(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        command = self.classify(input_text, context)
+        fast_path = command is not None
+        record_stats(functools.partial(self._count_turn, fast_path))
+        if fast_path:
+            return command
+        logger.debug("Intent model unsure, passing on: %r", input_text)
+        return await self.next_parser.parse_async(input_text, context)
+
+    def _count_turn(self, fast_path: bool):
+        self.turns += 1
+        if fast_path:
+            self.fast_path_turns += 1
+
+    def stats(self) -> list[str]:
+        lines = self.next_parser.stats()
+        if self.turns:
+            lines.insert(0, f"Intent model: {self.fast_path_rate:.0%} of {self.turns} parses")
+        return lines
+
+    def classify(self, input_text: str, context: ParserContext) -> ParsedCommand | None:
+        """The command for ``input_text``, or None when the model is unsure."""
+        raw = input_text.strip()
+        names = self._names(context)
+        verb, probability = self.model.predict(mask_names(raw, list(names)))
+        if probability < self.min_confidence:
+            return None
+        if context.valid_verbs and verb not in context.valid_verbs:
+            return None
+
+        words = _WORD.findall(raw.lower())
+        if verb == "go":
+            directions = [DIRECTION_NAMES[w] for w in words if w in DIRECTION_NAMES]
+            if not directions:
+                return None
+            return ParsedCommand(verb=verb, direction=directions[0], raw_input=raw)
+
+        found = _find_names(raw, names)
+        if not found and self.model.object_rate.get(verb, 0.0) > 0.5:
+            return None
+        direct = found[0][2] if found else None
+        indirect = found[1][2] if len(found) > 1 else None
+        preposition = None
+        if indirect is not None:
+            between = raw.lower()[found[0][1]:found[1][0]].split()
+            preposition = next((w for w in between if w in PREPOSITIONS), None)
+        return ParsedCommand(
+            verb=verb,
+            direct_object=direct,
+            indirect_object=indirect,
+            preposition=preposition,
+            raw_input=raw,
+        )
+
+    def _names(self, context: ParserContext) -> dict[str, str]:
+        """``_context_names`` of ``context``, reused while its version is unchanged."""
+        version, names = self._last_names
+        if version is not None and version == context.version:
+            return names
+        names = _context_names(context)
+        self._last_names = (context.version, names)
+        return names
+
+
+def _objects(command: ParsedCommand) -> list[str]:
+    return [o for o in (command.direct_object, command.indirect_object) if o]
+
+
+def _context_names(context: ParserContext) -> dict[str, str]:
+    """Every name or alias the player may use, mapped to the canonical name."""
+    names: dict[str, str] = {}
+    for name in context.visible_objects + context.inventory + context.npc_names:
+        names[name.lower()] = name
+        for alias in context.object_aliases.get(name, ()):
+            names.setdefault(alias.lower(), name)
+    return names
+
+
+def _find_names(text: str, names: dict[str, str]) -> list[tuple[int, int, str]]:
+    """Non-overlapping (start, end, canonical name) matches, longest first."""
+    text = text.lower()
+    taken: list[tuple[int, int, str]] = []
+    for name in sorted(names, key=len, reverse=True):
+        for match in _name_pattern(name).finditer(text):
+            start, end = match.span()
+            if all(end <= s or start >= e for s, e, _ in taken):
+                taken.append((start, end, names[name]))
+    return sorted(taken)
@@ -2,15 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import signal
-import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any
 
 from engine.models.command import ParsedCommand
+from engine.parser.batching import SchedulerBusyError
 from engine.parser.fallback_parser import FallbackParser
+from engine.parser.grammar import GrammarCache, compile_request
 from engine.parser.parser_interface import ParserContext, ParserInterface
-from engine.parser.prompt_builder import PromptBuilder
+from engine.parser.prompt_builder import PromptBuilder, estimate_tokens
+from engine.parser.streaming import stop_at, stream_content
+
+if TYPE_CHECKING:
+    from engine.parser.batching import InferenceScheduler
+    from engine.parser.worker_pool import LLMWorkerPool
 
 try:
     from llama_cpp import Llama
@@ -20,7 +32,10 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 2
+# Latency budget of one parse, shared by all its attempts
 TIMEOUT_SECONDS = 10
+# KV-cache snapshots kept, one per distinct system prompt (i.e. per game)
+PREFIX_CACHE_SIZE = 4
 
 
 class LLMParseError(Exception):
@@ -29,82 +44,261 @@ class LLMParseError(Exception):
 
 
 class LLMParser(ParserInterface):
-    """Parser that uses a local LLM for natural language understanding."""
+    """Parser that uses a local LLM for natural language understanding.
+
+    The system prompt (rules and few-shot examples) only changes with the
+    game's verb list, so with ``prefix_cache`` it is evaluated once and the
+    model state after it is snapshotted. Each request restores that
+    snapshot; llama-cpp-python then reuses the longest common token prefix
+    and only prefills the user prompt.
+
+    With a ``scheduler`` the parser does not run the model itself: requests
+    go to the InferenceScheduler, which batches them with other sessions',
+    or to an LLMWorkerPool. A scheduler with no room left means an
+    immediate fallback to the keyword parser.
+
+    Each parse has TIMEOUT_SECONDS in all: retries get what is left of
+    it. The in-process model checks the deadline after every token (a
+    llama.cpp stopping criterion), so ``parse`` can run on any thread.
+    Prompt evaluation itself cannot be interrupted.
+
+    ``parse_async`` never blocks the event loop: the model runs on a
+    dedicated worker thread and waiting uses asyncio cancellation.
+
+    With ``grammar`` each request carries a GBNF grammar built from the
+    turn's context, so the model can only name verbs, objects and NPCs
+    that exist there. Otherwise output is only held to the JSON schema.
+
+    With ``stream`` the in-process model's output is read token by token
+    and generation stops as soon as the command is complete (see
+    ``stream_content``); debug logging shows the tokens each turn took.
 
-    def __init__(self, model_path: str, n_ctx: int = 2048, n_gpu_layers: int = -1):
-        if Llama is None:
-            raise ImportError(
-                "llama-cpp-python is required for LLM parsing. "
-                "Install with: pip install llama-cpp-python"
+    With ``few_shot`` the prompt carries that many examples picked for
+    the input from a larger bank, and only the verbs it likely means,
+    instead of the fixed examples and full verb list (see PromptBuilder).
+    Debug logging shows the prompt size each turn.
+    """
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        n_ctx: int = 2048,
+        n_gpu_layers: int = -1,
+        prefix_cache: bool = True,
+        llm: Any = None,
+        scheduler: InferenceScheduler | LLMWorkerPool | None = None,
+        grammar: bool = True,
+        stream: bool = True,
+        few_shot: int | None = None,
+    ):
+        """Load the model at ``model_path``, or use an already loaded ``llm``
+        (a ``llama_cpp.Llama`` or an object with the same chat API)."""
+        if llm is None and scheduler is None:
+            if Llama is None:
+                raise ImportError(
+                    "llama-cpp-python is required for LLM parsing. "
+                    "Install with: pip install llama-cpp-python"
+                )
+            llm = Llama(
+                model_path=model_path,
+                n_ctx=n_ctx,
+                n_gpu_layers=n_gpu_layers,
+                verbose=False,
             )
-        self.llm = Llama(
-            model_path=model_path,
-            n_ctx=n_ctx,
-            n_gpu_layers=n_gpu_layers,
-            verbose=False,
-        )
-        self.prompt_builder = PromptBuilder()
+        self.llm = llm
+        self.scheduler = scheduler
+        self.prefix_cache = prefix_cache and scheduler is None
+        self.grammar = grammar
+        self.stream = stream
+        self._grammars = GrammarCache()
+        if few_shot is not None:
+            from engine.parser.example_selector import ExampleSelector
+            self.prompt_builder = PromptBuilder(ExampleSelector(), k=few_shot)
+        else:
+            self.prompt_builder = PromptBuilder()
         self._schema = ParsedCommand.model_json_schema()
         self._fallback = FallbackParser()
+        self._prefix_states: OrderedDict[str, Any] = OrderedDict()
+        # One thread owns the model for async callers; the lock keeps sync
+        # and async calls from using it at the same time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+        self._model_lock = threading.Lock()
 
     def parse(self, input_text: str, context: ParserContext) -> ParsedCommand:
         system_prompt = self.prompt_builder.build_system_prompt(context)
         user_prompt = self.prompt_builder.build_user_prompt(input_text, context)
+        request = self._build_request(system_prompt, user_prompt, context)
 
+        deadline = time.monotonic() + TIMEOUT_SECONDS
         last_error: Exception | None = None
         for attempt in range(MAX_RETRIES):
+            if attempt and time.monotonic() >= deadline:
+                break  # no budget left for a retry
             try:
-                result = self._call_llm(system_prompt, user_prompt, input_text)
+                result = self._call_llm(request, system_prompt, input_text, deadline)
                 return result
             except LLMParseError as e:
                 last_error = e
                 logger.warning("LLM parse attempt %d failed: %s", attempt + 1, e)
+            except SchedulerBusyError as e:
+                # Retrying would only add to the backlog
+                last_error = e
+                break
 
+        return self._fall_back(input_text, context, last_error)
+
+    async def parse_async(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        system_prompt = self.prompt_builder.build_system_prompt(context)
+        user_prompt = self.prompt_builder.build_user_prompt(input_text, context)
+        request = self._build_request(system_prompt, user_prompt, context)
+
+        deadline = time.monotonic() + TIMEOUT_SECONDS
+        last_error: Exception | None = None
+        for attempt in range(MAX_RETRIES):
+            if attempt and time.monotonic() >= deadline:
+                break  # no budget left for a retry
+            try:
+                return await self._call_llm_async(request, system_prompt, input_text, deadline)
+            except LLMParseError as e:
+                last_error = e
+                logger.warning("LLM parse attempt %d failed: %s", attempt + 1, e)
+            except SchedulerBusyError as e:
+                # Retrying would only add to the backlog
+                last_error = e
+                break
+
+        return self._fall_back(input_text, context, last_error)
+
+    def _fall_back(
+        self, input_text: str, context: ParserContext, last_error: Exception | None
+    ) -> ParsedCommand:
         # All retries exhausted — fall back to keyword parser
         logger.warning(
             "LLM parser failed after %d attempts, falling back to keyword parser: %s",
             MAX_RETRIES,
             last_error,
         )
-        return self._fallback.parse(input_text, context)
+        command = self._fallback.parse(input_text, context)
+        command.fell_back = True
+        return command
+
+    def _build_request(
+        self, system_prompt: str, user_prompt: str, context: ParserContext
+    ) -> dict:
+        logger.debug(
+            "Prompt: ~%d tokens (system %d, user %d)",
+            estimate_tokens(system_prompt) + estimate_tokens(user_prompt),
+            estimate_tokens(system_prompt),
+            estimate_tokens(user_prompt),
+        )
+        request = dict(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.0,
+            max_tokens=200,
+        )
+        if self.grammar:
+            # GBNF text, compiled where the model runs; llama-cpp-python
+            # would replace it with the schema's grammar if both were set
+            request["grammar"] = self._grammars.text(context)
+        else:
+            request["response_format"] = {
+                "type": "json_object",
+                "schema": self._schema,
+            }
+        return request
 
     def _call_llm(
-        self, system_prompt: str, user_prompt: str, raw_input: str
+        self, request: dict, system_prompt: str, raw_input: str, deadline: float
     ) -> ParsedCommand:
-        """Make a single LLM call with timeout. Raises LLMParseError on failure."""
-        # Set up timeout (Unix only; on Windows, skip timeout)
-        use_alarm = hasattr(signal, "SIGALRM") and sys.platform != "win32"
-        if use_alarm:
-            old_handler = signal.signal(signal.SIGALRM, _timeout_handler)
-            signal.alarm(TIMEOUT_SECONDS)
+        """Make a single LLM call by ``deadline``. Raises LLMParseError on failure."""
+        if self.scheduler is not None:
+            content = self._call_scheduler(request, deadline)
+        else:
+            content = self._call_model(request, system_prompt, deadline)
+        return self._parse_content(content, raw_input)
 
-        try:
-            response = self.llm.create_chat_completion(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format={
-                    "type": "json_object",
-                    "schema": self._schema,
-                },
-                temperature=0.0,
-                max_tokens=200,
+    async def _call_llm_async(
+        self, request: dict, system_prompt: str, raw_input: str, deadline: float
+    ) -> ParsedCommand:
+        """Await a single LLM call, cancelled at ``deadline``.
+
+        Cancellation frees the caller at once; a generation running on the
+        worker thread stops at the same deadline.
+        """
+        remaining = _remaining(deadline)
+        if self.scheduler is not None:
+            pending = asyncio.wrap_future(self.scheduler.submit(deadline=deadline, **request))
+        else:
+            pending = asyncio.get_running_loop().run_in_executor(
+                self._executor, self._run_model, request, system_prompt, deadline
             )
-        except _LLMTimeoutError:
+        try:
+            content = await asyncio.wait_for(pending, remaining)
+        except asyncio.TimeoutError:
+            raise LLMParseError("LLM inference timed out")
+        except LLMParseError:
+            raise
+        except Exception as e:
+            raise LLMParseError(f"LLM inference failed: {e}") from e
+        return self._parse_content(content, raw_input)
+
+    def _call_model(self, request: dict, system_prompt: str, deadline: float) -> str:
+        """Run ``request`` on the in-process model and return its content."""
+        try:
+            return self._run_model(request, system_prompt, deadline)
+        except LLMParseError:
+            raise
+        except TimeoutError:
             raise LLMParseError("LLM inference timed out")
         except Exception as e:
             raise LLMParseError(f"LLM inference failed: {e}") from e
-        finally:
-            if use_alarm:
-                signal.alarm(0)
-                signal.signal(signal.SIGALRM, old_handler)
 
-        # Parse response
+    def _run_model(self, request: dict, system_prompt: str, deadline: float | None = None) -> str:
+        """Run ``request`` on the model, stopping generation at ``deadline``
+        (a ``time.monotonic()`` value; None for no limit)."""
+        request = compile_request(request, self._grammars)
+        if deadline is not None:
+            request = {**request, "stopping_criteria": stop_at(deadline)}
+            if not self._model_lock.acquire(timeout=_remaining(deadline)):
+                raise LLMParseError("LLM inference timed out waiting for the model")
+        else:
+            self._model_lock.acquire()
         try:
-            content = response["choices"][0]["message"]["content"]
-        except (KeyError, IndexError, TypeError) as e:
+            if self.prefix_cache:
+                self._restore_prefix(system_prompt)
+            if self.stream:
+                return stream_content(self.llm, request, deadline)
+            response = self.llm.create_chat_completion(**request)
+            if deadline is not None and time.monotonic() >= deadline:
+                # Cut short by the stopping criterion
+                raise LLMParseError("LLM inference timed out")
+            logger.debug(
+                "LLM completion: %s tokens generated",
+                response.get("usage", {}).get("completion_tokens", "?"),
+            )
+            return response["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
             raise LLMParseError(f"Unexpected LLM response structure: {e}") from e
+        finally:
+            self._model_lock.release()
+
+    def _call_scheduler(self, request: dict, deadline: float) -> str:
+        """Queue ``request`` on the shared scheduler and wait for its content."""
+        remaining = _remaining(deadline)
+        future = self.scheduler.submit(deadline=deadline, **request)
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            raise LLMParseError("LLM inference timed out")
+        except Exception as e:
+            raise LLMParseError(f"LLM inference failed: {e}") from e
+
+    def _parse_content(self, content: str, raw_input: str) -> ParsedCommand:
+        """Validate the model's JSON output into a ParsedCommand."""
 
         try:
             data = json.loads(content)
@@ -121,11 +315,35 @@ class LLMParser(ParserInterface):
         except Exception as e:
             raise LLMParseError(f"Failed to construct ParsedCommand: {e}") from e
 
+    def _restore_prefix(self, system_prompt: str):
+        """Put the model in the state right after ``system_prompt``.
+
+        The first time a system prompt is seen it is evaluated with an empty
+        user turn and the state is saved; later calls load that snapshot.
+        """
+        state = self._prefix_states.get(system_prompt)
+        if state is not None:
+            self._prefix_states.move_to_end(system_prompt)
+            self.llm.load_state(state)
+            return
+
+        self.llm.create_chat_completion(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": ""},
+            ],
+            temperature=0.0,
+            max_tokens=1,
+        )
+        self._prefix_states[system_prompt] = self.llm.save_state()
+        if len(self._prefix_states) > PREFIX_CACHE_SIZE:
+            self._prefix_states.popitem(last=False)
 
-class _LLMTimeoutError(Exception):
-    """Internal exception for LLM timeout."""
-    pass
 
+def _remaining(deadline: float) -> float:
+    """Seconds left until ``deadline``; raises LLMParseError if none are."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise LLMParseError("LLM inference timed out")
+    return remaining
 
-def _timeout_handler(signum: int, frame: object) -> None:
-    raise _LLMTimeoutError("LLM inference timed out")
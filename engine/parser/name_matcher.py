@@ -0,0 +1,143 @@
+"""Word trie over the object and NPC names a parser context offers."""
+
+from __future__ import annotations
+
+from engine.parser.parser_interface import ParserContext
+
+ARTICLES = {"the", "a", "an", "some"}
+
+
+class _Node:
+    __slots__ = ("children", "names")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        # Canonical names ending here, with how many phrases put them there
+        self.names: dict[str, int] = {}
+
+
+class NameMatcher:
+    """Finds the object or NPC a noun phrase refers to.
+
+    Names and aliases are stored word by word in a trie, so a phrase is
+    matched by walking it rather than comparing it with every name. The
+    longest name or alias inside the phrase wins, which lets extra words
+    around it through ("the shiny brass lantern" finds "brass lantern").
+    Failing that, a phrase whose words all belong to exactly one name
+    matches it ("small box" finds "small wooden box").
+
+    ``sync`` updates the trie to a new context by adding and removing only
+    the names that changed, found with set operations.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        # canonical name -> the phrases (tuples of words) it was added under
+        self._phrases: dict[str, list[tuple[str, ...]]] = {}
+        # word -> canonical names using it -> count
+        self._words: dict[str, dict[str, int]] = {}
+        self._aliases: dict[str, list[str]] = {}
+        self._lists: tuple[list[str], list[str], list[str]] = ([], [], [])
+        self._version: int | None = None
+
+    def sync(self, context: ParserContext):
+        """Make the matcher hold exactly the names of ``context``."""
+        if context.version is not None and context.version == self._version:
+            return
+        self._version = context.version
+        lists = (context.visible_objects, context.inventory, context.npc_names)
+        if lists == self._lists and context.object_aliases == self._aliases:
+            return  # a new context for the same room contents
+        self._lists = (list(lists[0]), list(lists[1]), list(lists[2]))
+        names = set(context.visible_objects)
+        names.update(context.inventory)
+        names.update(context.npc_names)
+        current = self._phrases.keys()
+
+        changed: set[str] = set()
+        aliases = context.object_aliases
+        if aliases != self._aliases:
+            changed = {n for n in names & current if aliases.get(n) != self._aliases.get(n)}
+            self._aliases = {name: list(a) for name, a in aliases.items()}
+        for name in (current - names) | changed:
+            self._remove_name(name)
+        for name in (names - current) | changed:
+            self._add_name(name, aliases.get(name, ()))
+
+    def match(self, text: str) -> str | None:
+        """The canonical name ``text`` refers to, or None."""
+        words = [w for w in text.lower().split() if w not in ARTICLES]
+        best: str | None = None
+        best_length = 0
+        for start in range(len(words)):
+            node = self._root
+            for end in range(start, len(words)):
+                node = node.children.get(words[end])
+                if node is None:
+                    break
+                length = end - start + 1
+                if node.names and length > best_length:
+                    best, best_length = _pick(node.names, words[start:end + 1]), length
+        if best is not None:
+            return best
+
+        candidates: set[str] | None = None
+        for word in words:
+            names = self._words.get(word)
+            if not names:
+                return None
+            candidates = set(names) if candidates is None else candidates & names.keys()
+        if candidates and len(candidates) == 1:
+            return candidates.pop()
+        return None
+
+    def _add_name(self, name: str, aliases):
+        phrases = []
+        for phrase in [name, *aliases]:
+            words = tuple(phrase.lower().split())
+            if words and words not in phrases:
+                phrases.append(words)
+                self._add(words, name)
+        self._phrases[name] = phrases
+
+    def _remove_name(self, name: str):
+        for words in self._phrases.pop(name):
+            self._remove(words, name)
+
+    def _add(self, phrase: tuple[str, ...], name: str):
+        node = self._root
+        for word in phrase:
+            node = node.children.setdefault(word, _Node())
+            counts = self._words.setdefault(word, {})
+            counts[name] = counts.get(name, 0) + 1
+        node.names[name] = node.names.get(name, 0) + 1
+
+    def _remove(self, phrase: tuple[str, ...], name: str):
+        path = [self._root]
+        for word in phrase:
+            path.append(path[-1].children[word])
+            counts = self._words[word]
+            counts[name] -= 1
+            if not counts[name]:
+                del counts[name]
+                if not counts:
+                    del self._words[word]
+        end = path[-1]
+        end.names[name] -= 1
+        if not end.names[name]:
+            del end.names[name]
+        # Prune branches that no longer lead to any name
+        for word, parent, node in zip(reversed(phrase), reversed(path[:-1]), reversed(path[1:])):
+            if node.children or node.names:
+                break
+            del parent.children[word]
+
+
+def _pick(names: dict[str, int], words: list[str]) -> str:
+    """Of the names ending at one trie node, prefer one spelled exactly so
+    over one reached through an alias."""
+    phrase = " ".join(words)
+    for name in names:
+        if name.lower() == phrase:
+            return name
+    return next(iter(names))
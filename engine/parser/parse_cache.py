@@ -0,0 +1,249 @@
+"""Cache of parse results shared by every session using a parser."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from engine.models.command import ParsedCommand
+from engine.parser.parser_interface import ParserContext, ParserInterface, record_stats
+
+_SPACES = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[.!?,;]+$")
+
+
+def normalize_input(input_text: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    text = _SPACES.sub(" ", input_text.strip().lower())
+    return _TRAILING_PUNCTUATION.sub("", text).strip()
+
+
+def context_key(context: ParserContext) -> str:
+    """Stable hash of everything in ``context`` a parser may depend on.
+
+    Lists are sorted: they describe sets of names, so two rooms showing the
+    same objects in a different order share entries. The hash of the last
+    versioned context is remembered.
+    """
+    global _last_key
+    version, key = _last_key
+    if version is not None and version == context.version:
+        return key
+    fields = {
+        "visible_objects": sorted(context.visible_objects),
+        "inventory": sorted(context.inventory),
+        "exits": sorted(context.exits),
+        "valid_verbs": sorted(context.valid_verbs),
+        "npc_names": sorted(context.npc_names),
+        "object_aliases": {
+            name: sorted(aliases) for name, aliases in context.object_aliases.items()
+        },
+    }
+    encoded = json.dumps(fields, sort_keys=True, separators=(",", ":")).encode()
+    key = hashlib.sha256(encoded).hexdigest()
+    _last_key = (context.version, key)
+    return key
+
+
+_last_key: tuple[int | None, str] = (None, "")
+
+
+class ParseCache:
+    """Bounded LRU of ParsedCommands with optional expiry and disk tier.
+
+    Entries older than ``ttl_seconds`` are treated as misses. With ``path``
+    every entry is also written to a SQLite file, which is consulted on
+    memory misses, so a restarted process starts warm. Safe to share
+    between threads.
+
+    ``hits``/``misses`` count lookups; ``saved_seconds`` adds up the parse
+    time each hit avoided (the time the original miss took).
+
+    ``get_async`` and ``put_async`` use the memory tier at once and reach
+    the SQLite file on a worker thread, off the event loop. Entries are
+    stored as copies, so callers may change the commands they put.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float | None = None,
+        path: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._entries: OrderedDict[str, tuple[ParsedCommand, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the connection; taken after _lock, never before
+        self._db_lock = threading.Lock()
+        # Guards the counters; held alone
+        self._stats_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, command TEXT, stored_at REAL, parse_seconds REAL)"
+            )
+            self._db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> ParsedCommand | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                entry = self._read(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            return self._count(key, entry)
+
+    async def get_async(self, key: str) -> ParsedCommand | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return self._count(key, entry)
+        if self._db is not None:
+            entry = await asyncio.to_thread(self._read, key)
+        with self._lock:
+            if entry is not None:
+                self._remember(key, entry)
+            return self._count(key, entry)
+
+    def put(self, key: str, command: ParsedCommand, parse_seconds: float):
+        stored_at = time.time()
+        command = command.model_copy()
+        with self._lock:
+            self._remember(key, (command, stored_at, parse_seconds))
+        self._store(key, command, stored_at, parse_seconds)
+
+    async def put_async(self, key: str, command: ParsedCommand, parse_seconds: float):
+        stored_at = time.time()
+        command = command.model_copy()
+        with self._lock:
+            self._remember(key, (command, stored_at, parse_seconds))
+        if self._db is not None:
+            await asyncio.to_thread(self._store, key, command, stored_at, parse_seconds)
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _count(self, key: str, entry: tuple[ParsedCommand, float, float] | None) -> ParsedCommand | None:
+        """Record a lookup of ``key`` that found ``entry``. Caller holds the lock."""
+        if entry is not None and self._expired(entry[1]):
+            self._entries.pop(key, None)
+            entry = None
+        if entry is None:
+            record_stats(functools.partial(self._add_stats, misses=1))
+            return None
+        command, _, parse_seconds = entry
+        record_stats(functools.partial(self._add_stats, hits=1, saved_seconds=parse_seconds))
+        return command
+
+    def _add_stats(self, **changes: float):
+        with self._stats_lock:
+            for name, amount in changes.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
+
+    def _remember(self, key: str, entry: tuple[ParsedCommand, float, float]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _store(self, key: str, command: ParsedCommand, stored_at: float, parse_seconds: float):
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?)",
+                (key, command.model_dump_json(), stored_at, parse_seconds),
+            )
+            self._db.commit()
+
+    def _read(self, key: str) -> tuple[ParsedCommand, float, float] | None:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT command, stored_at, parse_seconds FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return ParsedCommand.model_validate_json(row[0]), row[1], row[2]
+
+
+class CachingParser(ParserInterface):
+    """Answers repeated commands from a ParseCache before asking ``parser``.
+
+    The key is the normalized input plus a hash of the parser context, so
+    "take lamp" only hits where the same objects, exits and verbs are in
+    play. ``namespace`` separates entries of different parsers or models
+    sharing one cache file. Commands the parser marks ``fell_back`` (a
+    model timeout or error) are returned but not cached.
+    """
+
+    def __init__(self, parser: ParserInterface, cache: ParseCache, namespace: str = ""):
+        self.parser = parser
+        self.cache = cache
+        self.namespace = namespace
+
+    def parse(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        key = self._key(input_text, context)
+        command = self.cache.get(key)
+        if command is not None:
+            return command.model_copy(update={"raw_input": input_text.strip()})
+
+        start = time.perf_counter()
+        command = self.parser.parse(input_text, context)
+        if not command.fell_back:
+            self.cache.put(key, command, time.perf_counter() - start)
+        return command
+
+    async def parse_async(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        key = self._key(input_text, context)
+        command = await self.cache.get_async(key)
+        if command is not None:
+            return command.model_copy(update={"raw_input": input_text.strip()})
+
+        start = time.perf_counter()
+        command = await self.parser.parse_async(input_text, context)
+        if not command.fell_back:
+            await self.cache.put_async(key, command, time.perf_counter() - start)
+        return command
+
+    def stats(self) -> list[str]:
+        lines = self.parser.stats()
+        cache = self.cache
+        if cache.hits + cache.misses:
+            lines.insert(0, (
+                f"Parse cache: {cache.hit_rate:.0%} hit rate, "
+                f"{cache.saved_seconds * 1000:.0f} ms of parsing saved"
+            ))
+        return lines
+
+    def _key(self, input_text: str, context: ParserContext) -> str:
+        return f"{self.namespace}\0{normalize_input(input_text)}\0{context_key(context)}"
@@ -3,12 +3,44 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Callable
 
 from engine.models.command import ParsedCommand
 
+# Where record_stats puts updates while a speculative parse runs
+_held_stats: ContextVar[list[Callable[[], None]] | None] = ContextVar("held_stats", default=None)
+
+
+def record_stats(update: Callable[[], None]):
+    """Run ``update``, which adds to a parser's counters.
+
+    In a context passed to ``hold_stats`` it is collected instead, so that
+    a speculative parse (see Speculator) counts only if it gets used and
+    each line the player enters is counted once.
+    """
+    held = _held_stats.get()
+    if held is None:
+        update()
+    else:
+        held.append(update)
+
+
+def hold_stats(held: list[Callable[[], None]]):
+    """Collect ``record_stats`` updates in ``held`` for the rest of the
+    current context (a task, say) instead of running them."""
+    _held_stats.set(held)
+
 
 class ParserContext:
-    """Context provided to parsers for disambiguation."""
+    """Context provided to parsers for disambiguation.
+
+    Sessions reuse one context for as long as what it describes stays the
+    same, and give every context they build a new ``version`` (unique for
+    the process). Parsers can remember the version they last saw to skip
+    work when it is unchanged; None means unversioned, i.e. always new.
+    Treat contexts as read-only.
+    """
 
     def __init__(
         self,
@@ -18,6 +50,7 @@ class ParserContext:
         valid_verbs: list[str] | None = None,
         npc_names: list[str] | None = None,
         object_aliases: dict[str, list[str]] | None = None,
+        version: int | None = None,
     ):
         self.visible_objects = visible_objects or []
         self.inventory = inventory or []
@@ -25,6 +58,7 @@ class ParserContext:
         self.valid_verbs = valid_verbs or []
         self.npc_names = npc_names or []
         self.object_aliases = object_aliases or {}
+        self.version = version
 
 
 class ParserInterface(ABC):
@@ -34,3 +68,16 @@ class ParserInterface(ABC):
     def parse(self, input_text: str, context: ParserContext) -> ParsedCommand:
         """Parse natural language input into a structured command."""
         ...
+
+    async def parse_async(self, input_text: str, context: ParserContext) -> ParsedCommand:
+        """Async ``parse`` for callers on an event loop.
+
+        The default calls ``parse`` directly, which suits parsers that never
+        block. Parsers that wait on a model override it.
+        """
+        return self.parse(input_text, context)
+
+    def stats(self) -> list[str]:
+        """Lines describing what this parser and those it wraps saved so far
+        (fast-path and cache hit rates). The default has none."""
+        return []
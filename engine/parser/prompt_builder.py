@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import re
+from typing import TYPE_CHECKING
+
 from engine.parser.parser_interface import ParserContext
 
+if TYPE_CHECKING:
+    from engine.parser.example_selector import ExampleSelector
+
 # Few-shot examples covering standard input, voice-like input, directions,
 # multi-object commands, and pronoun resolution.
 FEW_SHOT_EXAMPLES = [
@@ -50,17 +56,39 @@ FEW_SHOT_EXAMPLES = [
 ]
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count: words and punctuation marks, as BPE tokenizers
+    split typical English prompt text into about that many tokens."""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
 class PromptBuilder:
-    """Builds prompts for the LLM parser with game context."""
+    """Builds prompts for the LLM parser with game context.
+
+    By default the system prompt lists every valid verb and all
+    FEW_SHOT_EXAMPLES. With a ``selector`` it holds only the rules, which
+    stay the same every turn (and so remain prefix-cacheable), while the
+    user prompt carries the ``k`` examples most similar to the input and
+    the verbs it most likely means.
+    """
+
+    def __init__(self, selector: ExampleSelector | None = None, k: int = 3):
+        self.selector = selector
+        self.k = k
 
     def build_system_prompt(self, context: ParserContext) -> str:
-        verb_list = ", ".join(context.valid_verbs) if context.valid_verbs else "look, take, drop, go"
+        if self.selector is not None:
+            verb_line = "usually one of the likely verbs given with the input"
+        elif context.valid_verbs:
+            verb_line = "one of: " + ", ".join(context.valid_verbs)
+        else:
+            verb_line = "one of: look, take, drop, go"
 
         lines = [
             "You are a text adventure game parser. Convert natural language input into a JSON command.",
             "",
             "Output JSON with these fields (omit null fields):",
-            '  verb: string (REQUIRED) - one of: ' + verb_list,
+            '  verb: string (REQUIRED) - ' + verb_line,
             '  direct_object: string - the target object name exactly as listed below',
             '  indirect_object: string - secondary object (e.g., key for unlock, weapon for attack)',
             '  preposition: string - connecting word (in, on, with, at, to, from)',
@@ -76,19 +104,25 @@ class PromptBuilder:
             "- Strip articles (the, a, an) and possessives (my, the) before matching objects",
             "- If the input is ambiguous, make your best guess from context",
             "- Never invent objects or verbs not in the context",
-            "",
-            "Examples:",
         ]
+        if self.selector is not None:
+            return "\n".join(lines)
 
-        for ex in FEW_SHOT_EXAMPLES:
-            lines.append(f'  Input: "{ex["input"]}"')
-            lines.append(f'  Output: {ex["output"]}')
-            lines.append("")
-
+        lines += ["", "Examples:"]
+        lines += _example_lines(FEW_SHOT_EXAMPLES)
         return "\n".join(lines)
 
     def build_user_prompt(self, input_text: str, context: ParserContext) -> str:
-        parts = [f'Player input: "{input_text}"', "", "Context:"]
+        parts = []
+        if self.selector is not None:
+            parts.append("Examples:")
+            parts += _example_lines(self.selector.select(input_text, self.k))
+            verbs = self.selector.candidate_verbs(
+                input_text, context.valid_verbs or ["look", "take", "drop", "go"]
+            )
+            parts.append(f"Likely verbs: {', '.join(verbs)}")
+            parts.append("")
+        parts += [f'Player input: "{input_text}"', "", "Context:"]
 
         if context.visible_objects:
             obj_parts = []
@@ -118,3 +152,12 @@ class PromptBuilder:
         parts.append("")
         parts.append("Output:")
         return "\n".join(parts)
+
+
+def _example_lines(examples: list[dict[str, str]]) -> list[str]:
+    lines = []
+    for ex in examples:
+        lines.append(f'  Input: "{ex["input"]}"')
+        lines.append(f'  Output: {ex["output"]}')
+        lines.append("")
+    return lines
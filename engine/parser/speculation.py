@@ -0,0 +1,206 @@
+"""Speculative parsing of input the player is still typing."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from engine.models.command import ParsedCommand
+from engine.models.enums import Direction
+from engine.parser.name_matcher import ARTICLES
+from engine.parser.parse_cache import normalize_input
+from engine.parser.parser_interface import ParserContext, ParserInterface, hold_stats
+
+logger = logging.getLogger(__name__)
+
+
+def likely_complete(text: str, context: ParserContext) -> bool:
+    """Whether ``text`` could already be the whole command.
+
+    True when its last word is complete: a verb, a direction or the last
+    word of a name the context offers. "take the br" is still being typed;
+    "take the brass lantern" may be done. A trailing article never is.
+    """
+    words = normalize_input(text).split()
+    if not words or words[-1] in ARTICLES:
+        return False
+    last = words[-1]
+    if last in context.valid_verbs or last in {d.value for d in Direction}:
+        return True
+    names = context.visible_objects + context.inventory + context.npc_names
+    for aliases in context.object_aliases.values():
+        names = names + aliases
+    return any(name.lower().split()[-1:] == [last] for name in names)
+
+
+class SpeculationStats:
+    """Counters shared by the Speculators of a server or game.
+
+    ``saved_seconds`` is parse time that ran before the player pressed
+    Enter, i.e. latency they did not wait for.
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.discarded = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        turns = self.hits + self.misses
+        return self.hits / turns if turns else 0.0
+
+    def record(self, **changes: float):
+        with self._lock:
+            for name, amount in changes.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+
+class _Speculation:
+    def __init__(
+        self,
+        text: str,
+        context: ParserContext,
+        pending: Future | asyncio.Task,
+        held: list[Callable[[], None]],
+    ):
+        self.text = normalize_input(text)
+        self.context = context
+        self.pending = pending
+        # The parser chain's stats updates, counted only on a hit
+        self.held = held
+        self.started_at = time.perf_counter()
+        self.finished_at: float | None = None
+        self.entered_at = 0.0
+        pending.add_done_callback(self._finished)
+
+    def _finished(self, pending: Future | asyncio.Task):
+        self.finished_at = time.perf_counter()
+        if not pending.cancelled():
+            # Mark a discarded speculation's error as seen; parse() retries
+            pending.exception()
+
+
+class Speculator:
+    """Parses one session's partial input ahead of Enter.
+
+    ``speculate`` (or ``speculate_async`` on an event loop) starts parsing
+    a prefix in the background, replacing any earlier speculation. When
+    the final line arrives, ``parse``/``parse_async`` reuse the result if
+    the line and the parser context are the same as the speculation's;
+    otherwise the speculation is cancelled and the line parsed as usual.
+
+    Both run the parser's ``parse_async``, a sync speculation on a private
+    event loop thread, so a parser need not be safe to call off the main
+    thread, and a discarded speculation is cancelled outright. A model the
+    parser runs in-process (LLMParser without a scheduler) still keeps
+    generating for it, holding the model lock until it finishes or
+    reaches its deadline, and a final line that misses waits for it. Callers should therefore speculate
+    sparingly: on a typing pause, and not faster than parses complete.
+
+    ``speculate`` and ``speculate_async`` return whether they started a
+    new speculation. The parser chain's own counters (fast-path turns,
+    cache hits) only count a speculation that gets used, in place of the
+    final line's parse.
+    """
+
+    def __init__(self, parser: ParserInterface, stats: SpeculationStats | None = None):
+        self.parser = parser
+        self.stats = stats or SpeculationStats()
+        self._current: _Speculation | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def speculate(self, text: str, context: ParserContext) -> bool:
+        if self._is_current(text, context):
+            return False
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="speculate", daemon=True).start()
+        held = []
+        pending = asyncio.run_coroutine_threadsafe(self._parse_held(text, context, held), self._loop)
+        self._replace(text, context, pending, held)
+        return True
+
+    def speculate_async(self, text: str, context: ParserContext) -> bool:
+        """``speculate`` for callers on an event loop; must run on the loop."""
+        if self._is_current(text, context):
+            return False
+        held = []
+        task = asyncio.get_running_loop().create_task(self._parse_held(text, context, held))
+        self._replace(text, context, task, held)
+        return True
+
+    def parse(self, text: str, context: ParserContext) -> ParsedCommand:
+        speculation = self._take(text, context)
+        if speculation is not None:
+            try:
+                return self._hit(speculation, text, speculation.pending.result())
+            except Exception as e:
+                logger.warning("Speculative parse failed, parsing again: %s", e)
+        self.stats.record(misses=1)
+        return self.parser.parse(text, context)
+
+    async def parse_async(self, text: str, context: ParserContext) -> ParsedCommand:
+        speculation = self._take(text, context)
+        if speculation is not None:
+            try:
+                return self._hit(speculation, text, await speculation.pending)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Speculative parse failed, parsing again: %s", e)
+        self.stats.record(misses=1)
+        return await self.parser.parse_async(text, context)
+
+    def cancel(self):
+        """Drop the current speculation, if any."""
+        if self._current is not None:
+            self._current.pending.cancel()
+            self._current = None
+            self.stats.record(discarded=1)
+
+    async def _parse_held(
+        self, text: str, context: ParserContext, held: list[Callable[[], None]]
+    ) -> ParsedCommand:
+        # Runs as its own task, so holding ends with it
+        hold_stats(held)
+        return await self.parser.parse_async(text, context)
+
+    def _is_current(self, text: str, context: ParserContext) -> bool:
+        current = self._current
+        return current is not None and current.context is context and current.text == normalize_input(text)
+
+    def _replace(
+        self,
+        text: str,
+        context: ParserContext,
+        pending: Future | asyncio.Task,
+        held: list[Callable[[], None]],
+    ):
+        self.cancel()
+        self._current = _Speculation(text, context, pending, held)
+        self.stats.record(started=1)
+
+    def _take(self, text: str, context: ParserContext) -> _Speculation | None:
+        """The speculation for this final line, or None (cancelling a stale one)."""
+        if self._is_current(text, context):
+            speculation, self._current = self._current, None
+            speculation.entered_at = time.perf_counter()
+            return speculation
+        self.cancel()
+        return None
+
+    def _hit(self, speculation: _Speculation, text: str, command: ParsedCommand) -> ParsedCommand:
+        # Parse time spent before Enter; all of it if the parse was done
+        ended = min(speculation.finished_at or speculation.entered_at, speculation.entered_at)
+        self.stats.record(hits=1, saved_seconds=ended - speculation.started_at)
+        for update in speculation.held:
+            update()
+        return command.model_copy(update={"raw_input": text.strip()})
@@ -0,0 +1,154 @@
+"""Streamed LLM completions that stop as soon as the command is known."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from engine.parser.grammar import SLOT_VERBS
+
+try:
+    from llama_cpp import StoppingCriteriaList
+except ImportError:
+    StoppingCriteriaList = None
+
+logger = logging.getLogger(__name__)
+
+
+class CommandStream:
+    """Incremental scanner over the JSON a model is generating.
+
+    ``feed`` each piece of text as it arrives; it returns True once the
+    command is complete. That is when the top-level object closes or,
+    with a grammar (whose field order is fixed, see ``build_grammar``),
+    when the last field the grammar allows has its value and only the
+    closing brace could follow. ``content`` is then the whole object.
+    """
+
+    def __init__(self, grammar: bool = False):
+        self.grammar = grammar
+        self.fields: dict[str, str] = {}
+        self.done = False
+        self._text: list[str] = []
+        self._depth = 0
+        self._string: list[str] | None = None
+        self._escape = False
+        self._key: str | None = None
+        self._expect_value = False
+
+    @property
+    def content(self) -> str:
+        return "".join(self._text)
+
+    def feed(self, piece: str) -> bool:
+        for char in piece:
+            if self.done:
+                break
+            self._text.append(char)
+            self._scan(char)
+        return self.done
+
+    def _scan(self, char: str):
+        if self._string is not None:
+            if self._escape:
+                self._escape = False
+                self._string.append(char)
+            elif char == "\\":
+                self._escape = True
+                self._string.append(char)
+            elif char == '"':
+                self._end_string("".join(self._string))
+            else:
+                self._string.append(char)
+        elif char == '"':
+            self._string = []
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            self.done = self._depth == 0
+        elif char == ":" and self._depth == 1:
+            self._expect_value = True
+
+    def _end_string(self, raw: str):
+        self._string = None
+        if self._depth != 1:
+            return
+        if not self._expect_value:
+            self._key = raw
+            return
+        self._expect_value = False
+        self.fields[self._key] = raw
+        if self.grammar and self._is_last_field(self._key):
+            self._text.append("}")
+            self.done = True
+
+    def _is_last_field(self, key: str) -> bool:
+        if key == "direction":
+            return True
+        return key == "direct_object" and self.fields.get("verb") in SLOT_VERBS
+
+
+def stream_content(llm: Any, request: dict[str, Any], deadline: float | None = None) -> str:
+    """Run ``request`` streamed on ``llm`` and return the command's JSON.
+
+    Generation is stopped as soon as the CommandStream is complete, so
+    the model never decodes the closing tokens, trailing whitespace or
+    anything else after the command. A model wrapper that ignores
+    ``stream`` and returns a whole response is read as usual.
+
+    Raises TimeoutError if the ``time.monotonic()`` ``deadline`` passes
+    before the command is complete.
+    """
+    start = time.perf_counter()
+    chunks = llm.create_chat_completion(**request, stream=True)
+    if isinstance(chunks, dict):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError("LLM inference timed out")
+        return chunks["choices"][0]["message"]["content"]
+
+    stream = CommandStream(grammar="grammar" in request)
+    tokens = needed = 0
+    try:
+        for chunk in chunks:
+            piece = chunk["choices"][0]["delta"].get("content")
+            if not piece:
+                continue
+            tokens += 1
+            if stream.feed(piece):
+                needed = tokens
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    finally:
+        # Closing the generator is what stops llama-cpp-python decoding
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+    if not stream.done and deadline is not None and time.monotonic() >= deadline:
+        raise TimeoutError(f"LLM inference timed out after {tokens} tokens")
+    elapsed = time.perf_counter() - start
+    logger.debug(
+        "LLM stream: %d tokens generated, %s, %.0f ms (%.1f ms/token)",
+        tokens,
+        f"command complete after {needed}" if needed else "ended before the command closed",
+        elapsed * 1000,
+        elapsed * 1000 / max(tokens, 1),
+    )
+    return stream.content
+
+
+def stop_at(deadline: float):
+    """llama.cpp stopping criteria ending generation at ``deadline``
+    (a ``time.monotonic()`` value).
+
+    Checked after every token, from whatever thread runs the model.
+    """
+    def past_deadline(input_ids, logits) -> bool:
+        return time.monotonic() >= deadline
+
+    if StoppingCriteriaList is None:
+        return [past_deadline]
+    return StoppingCriteriaList([past_deadline])
@@ -0,0 +1,302 @@
+"""Pool of LLM worker processes shared by every session of a server."""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable
+
+from engine.parser.batching import SchedulerBusyError
+from engine.parser.grammar import GrammarCache, compile_request
+from engine.parser.streaming import stop_at, stream_content
+
+logger = logging.getLogger(__name__)
+
+# How often the pool thread checks worker health when no results arrive
+HEALTH_CHECK_SECONDS = 0.5
+
+
+def load_llama(model_path: str, n_ctx: int = 2048, n_threads: int | None = None) -> Any:
+    """Load a GGUF model with memory-mapped weights.
+
+    Every worker maps the same file, so the weights sit in the page cache
+    once however many workers load them; only KV caches are per process.
+    """
+    from llama_cpp import Llama
+
+    return Llama(
+        model_path=model_path,
+        n_ctx=n_ctx,
+        n_threads=n_threads,
+        use_mmap=True,
+        verbose=False,
+    )
+
+
+def _worker_main(llm_factory: Callable[[], Any], conn: Connection):
+    """Worker process: load the model, then answer requests until None.
+
+    Each job carries the seconds its caller will still wait (None for no
+    limit); generation stops when they run out, freeing the worker.
+    """
+    try:
+        llm = llm_factory()
+    except Exception as e:
+        conn.send(("failed", None, repr(e)))
+        return
+    conn.send(("ready", None, None))
+    grammars = GrammarCache()
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        job_id, request, budget = job
+        # Measured from receipt: monotonic clocks are not shared by processes
+        deadline = None if budget is None else time.monotonic() + budget
+        request = compile_request(request, grammars)
+        if deadline is not None:
+            request = {**request, "stopping_criteria": stop_at(deadline)}
+        try:
+            content = stream_content(llm, request, deadline)
+        except Exception as e:
+            conn.send(("error", job_id, repr(e)))
+        else:
+            conn.send(("done", job_id, content))
+
+
+class _Job:
+    def __init__(self, job_id: int, request: dict[str, Any], deadline: float | None):
+        self.id = job_id
+        self.request = request
+        self.deadline = deadline
+        self.future: Future[str] = Future()
+
+
+class _Worker:
+    def __init__(self, worker_id: int):
+        self.id = worker_id
+        self.process: multiprocessing.process.BaseProcess | None = None
+        self.conn: Connection | None = None
+        self.ready = False
+        self.failed = False
+        self.job: _Job | None = None
+        self.job_started = 0.0
+
+
+class LLMWorkerPool:
+    """Runs chat completions on ``workers`` model processes.
+
+    Has the same ``submit`` interface as InferenceScheduler, so an
+    LLMParser built with ``scheduler=pool`` sends its requests here, and
+    any number of sessions can share the pool. Each worker loads the model
+    with ``llm_factory`` (by default ``load_llama`` on ``model_path``,
+    splitting the CPU cores between workers).
+
+    Requests wait in a queue of at most ``max_queue`` until a worker is
+    free; beyond that ``submit`` raises SchedulerBusyError and the parser
+    falls back to the keyword parser. A worker that dies, or holds one
+    request longer than ``job_timeout``, is killed and restarted and its
+    request fails.
+
+    A request submitted with a ``deadline`` (``time.monotonic()``) is
+    dropped if it is still queued then; once running, the worker stops
+    generating at the deadline.
+    """
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        workers: int = 2,
+        max_queue: int | None = None,
+        n_ctx: int = 2048,
+        job_timeout: float = 30.0,
+        llm_factory: Callable[[], Any] | None = None,
+    ):
+        if llm_factory is None:
+            n_threads = max(1, (os.cpu_count() or 1) // workers)
+            llm_factory = functools.partial(load_llama, model_path, n_ctx, n_threads)
+        self.llm_factory = llm_factory
+        self.max_queue = workers * 4 if max_queue is None else max_queue
+        self.job_timeout = job_timeout
+        # spawn: the parent runs threads, and forking those is unsafe
+        self._mp = multiprocessing.get_context("spawn")
+        self._workers = [_Worker(i) for i in range(workers)]
+        self._pending: deque[_Job] = deque()
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Stats
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+        for worker in self._workers:
+            self._start(worker)
+        self._thread = threading.Thread(target=self._run, name="llm-worker-pool", daemon=True)
+        self._thread.start()
+
+    def submit(self, deadline: float | None = None, **request: Any) -> Future[str]:
+        """Queue one create_chat_completion request; the future yields its content."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LLMWorkerPool is closed")
+            if all(w.failed for w in self._workers):
+                raise SchedulerBusyError("no LLM worker could load the model")
+            if len(self._pending) >= self.max_queue:
+                self.rejected += 1
+                raise SchedulerBusyError(f"all {len(self._workers)} LLM workers are busy")
+            job = _Job(next(self._job_ids), request, deadline)
+            self._pending.append(job)
+            self._dispatch()
+        return job.future
+
+    @property
+    def healthy_workers(self) -> int:
+        with self._lock:
+            return sum(1 for w in self._workers if w.ready and w.process.is_alive())
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until every worker has loaded its model."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.healthy_workers < len(self._workers):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close(self):
+        """Cancel queued requests, finish running ones and stop the workers."""
+        with self._lock:
+            self._closed = True
+            while self._pending:
+                self._pending.popleft().future.cancel()
+        self._thread.join()
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.conn.close()
+
+    def _start(self, worker: _Worker):
+        worker.conn, child_conn = self._mp.Pipe()
+        worker.ready = False
+        worker.process = self._mp.Process(
+            target=_worker_main,
+            args=(self.llm_factory, child_conn),
+            name=f"llm-worker-{worker.id}",
+            daemon=True,
+        )
+        worker.process.start()
+        child_conn.close()
+
+    def _dispatch(self):
+        """Hand queued jobs to idle workers. Caller holds the lock."""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if not worker.ready or worker.job is not None:
+                continue
+            while self._pending:
+                job = self._pending.popleft()
+                # Callers that timed out and cancelled are dropped
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                budget = None
+                if job.deadline is not None:
+                    budget = job.deadline - time.monotonic()
+                    if budget <= 0:
+                        job.future.set_exception(TimeoutError("LLM request expired in the queue"))
+                        continue
+                try:
+                    worker.conn.send((job.id, job.request, budget))
+                except OSError:
+                    # Died since its last health check, which will restart it
+                    worker.ready = False
+                    job.future.set_exception(RuntimeError(f"LLM worker {worker.id} failed"))
+                    break
+                worker.job = job
+                worker.job_started = time.monotonic()
+                break
+
+    def _run(self):
+        while True:
+            # A dead worker's pipe stays readable (EOF), so only poll live ones
+            conns = {w.conn: w for w in self._workers if w.process.is_alive()}
+            if conns:
+                ready = wait(list(conns), timeout=HEALTH_CHECK_SECONDS)
+            else:
+                ready = []
+                time.sleep(HEALTH_CHECK_SECONDS)
+            messages = []
+            for conn in ready:
+                try:
+                    messages.append((conns[conn], conn.recv()))
+                except (EOFError, OSError):
+                    pass  # the worker died; the health check restarts it
+            with self._lock:
+                for worker, message in messages:
+                    self._handle(worker, *message)
+                self._check_health()
+                if self._closed:
+                    if not any(w.job for w in self._workers):
+                        for worker in self._workers:
+                            try:
+                                worker.conn.send(None)
+                            except OSError:
+                                pass
+                        return
+                else:
+                    self._dispatch()
+
+    def _handle(self, worker: _Worker, kind: str, job_id: int | None, payload: str | None):
+        if kind == "ready":
+            worker.ready = True
+            return
+        if kind == "failed":
+            logger.error("LLM worker %d could not load the model: %s", worker.id, payload)
+            worker.failed = True
+            return
+        job = worker.job
+        if job is None or job.id != job_id:
+            return
+        worker.job = None
+        if kind == "done":
+            self.completed += 1
+            job.future.set_result(payload)
+        else:
+            job.future.set_exception(RuntimeError(payload))
+
+    def _check_health(self):
+        now = time.monotonic()
+        for worker in self._workers:
+            if worker.process.is_alive():
+                if worker.job is None or now - worker.job_started <= self.job_timeout:
+                    continue
+                logger.warning("LLM worker %d is stuck, restarting it", worker.id)
+                worker.process.kill()
+                worker.process.join()
+            elif worker.failed:
+                continue  # restarting would fail the same way
+            elif not self._closed:
+                logger.warning(
+                    "LLM worker %d exited with %s, restarting it",
+                    worker.id,
+                    worker.process.exitcode,
+                )
+            if worker.job is not None:
+                worker.job.future.set_exception(RuntimeError(f"LLM worker {worker.id} failed"))
+                worker.job = None
+            if not self._closed:
+                worker.conn.close()
+                self.restarts += 1
+                self._start(worker)
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 from engine.state.game_state import GameState, NPCState, ObjectState
+from engine.state.location_index import LocationIndex
+from engine.state.timer_wheel import TimerWheel
 from engine.state.state_manager import StateManager
 
-__all__ = ["GameState", "NPCState", "ObjectState", "StateManager"]
+__all__ = ["GameState", "LocationIndex", "NPCState", "ObjectState", "StateManager", "TimerWheel"]
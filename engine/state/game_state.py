@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 from engine.models.enums import ObjectProperty
+from engine.state.location_index import LocationIndex
+from engine.state.timer_wheel import TimerWheel
 
 
 class NPCState(BaseModel):
@@ -15,6 +19,18 @@ class NPCState(BaseModel):
     inventory: list[str] = Field(default_factory=list)
     attitude: str = "neutral"
 
+    _index: LocationIndex | None = PrivateAttr(default=None)
+    _npc_id: str = PrivateAttr(default="")
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in ("location", "alive") or self._index is None:
+            super().__setattr__(name, value)
+            return
+        index = self._index
+        index.remove_npc(self._npc_id, self.location, self.alive, forget=False)
+        super().__setattr__(name, value)
+        index.add_npc(self._npc_id, self.location, self.alive)
+
 
 class ObjectState(BaseModel):
     """Runtime state for a game object."""
@@ -22,6 +38,168 @@ class ObjectState(BaseModel):
     parent_object: str | None = None
     properties: set[ObjectProperty] = Field(default_factory=set)
 
+    _index: LocationIndex | None = PrivateAttr(default=None)
+    _object_id: str = PrivateAttr(default="")
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in ("location", "parent_object") or self._index is None:
+            super().__setattr__(name, value)
+            return
+        index = self._index
+        old = getattr(self, name)
+        super().__setattr__(name, value)
+        if name == "location":
+            index.move_object_location(self._object_id, old, value)
+        else:
+            index.move_object_parent(self._object_id, old, value)
+
+
+class _TrackedStates(dict):
+    """Dict of entity states that keeps a LocationIndex in sync.
+
+    Entries added, replaced or removed through any dict API are attached to
+    or detached from the index, so code that assigns into
+    ``GameState.object_states`` directly stays consistent.
+    """
+
+    def __init__(
+        self,
+        attach: Callable[[str, Any], None],
+        detach: Callable[[str, Any, bool], None],
+        items: dict[str, Any] | None = None,
+    ):
+        super().__init__()
+        self._attach = attach
+        self._detach = detach
+        if items:
+            self.update(items)
+
+    def __setitem__(self, key: str, value: Any):
+        old = dict.get(self, key)
+        if old is value:
+            return
+        if old is not None:
+            self._detach(key, old, False)
+        super().__setitem__(key, value)
+        self._attach(key, value)
+
+    def __delitem__(self, key: str):
+        old = self[key]
+        super().__delitem__(key)
+        self._detach(key, old, True)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def pop(self, key: str, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        old = super().pop(key)
+        self._detach(key, old, True)
+        return old
+
+    def popitem(self):
+        key, old = super().popitem()
+        self._detach(key, old, True)
+        return key, old
+
+    def clear(self):
+        for key, old in list(self.items()):
+            self._detach(key, old, True)
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: Any = None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+
+class _TrackedInventory(list):
+    """Inventory list that reports every item added to or removed from it."""
+
+    def __init__(self, on_change: Callable[[str], None], items: list[str] | None = None):
+        super().__init__(items or [])
+        self._on_change = on_change
+        for item in self:
+            on_change(item)
+
+    def remove(self, item: str):
+        super().remove(item)
+        self._on_change(item)
+
+    def pop(self, index: int = -1) -> str:
+        item = super().pop(index)
+        self._on_change(item)
+        return item
+
+    def clear(self):
+        items = list(self)
+        super().clear()
+        for item in items:
+            self._on_change(item)
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for item in removed:
+            self._on_change(item)
+
+    def append(self, item: str):
+        super().append(item)
+        self._on_change(item)
+
+    def insert(self, index: int, item: str):
+        super().insert(index, item)
+        self._on_change(item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._on_change(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: int):
+        super().__imul__(count)
+        for item in self:
+            self._on_change(item)
+        return self
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            replaced = self[index]
+        else:
+            replaced = [self[index]]
+        super().__setitem__(index, value)
+        for item in replaced + (value if isinstance(index, slice) else [value]):
+            self._on_change(item)
+
+    def sort(self, *args, **kwargs):
+        # Reordering changes no item, but listings of the inventory do
+        super().sort(*args, **kwargs)
+        for item in self:
+            self._on_change(item)
+
+    def reverse(self):
+        super().reverse()
+        for item in self:
+            self._on_change(item)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
 
 class GameState(BaseModel):
     """All mutable runtime state for a game session."""
@@ -38,6 +216,116 @@ class GameState(BaseModel):
     player_alive: bool = True
     player_health: int = 10
     dark_turns: int = 0
+    timers: dict[str, int] = Field(default_factory=dict)
+
+    # Built by _reindex; plain defaults keep construction cheap
+    _locations: LocationIndex = PrivateAttr(default=None)
+    _timer_wheel: TimerWheel = PrivateAttr(default=None)
+    _light_changes: set[str] = PrivateAttr(default=None)
+    _property_changes: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any):
+        self._reindex()
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in ("object_states", "npc_states", "inventory", "timers"):
+            self._reindex()
+
+    def __eq__(self, other: object) -> bool:
+        # Derived indexes are rebuilt from the fields, so only fields count
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> GameState:
+        copied = super().__deepcopy__(memo)
+        copied._reindex()
+        return copied
+
+    def clone(self) -> GameState:
+        """Return an independent copy without re-validating any field.
+
+        Much cheaper than ``model_copy(deep=True)``; used to start new
+        sessions from a prebuilt initial state.
+        """
+        fields = dict(self.__dict__)
+        fields["inventory"] = list(self.inventory)
+        fields["flags"] = set(self.flags)
+        fields["counters"] = dict(self.counters)
+        fields["visited_rooms"] = set(self.visited_rooms)
+        fields["fired_events"] = set(self.fired_events)
+        fields["timers"] = dict(self.timers)
+        fields["object_states"] = {
+            object_id: obj_state.model_copy(
+                update={"properties": set(obj_state.properties)}
+            )
+            for object_id, obj_state in self.object_states.items()
+        }
+        fields["npc_states"] = {
+            npc_id: npc_state.model_copy(
+                update={"inventory": list(npc_state.inventory)}
+            )
+            for npc_id, npc_state in self.npc_states.items()
+        }
+        return GameState.model_construct(_fields_set=self.model_fields_set, **fields)
+
+    def _reindex(self):
+        """Rebuild derived indexes and start tracking the state containers."""
+        previous = self._locations
+        index = LocationIndex()
+        # Keep ``version`` moving forward across rebuilds
+        if previous is not None:
+            index.version = previous.version + 1
+        self._locations = index
+        self._light_changes = set()
+
+        wheel = TimerWheel()
+        for name, turn in self.timers.items():
+            wheel.add(name, turn)
+        self._timer_wheel = wheel
+
+        def attach_object(object_id: str, obj_state: ObjectState):
+            obj_state._index = index
+            obj_state._object_id = object_id
+            index.add_object(object_id, obj_state.location, obj_state.parent_object)
+            if ObjectProperty.LIT in obj_state.properties:
+                self._light_changes.add(object_id)
+
+        def detach_object(object_id: str, obj_state: ObjectState, forget: bool):
+            index.remove_object(
+                object_id, obj_state.location, obj_state.parent_object, forget
+            )
+            obj_state._index = None
+
+        def attach_npc(npc_id: str, npc_state: NPCState):
+            npc_state._index = index
+            npc_state._npc_id = npc_id
+            index.add_npc(npc_id, npc_state.location, npc_state.alive)
+
+        def detach_npc(npc_id: str, npc_state: NPCState, forget: bool):
+            index.remove_npc(npc_id, npc_state.location, npc_state.alive, forget)
+            npc_state._index = None
+
+        # Write through __dict__ so wrapping does not re-enter __setattr__
+        self.__dict__["inventory"] = _TrackedInventory(
+            index.mark_changed, self.inventory
+        )
+        self.__dict__["object_states"] = _TrackedStates(
+            attach_object, detach_object, self.object_states
+        )
+        self.__dict__["npc_states"] = _TrackedStates(
+            attach_npc, detach_npc, self.npc_states
+        )
+
+    @property
+    def version(self) -> int:
+        """Goes up whenever an object or NPC moves, the inventory changes or
+        an object property is set or cleared.
+
+        Other fields (current room, score, flags) are not covered.
+        """
+        return self._locations.version + self._property_changes
 
     def get_object_location(self, object_id: str) -> str | None:
         if object_id in self.object_states:
@@ -69,10 +357,16 @@ class GameState(BaseModel):
         if object_id not in self.object_states:
             self.object_states[object_id] = ObjectState()
         self.object_states[object_id].properties.add(prop)
+        self._property_changes += 1
+        if prop == ObjectProperty.LIT:
+            self._light_changes.add(object_id)
 
     def remove_object_property(self, object_id: str, prop: ObjectProperty):
         if object_id in self.object_states:
             self.object_states[object_id].properties.discard(prop)
+            self._property_changes += 1
+            if prop == ObjectProperty.LIT:
+                self._light_changes.add(object_id)
 
     def has_object_property(self, object_id: str, prop: ObjectProperty) -> bool:
         if object_id in self.object_states:
@@ -80,22 +374,49 @@ class GameState(BaseModel):
         return False
 
     def objects_in_room(self, room_id: str) -> list[str]:
-        return [
-            oid for oid, state in self.object_states.items()
-            if state.location == room_id
-        ]
+        return self._locations.objects_in_room(room_id)
 
     def objects_in_container(self, container_id: str) -> list[str]:
-        return [
-            oid for oid, state in self.object_states.items()
-            if state.parent_object == container_id
-        ]
+        return self._locations.objects_in_container(container_id)
+
+    def pop_changed_objects(self) -> set[str]:
+        """Return and reset the IDs of objects added, moved, re-parented or
+        picked up since the last call.
+
+        Every tracked object is reported once after construction or load.
+        """
+        return self._locations.pop_changed()
+
+    def pop_light_changes(self) -> set[str]:
+        """Return and reset the IDs of objects lit or extinguished through
+        add/remove_object_property since the last call.
+
+        Every object that is lit is reported once after construction or load.
+        """
+        changes = self._light_changes
+        self._light_changes = set()
+        return changes
+
+    def schedule_timer(self, name: str, turn: int):
+        """Schedule (or reschedule) a named timer to fire on ``turn``."""
+        self.timers[name] = turn
+        self._timer_wheel.add(name, turn)
+
+    def cancel_timer(self, name: str):
+        self.timers.pop(name, None)
+
+    def pop_due_timers(self) -> list[str]:
+        """Remove and return timers due on or before the current turn,
+        earliest first."""
+        due = []
+        for turn, name in self._timer_wheel.pop_due(self.turns):
+            if self.timers.get(name) == turn:
+                del self.timers[name]
+                due.append(name)
+        return due
 
     def player_has(self, object_id: str) -> bool:
         return object_id in self.inventory
 
     def npc_in_room(self, room_id: str) -> list[str]:
-        return [
-            nid for nid, state in self.npc_states.items()
-            if state.location == room_id and state.alive
-        ]
+        return self._locations.npcs_in_room(room_id)
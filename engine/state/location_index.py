@@ -0,0 +1,137 @@
+"""Reverse indexes from rooms and containers to the things inside them."""
+
+from __future__ import annotations
+
+
+class LocationIndex:
+    """Maintains room -> objects, container -> children and room -> live NPCs.
+
+    Buckets are updated incrementally as object and NPC states move, so
+    lookups cost O(result) instead of a scan over every tracked entity.
+    Results are returned in the order the entities were first tracked,
+    which matches the iteration order of ``GameState.object_states`` and
+    ``GameState.npc_states``.
+
+    It also collects the IDs of objects that were added, moved or
+    re-parented (or reported through ``mark_changed``) until ``pop_changed``
+    drains them, and ``version`` goes up with every such change and every
+    NPC move.
+    """
+
+    def __init__(self):
+        self._rooms: dict[str, set[str]] = {}
+        self._containers: dict[str, set[str]] = {}
+        self._npc_rooms: dict[str, set[str]] = {}
+        self._object_order: dict[str, int] = {}
+        self._npc_order: dict[str, int] = {}
+        self._next_order = 0
+        self._changed: set[str] = set()
+        self.version = 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LocationIndex):
+            return NotImplemented
+        return (
+            self._rooms == other._rooms
+            and self._containers == other._containers
+            and self._npc_rooms == other._npc_rooms
+        )
+
+    # --- Objects ---
+
+    def mark_changed(self, object_id: str):
+        self.version += 1
+        self._changed.add(object_id)
+
+    def pop_changed(self) -> set[str]:
+        changed = self._changed
+        self._changed = set()
+        return changed
+
+    def add_object(self, object_id: str, location: str | None, parent: str | None):
+        if object_id not in self._object_order:
+            self._object_order[object_id] = self._next_order
+            self._next_order += 1
+        self.version += 1
+        self._changed.add(object_id)
+        if location is not None:
+            self._rooms.setdefault(location, set()).add(object_id)
+        if parent is not None:
+            self._containers.setdefault(parent, set()).add(object_id)
+
+    def remove_object(
+        self,
+        object_id: str,
+        location: str | None,
+        parent: str | None,
+        forget: bool = True,
+    ):
+        self.version += 1
+        _discard(self._rooms, location, object_id)
+        _discard(self._containers, parent, object_id)
+        if forget:
+            self._object_order.pop(object_id, None)
+
+    def move_object_location(self, object_id: str, old: str | None, new: str | None):
+        if old == new:
+            return
+        self.version += 1
+        self._changed.add(object_id)
+        _discard(self._rooms, old, object_id)
+        if new is not None:
+            self._rooms.setdefault(new, set()).add(object_id)
+
+    def move_object_parent(self, object_id: str, old: str | None, new: str | None):
+        if old == new:
+            return
+        self.version += 1
+        self._changed.add(object_id)
+        _discard(self._containers, old, object_id)
+        if new is not None:
+            self._containers.setdefault(new, set()).add(object_id)
+
+    def objects_in_room(self, room_id: str) -> list[str]:
+        return _ordered(self._rooms.get(room_id), self._object_order)
+
+    def objects_in_container(self, container_id: str) -> list[str]:
+        return _ordered(self._containers.get(container_id), self._object_order)
+
+    # --- NPCs ---
+
+    def add_npc(self, npc_id: str, location: str | None, alive: bool):
+        if npc_id not in self._npc_order:
+            self._npc_order[npc_id] = self._next_order
+            self._next_order += 1
+        self.version += 1
+        if alive and location is not None:
+            self._npc_rooms.setdefault(location, set()).add(npc_id)
+
+    def remove_npc(
+        self, npc_id: str, location: str | None, alive: bool, forget: bool = True
+    ):
+        self.version += 1
+        if alive:
+            _discard(self._npc_rooms, location, npc_id)
+        if forget:
+            self._npc_order.pop(npc_id, None)
+
+    def npcs_in_room(self, room_id: str) -> list[str]:
+        return _ordered(self._npc_rooms.get(room_id), self._npc_order)
+
+
+def _discard(buckets: dict[str, set[str]], key: str | None, member: str):
+    if key is None:
+        return
+    bucket = buckets.get(key)
+    if bucket is not None:
+        bucket.discard(member)
+        if not bucket:
+            del buckets[key]
+
+
+def _ordered(bucket: set[str] | None, order: dict[str, int]) -> list[str]:
+    if not bucket:
+        return []
+    if len(bucket) == 1:
+        return list(bucket)
+    return sorted(bucket, key=order.__getitem__)
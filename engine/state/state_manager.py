@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import json
+import re
 from pathlib import Path
 
 from engine.state.game_state import GameState
 
+# Slot names become file names, so no separators, dots or spaces
+SLOT_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
 
 class StateManager:
     """Manages saving and loading game state."""
@@ -15,8 +19,8 @@ class StateManager:
         self.save_dir = Path(save_dir)
 
     def save(self, state: GameState, slot: str = "quicksave") -> Path:
+        save_path = self._slot_path(slot)
         self.save_dir.mkdir(parents=True, exist_ok=True)
-        save_path = self.save_dir / f"{slot}.json"
         data = state.model_dump(mode="json")
         # Convert sets to sorted lists for JSON
         data["flags"] = sorted(data["flags"])
@@ -29,7 +33,7 @@ class StateManager:
         return save_path
 
     def load(self, slot: str = "quicksave") -> GameState:
-        save_path = self.save_dir / f"{slot}.json"
+        save_path = self._slot_path(slot)
         if not save_path.exists():
             raise FileNotFoundError(f"No save found: {save_path}")
         with open(save_path) as f:
@@ -40,3 +44,14 @@ class StateManager:
         if not self.save_dir.exists():
             return []
         return [p.stem for p in sorted(self.save_dir.glob("*.json"))]
+
+    def _slot_path(self, slot: str) -> Path:
+        """The save file of ``slot``; raises ValueError for a slot name that
+        is not letters, digits, '_' and '-' or that leaves ``save_dir``."""
+        if not SLOT_PATTERN.fullmatch(slot):
+            raise ValueError(f"Invalid save slot: {slot!r}")
+        save_dir = self.save_dir.resolve()
+        save_path = (save_dir / f"{slot}.json").resolve()
+        if save_path.parent != save_dir:
+            raise ValueError(f"Invalid save slot: {slot!r}")
+        return save_path
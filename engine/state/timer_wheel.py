@@ -0,0 +1,35 @@
+"""Turn-indexed wakeups for named timers."""
+
+from __future__ import annotations
+
+import heapq
+
+
+class TimerWheel:
+    """Buckets named timers by the turn they fire on.
+
+    The wheel only answers "what could be due by turn N" cheaply. Entries
+    are never removed on cancel; callers check each popped ``(turn, name)``
+    against their authoritative schedule and drop stale ones, so cancelling
+    or rescheduling is O(1).
+    """
+
+    def __init__(self):
+        self._buckets: dict[int, dict[str, None]] = {}
+        self._turns: list[int] = []
+
+    def add(self, name: str, turn: int):
+        bucket = self._buckets.get(turn)
+        if bucket is None:
+            bucket = self._buckets[turn] = {}
+            heapq.heappush(self._turns, turn)
+        bucket[name] = None
+
+    def pop_due(self, turn: int) -> list[tuple[int, str]]:
+        """Remove and return every entry scheduled at or before ``turn``."""
+        due = []
+        while self._turns and self._turns[0] <= turn:
+            bucket_turn = heapq.heappop(self._turns)
+            for name in self._buckets.pop(bucket_turn):
+                due.append((bucket_turn, name))
+        return due
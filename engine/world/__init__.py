@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 from engine.world.world import World
+from engine.world.event_index import EventIndex
 from engine.world.darkness import DarknessSystem
 from engine.world.scoring import ScoringSystem
 from engine.world.npc_controller import NPCController
 from engine.world.combat import CombatSystem
+from engine.world.world_cache import WorldCache
+from engine.world.regions import RegionIndex, RegionalWorld
 
-__all__ = ["World", "DarknessSystem", "ScoringSystem", "NPCController", "CombatSystem"]
+__all__ = ["World", "EventIndex", "DarknessSystem", "ScoringSystem", "NPCController", "CombatSystem", "WorldCache", "RegionIndex", "RegionalWorld"]
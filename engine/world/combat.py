@@ -29,8 +29,14 @@ class CombatSystem:
 
         return best_id, best_damage
 
-    def npc_attack_player(self, npc_id: str, state: GameState) -> str | None:
-        """NPC attacks the player. Returns message or None."""
+    def npc_attack_player(
+        self, npc_id: str, state: GameState, rng: random.Random | None = None
+    ) -> str | None:
+        """NPC attacks the player. Returns message or None.
+
+        ``rng`` defaults to the module-level ``random`` generator.
+        """
+        rng = rng or random
         npc = self.world.get_npc(npc_id)
         npc_state = state.npc_states.get(npc_id)
         if not npc or not npc_state or not npc_state.alive:
@@ -39,7 +45,7 @@ class CombatSystem:
             return None
 
         # 50% chance to attack each turn
-        if random.random() > 0.5:
+        if rng.random() > 0.5:
             miss_msg = npc.behavior.combat_messages.get(
                 "miss", f"The {npc.name} swings and misses!"
             )
@@ -6,6 +6,12 @@ from engine.models.enums import ObjectProperty
 from engine.state.game_state import GameState
 from engine.world.world import World
 
+# Remaining fuel at or below which a light source reports it is dim
+DIM_FUEL = 20
+
+_DIM = "dim"
+_BURNOUT = "burnout"
+
 
 class DarknessSystem:
     """Manages light/dark state and grue encounters."""
@@ -52,24 +58,78 @@ class DarknessSystem:
         return None
 
     def tick_light_sources(self, state: GameState, world: World) -> str | None:
-        """Decrement fuel on lit light sources. Returns warning message."""
-        for obj_id in list(state.inventory) + state.objects_in_room(state.current_room):
-            if not state.has_object_property(obj_id, ObjectProperty.LIT):
-                continue
-            obj = world.get_object(obj_id)
-            if not obj or obj.light_fuel < 0:
-                continue  # Infinite fuel
+        """Advance light-source fuel. Returns warning message.
+
+        Lighting a finite-fuel source schedules "dim" and "burnout" timers
+        for the turns its fuel crosses those thresholds; extinguishing it
+        cancels them and banks the remaining fuel in ``fuel_<id>``. On other
+        turns nothing is scanned. Fuel burns while the source is lit, and
+        only warnings for sources the player carries or can see in the
+        current room are reported.
+        """
+        for obj_id in state.pop_light_changes():
+            self._reschedule_fuel(obj_id, state, world)
 
-            # Track fuel in counters
-            fuel_key = f"fuel_{obj_id}"
-            fuel = state.counters.get(fuel_key, obj.light_fuel)
-            fuel -= 1
-            state.counters[fuel_key] = fuel
+        due = state.pop_due_timers()
+        if not due:
+            return None
 
-            if fuel <= 0:
+        messages: dict[str, str] = {}
+        for name in due:
+            kind, _, obj_id = name.partition(":")
+            obj = world.get_object(obj_id)
+            if kind == _BURNOUT:
+                state.cancel_timer(_timer_name(_DIM, obj_id))
+                state.counters[_fuel_key(obj_id)] = 0
                 state.remove_object_property(obj_id, ObjectProperty.LIT)
-                return f"The {obj.name} has run out of power."
-            elif fuel <= 20:
-                return f"The {obj.name} is getting dim."
+                messages[obj_id] = f"The {obj.name if obj else obj_id} has run out of power."
+            elif kind == _DIM:
+                burnout = state.timers.get(_timer_name(_BURNOUT, obj_id))
+                if burnout is not None and state.turns + 1 < burnout:
+                    state.schedule_timer(name, state.turns + 1)
+                messages.setdefault(obj_id, f"The {obj.name if obj else obj_id} is getting dim.")
 
+        for obj_id in state.inventory:
+            if obj_id in messages:
+                return messages[obj_id]
+        for obj_id in state.objects_in_room(state.current_room):
+            if obj_id in messages:
+                return messages[obj_id]
         return None
+
+    def _reschedule_fuel(self, obj_id: str, state: GameState, world: World):
+        """Bring an object's fuel timers in line with whether it is lit."""
+        burnout_name = _timer_name(_BURNOUT, obj_id)
+        burnout = state.timers.get(burnout_name)
+        lit = state.has_object_property(obj_id, ObjectProperty.LIT)
+
+        if not lit:
+            if burnout is not None:
+                # Fuel left after the last tick that burned it
+                state.counters[_fuel_key(obj_id)] = burnout - (state.turns - 1)
+                state.cancel_timer(burnout_name)
+                state.cancel_timer(_timer_name(_DIM, obj_id))
+            return
+
+        if burnout is not None:
+            return  # Already burning
+        obj = world.get_object(obj_id)
+        if not obj or obj.light_fuel < 0:
+            return  # Infinite fuel
+
+        # This tick burns the first unit of fuel, so the source burns out
+        # fuel - 1 turns from now and dims once DIM_FUEL units remain
+        fuel = state.counters.get(_fuel_key(obj_id), obj.light_fuel)
+        burnout = state.turns + fuel - 1
+        dim = state.turns + max(0, fuel - DIM_FUEL - 1)
+        state.schedule_timer(burnout_name, burnout)
+        if dim < burnout:
+            state.schedule_timer(_timer_name(_DIM, obj_id), dim)
+
+
+def _timer_name(kind: str, obj_id: str) -> str:
+    return f"{kind}:{obj_id}"
+
+
+def _fuel_key(obj_id: str) -> str:
+    return f"fuel_{obj_id}"
@@ -0,0 +1,86 @@
+"""Discrimination index that narrows events down to plausible candidates."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from engine.models import ConditionType, Event
+
+if TYPE_CHECKING:
+    from engine.actions.event_compiler import CompiledEvent
+
+
+class EventIndex:
+    """Indexes one trigger's events by their ACTION_IS, ACTION_TARGET_IS and
+    PLAYER_IN_ROOM conditions.
+
+    Events must be given in firing order (priority, highest first).
+    ``candidates`` returns positions into ``events`` (and the parallel
+    ``compiled`` list) in that same order, so callers see exactly the events
+    a linear scan would fire, minus those whose indexed conditions cannot
+    match.
+    """
+
+    def __init__(
+        self, events: list[Event], compiled: list[CompiledEvent] | None = None
+    ):
+        self.events = events
+        self.compiled = compiled or []
+        # (verb_id, direct_object_id, room_id) -> positions; None means "any"
+        self._buckets: dict[tuple[str | None, str | None, str | None], list[int]] = {}
+        for pos, event in enumerate(events):
+            self._buckets.setdefault(_event_key(event), []).append(pos)
+
+    def __getstate__(self) -> dict:
+        # Compiled closures cannot be pickled; the owner recompiles them
+        state = self.__dict__.copy()
+        state["compiled"] = []
+        return state
+
+    def candidates(
+        self,
+        verb_id: str | None,
+        direct_object_id: str | None,
+        room_id: str | None,
+        start: int = 0,
+    ) -> list[int]:
+        """Positions of events that may fire for this verb/object/room.
+
+        Only positions >= ``start`` are returned, which lets callers resume
+        after an effect moves the player mid-dispatch.
+        """
+        matched: list[list[int]] = []
+        for verb in _lookup_keys(verb_id):
+            for target in _lookup_keys(direct_object_id):
+                for room in _lookup_keys(room_id):
+                    bucket = self._buckets.get((verb, target, room))
+                    if bucket:
+                        matched.append(bucket)
+
+        if not matched:
+            return []
+        if len(matched) == 1:
+            positions = matched[0]
+        else:
+            positions = sorted(pos for bucket in matched for pos in bucket)
+        if start:
+            positions = [pos for pos in positions if pos >= start]
+        return positions
+
+
+def _event_key(event: Event) -> tuple[str | None, str | None, str | None]:
+    verb = target = room = None
+    for condition in event.conditions:
+        if condition.type == ConditionType.ACTION_IS and verb is None:
+            verb = condition.target
+        elif condition.type == ConditionType.ACTION_TARGET_IS and target is None:
+            target = condition.target
+        elif condition.type == ConditionType.PLAYER_IN_ROOM and room is None:
+            room = condition.target
+    return (verb, target, room)
+
+
+def _lookup_keys(value: str | None) -> tuple[str | None, ...]:
+    if value is None:
+        return (None,)
+    return (value, None)
@@ -15,8 +15,12 @@ class NPCController:
     def __init__(self, world: World):
         self.world = world
 
-    def tick(self, state: GameState) -> list[str]:
-        """Process all NPC actions for a turn. Returns messages."""
+    def tick(self, state: GameState, rng: random.Random | None = None) -> list[str]:
+        """Process all NPC actions for a turn. Returns messages.
+
+        ``rng`` defaults to the module-level ``random`` generator.
+        """
+        rng = rng or random
         messages = []
         for npc in self.world.all_npcs():
             npc_state = state.npc_states.get(npc.id)
@@ -25,27 +29,30 @@ class NPCController:
 
             # Wandering behavior
             if npc.behavior.wanders and npc.behavior.wander_rooms:
-                msg = self._handle_wander(npc.id, state)
+                msg = self._handle_wander(npc.id, state, rng)
                 if msg:
                     messages.append(msg)
 
             # Stealing behavior
             if npc.behavior.steals_items and npc_state.location == state.current_room:
-                msg = self._handle_steal(npc.id, state)
+                msg = self._handle_steal(npc.id, state, rng)
                 if msg:
                     messages.append(msg)
 
         return messages
 
-    def _handle_wander(self, npc_id: str, state: GameState) -> str | None:
+    def _handle_wander(
+        self, npc_id: str, state: GameState, rng: random.Random | None = None
+    ) -> str | None:
         """Move NPC to a random adjacent room from their wander list."""
+        rng = rng or random
         npc = self.world.get_npc(npc_id)
         npc_state = state.npc_states[npc_id]
         if not npc or not npc_state.location:
             return None
 
         # 30% chance to move each turn
-        if random.random() > 0.3:
+        if rng.random() > 0.3:
             return None
 
         possible = [r for r in npc.behavior.wander_rooms if r != npc_state.location]
@@ -53,7 +60,7 @@ class NPCController:
             return None
 
         old_room = npc_state.location
-        new_room = random.choice(possible)
+        new_room = rng.choice(possible)
         npc_state.location = new_room
 
         # Message if player can see the movement
@@ -64,15 +71,18 @@ class NPCController:
 
         return None
 
-    def _handle_steal(self, npc_id: str, state: GameState) -> str | None:
+    def _handle_steal(
+        self, npc_id: str, state: GameState, rng: random.Random | None = None
+    ) -> str | None:
         """NPC attempts to steal a valuable item from the player."""
+        rng = rng or random
         npc = self.world.get_npc(npc_id)
         npc_state = state.npc_states[npc_id]
         if not npc:
             return None
 
         # 25% chance to steal each turn
-        if random.random() > 0.25:
+        if rng.random() > 0.25:
             return None
 
         # Find valuable items in player inventory
@@ -85,7 +95,7 @@ class NPCController:
         if not valuable:
             return None
 
-        stolen_id = random.choice(valuable)
+        stolen_id = rng.choice(valuable)
         stolen_obj = self.world.get_object(stolen_id)
         state.inventory.remove(stolen_id)
         npc_state.inventory.append(stolen_id)
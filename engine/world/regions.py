@@ -0,0 +1,197 @@
+"""Region-based lazy loading of rooms for very large worlds."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from engine.loader.game_loader import GameData, GameLoader
+from engine.models import Room
+from engine.world.world import World
+from engine.world.world_cache import WorldCache
+
+if TYPE_CHECKING:
+    from engine.game_engine import GameSession
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".regionindex"
+
+
+class RegionIndex:
+    """Maps every room to its region (the ``rooms/`` file it lives in).
+
+    Stored next to the game directory (``games/zork1`` ->
+    ``games/zork1.regionindex``) with each region's file size, and a
+    fingerprint of the names, sizes and mtimes of every game file (not
+    just the rooms), so any edit rebuilds the index, and with it runs the
+    validating load, instead of trusting it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fingerprint: str,
+        region_bytes: dict[str, int],
+        room_regions: dict[str, str],
+    ):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.region_bytes = region_bytes
+        self.room_regions = room_regions
+
+    @staticmethod
+    def default_path(game_dir: str | Path) -> Path:
+        resolved = Path(game_dir).resolve()
+        return resolved.parent / f"{resolved.name}{INDEX_SUFFIX}"
+
+    @staticmethod
+    def fingerprint(game_dir: str | Path) -> str:
+        game_dir = Path(game_dir)
+        digest = hashlib.sha256(str(INDEX_VERSION).encode())
+        for file_path in WorldCache(game_dir).source_files():
+            st = file_path.stat()
+            name = file_path.relative_to(game_dir).as_posix()
+            digest.update(f"{name}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, loader: GameLoader, path: str | Path | None = None) -> RegionIndex:
+        """Read every room file once and index which rooms it holds."""
+        files = loader.region_files()
+        region_bytes: dict[str, int] = {}
+        room_regions: dict[str, str] = {}
+        for file_path in files:
+            region_bytes[file_path.name] = file_path.stat().st_size
+            for room in loader.load_region(file_path):
+                room_regions[room.id] = file_path.name
+        return cls(
+            Path(path) if path is not None else cls.default_path(loader.game_dir),
+            cls.fingerprint(loader.game_dir),
+            region_bytes,
+            room_regions,
+        )
+
+    @classmethod
+    def load(cls, loader: GameLoader, path: str | Path | None = None) -> RegionIndex | None:
+        """Return the saved index, or None if it is missing or stale."""
+        path = Path(path) if path is not None else cls.default_path(loader.game_dir)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable region index %s: %s", path, e)
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        if data.get("fingerprint") != cls.fingerprint(loader.game_dir):
+            logger.info("Ignoring %s: game files changed since it was built", path)
+            return None
+        return cls(path, data["fingerprint"], data["region_bytes"], data["room_regions"])
+
+    def write(self) -> Path:
+        """Write the index atomically."""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "fingerprint": self.fingerprint,
+                "region_bytes": self.region_bytes,
+                "room_regions": self.room_regions,
+            }, f)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+class RegionalWorld(World):
+    """A World whose rooms are loaded one region at a time.
+
+    Objects, NPCs, verbs and events stay resident: every session's
+    GameState carries their dynamic state, and name resolution and event
+    dispatch need them on every turn. Rooms are read from their region's
+    file on first ``get_room`` and kept in LRU order. Once the resident
+    regions' file sizes exceed ``memory_budget`` bytes, the least recently
+    used regions are dropped, except those an attached session is in.
+    """
+
+    def __init__(
+        self,
+        data: GameData,
+        index: RegionIndex,
+        loader: GameLoader,
+        memory_budget: int,
+    ):
+        super().__init__(data)
+        self.index = index
+        self.loader = loader
+        self.memory_budget = memory_budget
+        self._regions: OrderedDict[str, dict[str, Room]] = OrderedDict()
+        self._resident_bytes = 0
+        self._sessions: weakref.WeakSet[GameSession] = weakref.WeakSet()
+
+    def __getstate__(self):
+        raise TypeError("RegionalWorld is not cacheable; cache a full World instead")
+
+    def attach_session(self, session: GameSession):
+        self._sessions.add(session)
+
+    def get_room(self, room_id: str) -> Room | None:
+        region = self.index.room_regions.get(room_id)
+        if region is None:
+            return None
+        rooms = self._regions.get(region)
+        if rooms is None:
+            rooms = self._load_region(region)
+        else:
+            self._regions.move_to_end(region)
+        return rooms.get(room_id)
+
+    def all_rooms(self) -> list[Room]:
+        """Every room, loading each region in turn (expensive)."""
+        rooms = []
+        for region in self.index.region_bytes:
+            resident = self._regions.get(region)
+            if resident is None:
+                resident = {
+                    r.id: r
+                    for r in self.loader.load_region(self.loader.game_dir / "rooms" / region)
+                }
+            rooms.extend(resident.values())
+        return rooms
+
+    def resident_regions(self) -> list[str]:
+        """Loaded regions, least recently used first."""
+        return list(self._regions)
+
+    def _load_region(self, region: str) -> dict[str, Room]:
+        file_path = self.loader.game_dir / "rooms" / region
+        rooms = {r.id: r for r in self.loader.load_region(file_path)}
+        self._regions[region] = rooms
+        self._resident_bytes += self.index.region_bytes[region]
+        logger.debug("Loaded region %s (%d rooms)", region, len(rooms))
+        self._evict(keep=region)
+        return rooms
+
+    def _evict(self, keep: str):
+        if self._resident_bytes <= self.memory_budget:
+            return
+        occupied = {keep}
+        for session in list(self._sessions):
+            occupied.add(self.index.room_regions.get(session.state.current_room))
+        for region in list(self._regions):
+            if self._resident_bytes <= self.memory_budget:
+                break
+            if region in occupied:
+                continue
+            del self._regions[region]
+            self._resident_bytes -= self.index.region_bytes[region]
+            logger.debug("Evicted region %s", region)
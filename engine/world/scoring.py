@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from engine.models.enums import ObjectProperty
 from engine.state.game_state import GameState
 from engine.world.world import World
 
@@ -13,32 +12,48 @@ class ScoringSystem:
     def __init__(self, world: World):
         self.world = world
 
+        # Treasures in world order, with their flag names built once
+        self._treasures: dict[str, tuple[int, int, str, str]] = {}
+        for obj in world.all_objects():
+            if obj.score_value > 0:
+                self._treasures[obj.id] = (
+                    len(self._treasures),
+                    obj.score_value,
+                    f"scored_{obj.id}",
+                    f"picked_up_{obj.id}",
+                )
+
     def check_treasure_score(self, state: GameState) -> tuple[int, str | None]:
         """Check if any new treasures should award points.
-        Returns (points_awarded, message)."""
-        points = 0
-        messages = []
+        Returns (points_awarded, message).
 
-        for obj in self.world.all_objects():
-            if obj.score_value <= 0:
-                continue
+        Only objects GameState reports as changed since the previous check
+        are examined.
+        """
+        touched = [
+            oid for oid in state.pop_changed_objects() if oid in self._treasures
+        ]
+        if not touched:
+            return 0, None
+        touched.sort(key=lambda oid: self._treasures[oid][0])
 
-            score_flag = f"scored_{obj.id}"
+        points = 0
+        messages = []
+        for obj_id in touched:
+            _, score_value, score_flag, pickup_flag = self._treasures[obj_id]
             if score_flag in state.flags:
                 continue
 
             # Award points for picking up treasure
-            pickup_flag = f"picked_up_{obj.id}"
-            if obj.id in state.inventory and pickup_flag not in state.flags:
+            if obj_id in state.inventory and pickup_flag not in state.flags:
                 state.flags.add(pickup_flag)
 
             # Award points for placing in trophy case
-            obj_state = state.object_states.get(obj.id)
+            obj_state = state.object_states.get(obj_id)
             if obj_state and obj_state.parent_object == "trophy_case":
-                if score_flag not in state.flags:
-                    state.flags.add(score_flag)
-                    points += obj.score_value
-                    messages.append(f"[Your score just went up by {obj.score_value} points.]")
+                state.flags.add(score_flag)
+                points += score_value
+                messages.append(f"[Your score just went up by {score_value} points.]")
 
         if points > 0:
             state.score += points
@@ -12,12 +12,14 @@ from engine.models import (
     TriggerType,
     VerbDefinition,
 )
+from engine.world.event_index import EventIndex
 
 
 class World:
     """Provides indexed access to immutable game data."""
 
     def __init__(self, data: GameData):
+        self.data = data
         self.config: GameConfig = data.config
 
         # Index rooms by ID
@@ -47,6 +49,8 @@ class World:
         for verb in data.verbs:
             for name in verb.names:
                 self._verb_names[name.lower()] = verb.id
+        # Verb names offered to parsers: the first two names of each verb
+        self.parser_verbs: list[str] = [n for v in data.verbs for n in v.names[:2]]
 
         # Index events by trigger type
         self._events: dict[str, Event] = {e.id: e for e in data.events}
@@ -59,6 +63,34 @@ class World:
                 key=lambda e: e.priority, reverse=True
             )
 
+        # Discrimination index per trigger over verb/target/room conditions
+        self._event_indexes: dict[TriggerType, EventIndex] = {
+            trigger: EventIndex(events)
+            for trigger, events in self._events_by_trigger.items()
+        }
+        self._empty_event_index = EventIndex([])
+        self._compile_events()
+
+    def __setstate__(self, state: dict):
+        # Compiled events are closures and are not pickled; rebuild them
+        self.__dict__.update(state)
+        self._compile_events()
+
+    def _compile_events(self):
+        """Compile conditions/effects once for every indexed event."""
+        # Imported here because engine.actions depends on this module
+        from engine.actions.event_compiler import EventCompiler
+        compiler = EventCompiler()
+        for index in self._event_indexes.values():
+            index.compiled = [compiler.compile_event(e) for e in index.events]
+
+    def attach_session(self, session):
+        """Called for every session playing in this world.
+
+        Worlds that page data in and out use it to see where players are;
+        a fully loaded World has nothing to do.
+        """
+
     def get_room(self, room_id: str) -> Room | None:
         return self._rooms.get(room_id)
 
@@ -83,6 +115,9 @@ class World:
     def get_events_for_trigger(self, trigger: TriggerType) -> list[Event]:
         return self._events_by_trigger.get(trigger, [])
 
+    def get_event_index(self, trigger: TriggerType) -> EventIndex:
+        return self._event_indexes.get(trigger, self._empty_event_index)
+
     def all_rooms(self) -> list[Room]:
         return list(self._rooms.values())
 
@@ -0,0 +1,123 @@
+"""Precompiled binary cache of a loaded, validated and indexed World."""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+
+import pydantic
+
+from engine.world.world import World
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".worldcache"
+SOURCE_DIRS = ("rooms", "objects", "npcs", "verbs", "events")
+
+_MAGIC = b"ADVWORLD"
+# magic, format version, sha256 of the game sources
+_HEADER = struct.Struct(f"<{len(_MAGIC)}sI32s")
+
+
+class WorldCache:
+    """Reads and writes the compiled cache for one game directory.
+
+    The cache file sits next to the game directory (``games/zork1`` ->
+    ``games/zork1.worldcache``) and holds a pickled World: the validated
+    models plus every lookup and event index. Its header records a format
+    version and a hash of the JSON sources, so a stale or foreign cache is
+    ignored rather than loaded.
+    """
+
+    def __init__(self, game_dir: str | Path, cache_path: str | Path | None = None):
+        self.game_dir = Path(game_dir)
+        if cache_path is None:
+            resolved = self.game_dir.resolve()
+            cache_path = resolved.parent / f"{resolved.name}{CACHE_SUFFIX}"
+        self.path = Path(cache_path)
+
+    def source_files(self) -> list[Path]:
+        """Every file GameLoader reads, in a stable order."""
+        files = [self.game_dir / "game.json"]
+        for subdir in SOURCE_DIRS:
+            files.extend(sorted((self.game_dir / subdir).glob("*.json")))
+        return files
+
+    def source_hash(self) -> bytes:
+        """sha256 over the source files' paths and contents.
+
+        The pydantic version is mixed in because it determines the pickled
+        model layout.
+        """
+        digest = hashlib.sha256(f"{CACHE_VERSION}:{pydantic.VERSION}".encode())
+        for file_path in self.source_files():
+            digest.update(file_path.relative_to(self.game_dir).as_posix().encode())
+            digest.update(b"\0")
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+        return digest.digest()
+
+    def write(self, world: World) -> Path:
+        """Write ``world`` to the cache file atomically."""
+        header = _HEADER.pack(_MAGIC, CACHE_VERSION, self.source_hash())
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            pickle.dump(world, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def load(self) -> World | None:
+        """Return the cached World, or None if it is missing or stale."""
+        if not self.path.exists():
+            return None
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, version, source_hash = _HEADER.unpack_from(mapped)
+                if magic != _MAGIC or version != CACHE_VERSION:
+                    logger.info("Ignoring %s: not a version %d cache", self.path, CACHE_VERSION)
+                    return None
+                if source_hash != self.source_hash():
+                    logger.info("Ignoring %s: game data changed since compile", self.path)
+                    return None
+                payload = memoryview(mapped)[_HEADER.size:]
+                try:
+                    with gc_paused():
+                        world = pickle.loads(payload)
+                except Exception as e:
+                    logger.warning("Ignoring unreadable cache %s: %s", self.path, e)
+                    return None
+                finally:
+                    payload.release()
+        if not isinstance(world, World):
+            return None
+        return world
+
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic garbage collector while building a large World.
+
+    Loading allocates hundreds of thousands of models and nothing becomes
+    garbage, yet every allocation threshold triggers a collection that
+    walks all of them; on big worlds that is most of the load time.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Throughput and latency of batched LLM parsing across many sessions.
+
+Concurrent client threads (one per simulated session) parse commands through
+LLMParsers that share one InferenceScheduler. For each maximum batch size the
+benchmark reports requests per second, p50/p95 parse latency and the batch
+sizes actually formed. Runs against scripts/stub_llm.StubBatchBackend by
+default, or a llama.cpp server started with --parallel via --server-url.
+
+    python3 scripts/bench_batching.py --sessions 32 --batch-sizes 1,2,4,8,16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.parser.batching import InferenceScheduler, LlamaServerBackend  # noqa: E402
+from engine.parser.llm_parser import LLMParser  # noqa: E402
+from engine.parser.parser_interface import ParserContext  # noqa: E402
+from scripts.stub_llm import StubBatchBackend  # noqa: E402
+
+COMMANDS = [
+    "take the lamp", "go north", "open the mailbox", "read leaflet",
+    "drop the sword", "look", "put the key in the box", "west",
+]
+
+CONTEXT = ParserContext(
+    visible_objects=["brass lantern", "small mailbox", "leaflet"],
+    inventory=["elvish sword"],
+    exits=["north", "south", "west"],
+    valid_verbs=["look", "take", "drop", "go", "open", "read", "attack", "put"],
+)
+
+
+def run(backend, sessions: int, requests_per_session: int, window_ms: float) -> dict:
+    scheduler = InferenceScheduler(backend, window_ms=window_ms)
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def client(index: int):
+        parser = LLMParser(scheduler=scheduler)
+        for i in range(requests_per_session):
+            start = time.perf_counter()
+            parser.parse(COMMANDS[(index + i) % len(COMMANDS)], CONTEXT)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    scheduler.close()
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "mean_batch": scheduler.mean_batch_size,
+    }
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sessions", type=int, default=32)
+    arg_parser.add_argument("--requests", type=int, default=8, help="Requests per session")
+    arg_parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+    arg_parser.add_argument("--window-ms", type=float, default=5.0)
+    arg_parser.add_argument("--server-url", help="llama.cpp server to benchmark instead of the stub")
+    args = arg_parser.parse_args()
+
+    print(f"{'batch':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'mean batch':>10}")
+    for max_batch in (int(b) for b in args.batch_sizes.split(",")):
+        if args.server_url:
+            backend = LlamaServerBackend(args.server_url, max_batch=max_batch)
+        else:
+            backend = StubBatchBackend(max_batch=max_batch)
+        result = run(backend, args.sessions, args.requests, args.window_ms)
+        print(
+            f"{max_batch:>5} {result['throughput']:>8.1f} {result['p50_ms']:>8.1f} "
+            f"{result['p95_ms']:>8.1f} {result['mean_batch']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark FallbackParser object matching in rooms with many objects.
+
+Compares the trie-based NameMatcher with the linear scan it replaced, for
+rooms of several sizes. Each turn parses a few commands naming random
+objects; every ``--churn`` turns one object is swapped for a new one, so
+the matcher has to follow a changing context the way it does in play.
+
+    python3 scripts/bench_matcher.py --objects 100,300,1000 --turns 2000 --churn 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.parser.fallback_parser import FallbackParser  # noqa: E402
+from engine.parser.parser_interface import ParserContext  # noqa: E402
+
+ADJECTIVES = ["rusty", "small", "large", "golden", "wooden", "broken", "shiny", "old"]
+NOUNS = ["key", "box", "lamp", "sword", "coin", "book", "rope", "bottle", "chest", "ring"]
+
+
+class LinearFallbackParser(FallbackParser):
+    """FallbackParser with the previous exact-name linear scan."""
+
+    def _match_object(self, text, context):
+        if not text:
+            return None
+        text = re.sub(r"^(the|a|an|some)\s+", "", text.strip())
+        if not text:
+            return None
+        for obj_name in context.visible_objects + context.inventory:
+            if text == obj_name.lower():
+                return obj_name
+        for npc_name in context.npc_names:
+            if text == npc_name.lower():
+                return npc_name
+        return text
+
+
+def object_name(i: int) -> str:
+    return f"{ADJECTIVES[i % len(ADJECTIVES)]} {NOUNS[i // len(ADJECTIVES) % len(NOUNS)]} {i}"
+
+
+def run(parser: FallbackParser, n_objects: int, turns: int, churn: int, seed: int) -> float:
+    rng = random.Random(seed)
+    objects = [object_name(i) for i in range(n_objects)]
+    next_id = n_objects
+    start = time.perf_counter()
+    for turn in range(turns):
+        if churn and turn % churn == 0:
+            objects[rng.randrange(len(objects))] = object_name(next_id)
+            next_id += 1
+        # A new context each turn, as GameSession builds one per command
+        context = ParserContext(visible_objects=list(objects), inventory=["elvish sword"])
+        target = rng.choice(objects)
+        parser.parse(f"take the {target}", context)
+        parser.parse(f"put the {rng.choice(objects)} in the {target}", context)
+    return (time.perf_counter() - start) / turns * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("--objects", default="10,100,300,1000")
+    arg_parser.add_argument("--turns", type=int, default=2000)
+    arg_parser.add_argument("--churn", type=int, default=10, help="Swap an object every N turns (0: never)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    print(f"{'objects':>8} {'linear us/turn':>15} {'trie us/turn':>13} {'speedup':>8}")
+    for n in (int(x) for x in args.objects.split(",")):
+        linear = run(LinearFallbackParser(), n, args.turns, args.churn, args.seed)
+        trie = run(FallbackParser(), n, args.turns, args.churn, args.seed)
+        print(f"{n:>8} {linear:>15.1f} {trie:>13.1f} {linear / trie:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark LLMParser time-to-first-token with and without prefix snapshots.
+
+Runs against scripts/stub_llm.StubLlama, which charges a fixed cost per
+evaluated prompt token and reuses the longest cached token prefix the way
+llama-cpp-python does. Two workloads:
+
+  sequential   one game's commands back to back on one model
+  interleaved  two games (different verb lists, so different system
+               prompts) alternating on one shared model
+
+Pass --model to run the same workloads against a real GGUF instead.
+
+    python3 scripts/bench_prefix_cache.py --requests 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.parser.llm_parser import LLMParser  # noqa: E402
+from engine.parser.parser_interface import ParserContext  # noqa: E402
+from scripts.stub_llm import StubLlama  # noqa: E402
+
+COMMANDS = [
+    "take the lamp", "go north", "open the mailbox", "read leaflet",
+    "um yeah drop the sword", "look", "put the key in the box", "west",
+]
+
+CONTEXTS = [
+    ParserContext(
+        visible_objects=["brass lantern", "small mailbox", "leaflet"],
+        inventory=["elvish sword"],
+        exits=["north", "south", "west"],
+        valid_verbs=["look", "take", "drop", "go", "open", "read", "attack", "put"],
+        object_aliases={"brass lantern": ["lantern", "lamp"]},
+    ),
+    ParserContext(
+        visible_objects=["rusty key", "wooden box"],
+        exits=["east", "up"],
+        valid_verbs=["look", "take", "drop", "go", "open", "unlock", "climb", "put"],
+    ),
+]
+
+
+def run(llm, prefix_cache: bool, contexts: list[ParserContext], n_requests: int) -> dict:
+    parsers = [LLMParser(llm=llm, prefix_cache=prefix_cache) for _ in contexts]
+    # Warm-up: the first request per game primes the prefix (or the cache)
+    for parser, context in zip(parsers, contexts):
+        parser.parse("look", context)
+
+    prefilled_before = getattr(llm, "prefilled_tokens", 0)
+    ttft, latency = [], []
+    for i in range(n_requests):
+        parser = parsers[i % len(parsers)]
+        context = contexts[i % len(contexts)]
+        start = time.perf_counter()
+        parser.parse(COMMANDS[i % len(COMMANDS)], context)
+        latency.append(time.perf_counter() - start)
+        ttft.append(getattr(llm, "last_prefill_seconds", 0.0))
+    prefilled = getattr(llm, "prefilled_tokens", 0) - prefilled_before
+    return {
+        "ttft_ms": statistics.mean(ttft) * 1000,
+        "latency_ms": statistics.mean(latency) * 1000,
+        "prefill_tokens": prefilled / n_requests,
+    }
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--requests", type=int, default=40)
+    arg_parser.add_argument("--prefill-ms", type=float, default=0.2,
+                            help="Stub cost per prompt token (default: 0.2)")
+    arg_parser.add_argument("--decode-ms", type=float, default=4.0,
+                            help="Stub cost per generated token (default: 4.0)")
+    arg_parser.add_argument("--model", help="Benchmark a real GGUF model instead of the stub")
+    args = arg_parser.parse_args()
+
+    if args.model:
+        from llama_cpp import Llama
+        llm = Llama(model_path=args.model, n_ctx=2048, verbose=False)
+    else:
+        llm = None
+
+    for workload, contexts in (("sequential", CONTEXTS[:1]), ("interleaved", CONTEXTS)):
+        print(f"{workload}:")
+        for prefix_cache in (False, True):
+            model = llm or StubLlama(args.prefill_ms, args.decode_ms)
+            result = run(model, prefix_cache, contexts, args.requests)
+            label = "prefix snapshots" if prefix_cache else "no snapshots"
+            line = f"  {label:<17} parse {result['latency_ms']:7.1f} ms"
+            if llm is None:
+                line += (
+                    f"  ttft {result['ttft_ms']:7.1f} ms"
+                    f"  prefilled {result['prefill_tokens']:6.0f} tokens/request"
+                )
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
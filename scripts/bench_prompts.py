@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Compare the fixed few-shot prompt with per-input example selection.
+
+Every example of the bundled bank is parsed leave-one-out: the selector
+may pick from all other examples. For both prompts this reports the
+prompt tokens per turn (all of it, and the user part that cannot be
+prefix-cached) and, for the selected prompt, how often the correct verb
+is among the likely verbs. With --model each input is also parsed by the
+LLM with both prompts, giving their accuracy and latency.
+
+    python3 scripts/bench_prompts.py --k 3
+    python3 scripts/bench_prompts.py --k 3 --model models/qwen2.5-1.5b-instruct-q4_k_m.gguf
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.loader import GameLoader  # noqa: E402
+from engine.parser.example_bank import EXAMPLE_BANK  # noqa: E402
+from engine.parser.example_selector import ExampleSelector  # noqa: E402
+from engine.parser.parser_interface import ParserContext  # noqa: E402
+from engine.parser.prompt_builder import PromptBuilder, estimate_tokens  # noqa: E402
+
+FIELDS = ("verb", "direct_object", "indirect_object", "preposition", "direction")
+
+
+def bank_context(verbs: list[str]) -> ParserContext:
+    """A room holding every object the bank mentions."""
+    objects: set[str] = set()
+    for example in EXAMPLE_BANK:
+        output = json.loads(example["output"])
+        for field in ("direct_object", "indirect_object"):
+            if field in output and output["verb"] not in ("save", "restore"):
+                objects.add(output[field])
+    return ParserContext(
+        visible_objects=sorted(objects - {"troll"}),
+        npc_names=["troll"],
+        exits=["north", "south", "east", "west", "up", "down"],
+        valid_verbs=verbs,
+        object_aliases={"brass lantern": ["lamp", "lantern"], "small mailbox": ["mailbox"]},
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("--k", type=int, default=3, help="Examples per selected prompt")
+    arg_parser.add_argument("--model", help="GGUF model to measure parse accuracy with")
+    arg_parser.add_argument(
+        "--game", default=os.path.join(ROOT, "games", "zork1"),
+        help="Game whose verb names are the valid verbs, as GameSession passes them",
+    )
+    args = arg_parser.parse_args()
+
+    game = GameLoader(args.game).load()
+    context = bank_context([n for v in game.verbs for n in v.names[:2]])
+    # Synonyms count as the same verb ("shut" for "close")
+    verb_id = {name: v.id for v in game.verbs for name in v.names}
+    same_verb = lambda a, b: verb_id.get(a, a) == verb_id.get(b, b)  # noqa: E731
+    fixed = PromptBuilder()
+    count = estimate_tokens
+    llm = None
+    if args.model:
+        from engine.parser.worker_pool import load_llama
+        llm = load_llama(args.model)
+        count = lambda text: len(llm.tokenize(text.encode(), add_bos=False))  # noqa: E731
+
+    rows = {"fixed": [], "selected": []}
+    verb_hits = 0
+    for i, example in enumerate(EXAMPLE_BANK):
+        others = EXAMPLE_BANK[:i] + EXAMPLE_BANK[i + 1:]
+        selected = PromptBuilder(ExampleSelector(others), k=args.k)
+        text = example["input"]
+        for name, builder in (("fixed", fixed), ("selected", selected)):
+            system = builder.build_system_prompt(context)
+            user = builder.build_user_prompt(text, context)
+            rows[name].append((count(system) + count(user), count(user)))
+        expected_verb = json.loads(example["output"])["verb"]
+        candidates = selected.selector.candidate_verbs(text, context.valid_verbs)
+        verb_hits += any(same_verb(expected_verb, v) for v in candidates)
+
+    print(f"{len(EXAMPLE_BANK)} inputs, leave-one-out, k={args.k}"
+          f" ({'model tokenizer' if llm else 'estimated tokens'})")
+    print(f"{'prompt':>9} {'tokens/turn':>12} {'uncached':>9}")
+    for name, sizes in rows.items():
+        print(f"{name:>9} {statistics.mean(s[0] for s in sizes):>12.0f}"
+              f" {statistics.mean(s[1] for s in sizes):>9.0f}")
+    print(f"correct verb among likely verbs: {verb_hits / len(EXAMPLE_BANK):.1%}")
+
+    if llm is None:
+        return
+    from engine.parser.llm_parser import LLMParser
+
+    print(f"{'prompt':>9} {'accuracy':>9} {'verb acc':>9} {'p50 ms':>7}")
+    for name in ("fixed", "selected"):
+        exact = verbs = 0
+        latencies = []
+        # One parser per prompt, so its system prompt is prefix-cached once
+        parser = LLMParser(llm=llm)
+        for i, example in enumerate(EXAMPLE_BANK):
+            if name == "selected":
+                others = EXAMPLE_BANK[:i] + EXAMPLE_BANK[i + 1:]
+                parser.prompt_builder = PromptBuilder(ExampleSelector(others), k=args.k)
+            expected = json.loads(example["output"])
+            start = time.perf_counter()
+            command = parser.parse(example["input"], context)
+            latencies.append((time.perf_counter() - start) * 1000)
+            got = command.model_dump()
+            verb_ok = same_verb(got["verb"], expected["verb"])
+            verbs += verb_ok
+            exact += verb_ok and all(got.get(f) == expected.get(f) for f in FIELDS[1:])
+        print(f"{name:>9} {exact / len(EXAMPLE_BANK):>9.1%} {verbs / len(EXAMPLE_BANK):>9.1%}"
+              f" {statistics.median(latencies):>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
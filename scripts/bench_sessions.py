@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Measure what a new player session costs on a shared GameRuntime.
+
+Times building N sessions with ``GameRuntime.new_session`` against building
+N standalone GameEngines on an already loaded World (what the server did
+before the split), and reports traced memory retained per session.
+
+    python3 scripts/bench_sessions.py games/zork1 --sessions 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.game_engine import GameEngine, GameRuntime  # noqa: E402
+from engine.parser.fallback_parser import FallbackParser  # noqa: E402
+
+
+def _measure(label: str, n: int, factory) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    sessions = [factory() for _ in range(n)]
+    elapsed = time.perf_counter() - start
+    del sessions
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sessions = [factory() for _ in range(n)]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del sessions
+
+    print(
+        f"{label:>8}: {elapsed / n * 1e6:8.1f} us/session, "
+        f"{retained / n / 1024:6.1f} KB/session"
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("game_dir", nargs="?", default=os.path.join(ROOT, "games", "zork1"))
+    arg_parser.add_argument("--sessions", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    runtime = GameRuntime.load(args.game_dir)
+    print(f"runtime: loaded {args.game_dir} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    parser = FallbackParser()
+    _measure("engine", args.sessions, lambda: GameEngine(
+        args.game_dir, parser, world=runtime.world
+    ))
+    _measure("session", args.sessions, lambda: runtime.new_session(parser))
+
+
+if __name__ == "__main__":
+    main()
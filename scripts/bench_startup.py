@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Measure engine startup with and without the compiled world cache.
+
+For each game, times the JSON load + validation + World build that every
+start used to pay, the same JSON load spread over ``--workers`` processes,
+``compile_world``, and ``load_world`` reading the cache.
+Besides a real game directory it can generate a synthetic world of any size
+(a grid of rooms split over several files, with objects and events).
+
+    python3 scripts/bench_startup.py games/zork1 --synthetic-rooms 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.game_engine import compile_world, load_world  # noqa: E402
+from engine.loader import GameLoader  # noqa: E402
+from engine.world.world_cache import WorldCache, gc_paused  # noqa: E402
+
+
+def write_synthetic_game(
+    game_dir: Path,
+    n_rooms: int,
+    rooms_per_file: int = 1000,
+    objects_per_room: float = 0.5,
+    events_per_room: float = 0.05,
+) -> None:
+    """Write a square grid of ``n_rooms`` rooms (plus objects and events)."""
+    width = max(1, int(n_rooms ** 0.5))
+    for subdir in ("rooms", "objects", "npcs", "verbs", "events"):
+        (game_dir / subdir).mkdir(parents=True, exist_ok=True)
+    (game_dir / "game.json").write_text(json.dumps({
+        "title": f"Synthetic {n_rooms}",
+        "starting_room": "room_0",
+    }))
+
+    def room(i: int) -> dict:
+        exits = []
+        for direction, j in (("east", i + 1), ("west", i - 1),
+                             ("south", i + width), ("north", i - width)):
+            same_row = direction not in ("east", "west") or j // width == i // width
+            if 0 <= j < n_rooms and same_row:
+                exits.append({"direction": direction, "target_room": f"room_{j}"})
+        return {
+            "id": f"room_{i}",
+            "name": f"Room {i}",
+            "description": f"You are in room {i} of a very large maze of twisty passages.",
+            "exits": exits,
+        }
+
+    for start in range(0, n_rooms, rooms_per_file):
+        end = min(n_rooms, start + rooms_per_file)
+        rooms = [room(i) for i in range(start, end)]
+        (game_dir / "rooms" / f"region_{start // rooms_per_file:05d}.json").write_text(
+            json.dumps(rooms)
+        )
+
+    n_objects = int(n_rooms * objects_per_room)
+    objects = [
+        {
+            "id": f"obj_{i}",
+            "name": f"trinket {i}",
+            "aliases": [f"thing {i}"],
+            "description": {"examine": f"A small trinket numbered {i}."},
+            "location": f"room_{(i * 7) % n_rooms}",
+            "properties": ["takeable"],
+        }
+        for i in range(n_objects)
+    ]
+    (game_dir / "objects" / "objects.json").write_text(json.dumps(objects))
+
+    n_events = int(n_rooms * events_per_room)
+    events = [
+        {
+            "id": f"event_{i}",
+            "trigger": "after_action",
+            "conditions": [
+                {"type": "action_is", "target": "take"},
+                {"type": "action_target_is", "target": f"obj_{i % max(1, n_objects)}"},
+                {"type": "flag_not_set", "target": f"flag_{i}"},
+            ],
+            "effects": [
+                {"type": "set_flag", "target": f"flag_{i}"},
+                {"type": "print_message", "target": f"Event {i} fires."},
+            ],
+        }
+        for i in range(n_events)
+    ]
+    (game_dir / "events" / "events.json").write_text(json.dumps(events))
+    (game_dir / "verbs" / "verbs.json").write_text(json.dumps([
+        {"id": "take", "names": ["take", "get"]},
+    ]))
+
+
+def _time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench(label: str, game_dir: str, repeat: int, workers: int) -> None:
+    cache = WorldCache(game_dir)
+    if cache.path.exists():
+        cache.path.unlink()
+
+    cold = _time(lambda: load_world(game_dir, use_cache=False), repeat)
+    loader = GameLoader(game_dir, workers=workers)
+    parallel = None
+    if workers > 1:
+        with gc_paused():
+            parallel = _time(loader.load, repeat)
+    compile_time = _time(lambda: compile_world(game_dir), 1)
+    hash_time = _time(cache.source_hash, repeat)
+    warm = _time(lambda: load_world(game_dir), repeat)
+    world = load_world(game_dir)
+    size_kb = cache.path.stat().st_size / 1024
+    cache.path.unlink()
+
+    print(f"{label}: {len(world.all_rooms())} rooms, {len(world.all_objects())} objects")
+    print(f"  json load + validate + index: {cold * 1000:10.1f} ms")
+    if parallel is not None:
+        print(f"  {f'json load, {workers} workers:':<29} {parallel * 1000:10.1f} ms")
+        for stats in loader.stats.values():
+            print(f"    {stats}")
+    print(f"  compile:                      {compile_time * 1000:10.1f} ms ({size_kb:.0f} KB)")
+    print(f"  cached load:                  {warm * 1000:10.1f} ms "
+          f"({hash_time * 1000:.1f} ms of it hashing sources)")
+    print(f"  speedup:                      {cold / warm:10.1f}x")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("game_dir", nargs="?", default=os.path.join(ROOT, "games", "zork1"))
+    arg_parser.add_argument("--synthetic-rooms", type=int, default=100_000,
+                            help="Size of the generated world, 0 to skip (default: 100000)")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Processes for the parallel JSON load, 1 to skip")
+    args = arg_parser.parse_args()
+
+    bench(os.path.basename(os.path.normpath(args.game_dir)), args.game_dir, args.repeat, args.workers)
+    if args.synthetic_rooms:
+        with tempfile.TemporaryDirectory() as tmp:
+            game_dir = Path(tmp) / "synthetic"
+            write_synthetic_game(game_dir, args.synthetic_rooms)
+            bench("synthetic", str(game_dir), args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Load test the game server with many concurrent TCP sessions.
+
+Starts ``server.main`` in a subprocess (one event loop, so one core), opens
+``--sessions`` connections that each play ``--turns`` commands, and reports
+throughput, turn latency percentiles and server memory per session.
+Sessions-per-core is estimated from the measured service time and an
+assumed player think time between commands.
+
+    python3 scripts/load_test_server.py games/zork1 --sessions 1000 --turns 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from server.game_server import PROMPT  # noqa: E402
+
+COMMANDS = [
+    "look", "inventory", "open mailbox", "read leaflet", "north", "south",
+    "east", "west", "take leaflet", "drop leaflet", "examine mailbox", "wait",
+]
+PROMPT_BYTES = f"\n{PROMPT}".encode()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_kb(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def _connect(host: str, port: int):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    await reader.readuntil(PROMPT_BYTES)
+    return reader, writer
+
+
+async def _play(reader, writer, turns: int, offset: int, latencies: list[float]):
+    for i in range(turns):
+        command = COMMANDS[(offset + i) % len(COMMANDS)]
+        start = time.perf_counter()
+        writer.write(f"{command}\n".encode())
+        await reader.readuntil(PROMPT_BYTES)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+async def run(args: argparse.Namespace, host: str, port: int, server_pid: int | None):
+    latencies: list[float] = []
+
+    rss_before = _rss_kb(server_pid) if server_pid else None
+    connect_start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_connect(host, port) for _ in range(args.sessions)), return_exceptions=True
+    )
+    connect_elapsed = time.perf_counter() - connect_start
+    rss_after = _rss_kb(server_pid) if server_pid else None
+    streams = [r for r in results if not isinstance(r, BaseException)]
+    failed = len(results) - len(streams)
+    if failed:
+        print(f"{failed} sessions failed to connect: {next(r for r in results if isinstance(r, BaseException))!r}")
+    if not streams:
+        return
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _play(reader, writer, args.turns, i, latencies)
+        for i, (reader, writer) in enumerate(streams)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    n_turns = len(latencies)
+    throughput = n_turns / elapsed
+    print(f"sessions:        {len(streams)}")
+    print(f"connect:         {connect_elapsed * 1000:.0f} ms for all sessions "
+          f"({connect_elapsed / len(streams) * 1e6:.0f} us/session)")
+    if rss_before is not None and rss_after is not None:
+        per_session = (rss_after - rss_before) / len(streams)
+        print(f"server memory:   {rss_before / 1024:.1f} MB idle, "
+              f"{rss_after / 1024:.1f} MB connected ({per_session:.1f} KB/session)")
+    print(f"turns:           {n_turns} in {elapsed:.2f} s ({throughput:.0f} turns/s on one core)")
+    print(f"latency p50:     {_percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"latency p95:     {_percentile(latencies, 95) * 1000:.2f} ms")
+    print(f"latency p99:     {_percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"latency max:     {latencies[-1] * 1000:.2f} ms")
+    # A core saturates when sessions * (1 / think_time) == throughput
+    print(f"sessions/core:   ~{int(throughput * args.think_time)} "
+          f"at one command every {args.think_time:g} s per player")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("game_dir", nargs="?", default=os.path.join(ROOT, "games", "zork1"))
+    arg_parser.add_argument("--sessions", type=int, default=500)
+    arg_parser.add_argument("--turns", type=int, default=20)
+    arg_parser.add_argument("--think-time", type=float, default=5.0,
+                            help="Seconds between commands for a typical player (default: 5)")
+    arg_parser.add_argument("--connect", metavar="HOST:PORT",
+                            help="Use an already running server instead of starting one")
+    args = arg_parser.parse_args()
+
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        asyncio.run(run(args, host, int(port), None))
+        return
+
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "server.main", args.game_dir,
+         "--port", str(port), "--save-dir", os.path.join(ROOT, ".load_test_saves")],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = proc.stdout.readline()
+        if not line.startswith("Listening"):
+            print("Server failed to start")
+            sys.exit(1)
+        asyncio.run(run(args, "127.0.0.1", port, proc.pid))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
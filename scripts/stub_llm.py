@@ -0,0 +1,128 @@
+"""Stand-in for llama_cpp.Llama for benchmarks that must run without a model.
+
+StubLlama implements the parts of the llama-cpp-python API the parser uses
+(create_chat_completion, save_state/load_state, tokenize) and charges a
+fixed time per prompt token evaluated and per token generated. Like
+llama-cpp-python it keeps the tokens currently in its KV cache and only
+evaluates the part of a new prompt after the longest common prefix, so
+prompt-reuse optimisations show up in its timings the way they would on a
+real model. Answers come from FallbackParser applied to the player input
+quoted in the user prompt.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.parser.fallback_parser import FallbackParser  # noqa: E402
+from engine.parser.parser_interface import ParserContext  # noqa: E402
+
+_TOKEN = re.compile(r"\w+|[^\w\s]|\s+")
+_PLAYER_INPUT = re.compile(r'Player input: "(.*)"')
+
+
+class StubLlama:
+    def __init__(self, prefill_ms_per_token: float = 0.2, decode_ms_per_token: float = 4.0):
+        self.prefill_s = prefill_ms_per_token / 1000
+        self.decode_s = decode_ms_per_token / 1000
+        self._input_ids: list[int] = []
+        self._vocab: dict[str, int] = {}
+        self._fallback = FallbackParser()
+        # Counters for the benchmarks
+        self.prompt_tokens = 0
+        self.prefilled_tokens = 0
+        self.generated_tokens = 0
+        self.last_prefill_seconds = 0.0
+
+    def tokenize(self, text: bytes, add_bos: bool = True, special: bool = False) -> list[int]:
+        ids = [self._vocab.setdefault(t, len(self._vocab) + 1) for t in _TOKEN.findall(text.decode())]
+        return [0] + ids if add_bos else ids
+
+    def save_state(self) -> list[int]:
+        return list(self._input_ids)
+
+    def load_state(self, state: list[int]):
+        self._input_ids = list(state)
+
+    def create_chat_completion(self, messages, max_tokens: int = 16, **kwargs) -> dict:
+        prompt = "".join(f"<|im_start|>{m['role']}\n{m['content']}<|im_end|>\n" for m in messages)
+        prompt += "<|im_start|>assistant\n"
+        content = self._answer(messages[-1]["content"])
+        output = self.tokenize(content.encode(), add_bos=False)[:max_tokens]
+        self._prefill(self.tokenize(prompt.encode()))
+        self._decode(output)
+        return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+    def _prefill(self, tokens: list[int]):
+        reused = 0
+        for a, b in zip(self._input_ids, tokens[:-1]):
+            if a != b:
+                break
+            reused += 1
+        new_tokens = len(tokens) - reused
+        start = time.perf_counter()
+        time.sleep(new_tokens * self.prefill_s)
+        self.last_prefill_seconds = time.perf_counter() - start
+        self._input_ids = tokens
+        self.prompt_tokens += len(tokens)
+        self.prefilled_tokens += new_tokens
+
+    def _decode(self, tokens: list[int]):
+        time.sleep(len(tokens) * self.decode_s)
+        self._input_ids = self._input_ids + tokens
+        self.generated_tokens += len(tokens)
+
+    def _answer(self, user_prompt: str) -> str:
+        match = _PLAYER_INPUT.search(user_prompt)
+        if not match:
+            return "{}"
+        command = self._fallback.parse(match.group(1), ParserContext())
+        return json.dumps(command.model_dump(exclude_none=True, exclude={"raw_input"}))
+
+
+class StubBatchBackend:
+    """InferenceScheduler backend that decodes a batch of sequences together.
+
+    Models a memory-bound decoder: one decode step for the whole batch costs
+    ``decode_ms_per_token`` plus ``batch_overhead`` of that for each extra
+    sequence, so larger batches raise throughput at some latency cost. A
+    system prompt is prefilled once and then shared by every sequence, as a
+    server with prompt caching would; user prompts are always prefilled.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 8,
+        prefill_ms_per_token: float = 0.2,
+        decode_ms_per_token: float = 4.0,
+        batch_overhead: float = 0.1,
+    ):
+        self.max_batch = max_batch
+        self.prefill_s = prefill_ms_per_token / 1000
+        self.decode_s = decode_ms_per_token / 1000
+        self.batch_overhead = batch_overhead
+        self._llm = StubLlama()
+        self._cached_prefixes: set[str] = set()
+
+    def complete_batch(self, requests: list[dict]) -> list[str]:
+        prompt_tokens = 0
+        contents = []
+        steps = 0
+        for request in requests:
+            system, user = request["messages"][0]["content"], request["messages"][-1]["content"]
+            if system not in self._cached_prefixes:
+                self._cached_prefixes.add(system)
+                prompt_tokens += len(self._llm.tokenize(system.encode()))
+            prompt_tokens += len(self._llm.tokenize(user.encode()))
+            content = self._llm._answer(user)
+            steps = max(steps, len(self._llm.tokenize(content.encode(), add_bos=False)))
+            contents.append(content)
+        step_s = self.decode_s * (1 + self.batch_overhead * (len(requests) - 1))
+        time.sleep(prompt_tokens * self.prefill_s + steps * step_s)
+        return contents
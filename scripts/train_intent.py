@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Train the intent model used by IntentParser from logged parses.
+
+Examples are ParsedCommands with their ``raw_input``, read from JSON lines
+files (one ``ParsedCommand.model_dump_json()`` per line) and/or parse
+cache files written with --parse-cache-file, whose entries are the LLM's
+answers. A held-out share is used to report verb accuracy, how often the
+parser would answer at the given confidence and how accurate those
+answers are, and the per-command latency.
+
+    python3 scripts/train_intent.py --jsonl parses.jsonl --cache parse_cache.db \\
+        -o intent_model.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.models.command import ParsedCommand  # noqa: E402
+from engine.parser.intent_parser import IntentModel, IntentParser, mask_names  # noqa: E402
+from engine.parser.parser_interface import ParserContext  # noqa: E402
+
+
+def read_jsonl(path: str) -> list[ParsedCommand]:
+    with open(path) as f:
+        return [ParsedCommand.model_validate_json(line) for line in f if line.strip()]
+
+
+def read_parse_cache(path: str) -> list[ParsedCommand]:
+    db = sqlite3.connect(path)
+    try:
+        rows = db.execute("SELECT command FROM parse_cache").fetchall()
+    finally:
+        db.close()
+    return [ParsedCommand.model_validate_json(row[0]) for row in rows]
+
+
+def _context_for(command: ParsedCommand, verbs: list[str]) -> ParserContext:
+    """A context holding just the command's own objects, as the game would show."""
+    objects = [o for o in (command.direct_object, command.indirect_object) if o]
+    return ParserContext(visible_objects=objects, valid_verbs=verbs)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arg_parser.add_argument("--jsonl", action="append", default=[], help="JSON lines of ParsedCommands")
+    arg_parser.add_argument("--cache", action="append", default=[], help="Parse cache SQLite file")
+    arg_parser.add_argument("-o", "--output", default="intent_model.json")
+    arg_parser.add_argument("--holdout", type=float, default=0.2)
+    arg_parser.add_argument("--epochs", type=int, default=10)
+    arg_parser.add_argument("--min-confidence", type=float, default=0.8)
+    args = arg_parser.parse_args()
+
+    commands = [c for path in args.jsonl for c in read_jsonl(path)]
+    commands += [c for path in args.cache for c in read_parse_cache(path)]
+    commands = [c for c in commands if c.raw_input.strip()]
+    if not commands:
+        sys.exit("No training examples found")
+
+    random.Random(0).shuffle(commands)
+    split = int(len(commands) * (1 - args.holdout))
+    train, test = commands[:split], commands[split:] or commands[:split]
+
+    start = time.perf_counter()
+    model = IntentModel.train(train, epochs=args.epochs)
+    print(f"Trained on {len(train)} commands, {len(model.labels)} verbs "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    verbs = model.labels
+    parser = IntentParser(model, next_parser=None, min_confidence=args.min_confidence)
+    verb_hits = answered = exact = 0
+    latencies = []
+    for command in test:
+        context = _context_for(command, verbs)
+        start = time.perf_counter()
+        result = parser.classify(command.raw_input, context)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        predicted, _ = model.predict(mask_names(command.raw_input, context.visible_objects))
+        verb_hits += predicted == command.verb
+        if result is not None:
+            answered += 1
+            exact += result.model_dump(exclude={"raw_input"}) == command.model_dump(exclude={"raw_input"})
+
+    print(f"Held out {len(test)} commands")
+    print(f"  verb accuracy:   {verb_hits / len(test):.1%}")
+    print(f"  answered:        {answered / len(test):.1%} at confidence >= {args.min_confidence}")
+    if answered:
+        print(f"  exact when answered: {exact / answered:.1%}")
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"  latency:         p50 {statistics.median(latencies):.0f} us, p99 {p99:.0f} us")
+
+    model.save(args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Network server hosting many game sessions in one process."""
@@ -0,0 +1,256 @@
+"""Asyncio game server: line-based TCP plus an optional WebSocket listener."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Callable
+
+from engine.game_engine import GameRuntime, GameSession
+from engine.parser.fallback_parser import FallbackParser
+from engine.parser.parser_interface import ParserInterface
+from engine.parser.speculation import SpeculationStats
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+PROMPT = "> "
+# Starts a line/message carrying the input the player is still typing
+PARTIAL_PREFIX = "/partial "
+# Least time between two speculations of the same line, in seconds
+PARTIAL_INTERVAL = 0.25
+MAX_LINE_BYTES = 4096
+LISTEN_BACKLOG = 1024
+
+
+class GameServer:
+    """Hosts one game for many concurrent players.
+
+    The game directory is loaded and validated once into a GameRuntime;
+    every connection gets its own GameSession sharing that runtime and
+    parser, so a session only costs its GameState and RNG. With
+    ``region_budget`` the runtime loads rooms lazily by region (see
+    RegionalWorld) instead of holding the whole world in memory.
+
+    TCP clients send one command per line and receive the game output
+    followed by a ``"> "`` prompt. WebSocket clients send one command per
+    text message and receive one message per response.
+
+    Clients may also send ``"/partial <text>"`` while the player types (on
+    a pause, say). Nothing is answered; the text is parsed speculatively
+    so the parse is ready if the player then sends that same command.
+    ``speculation_stats`` tracks hits and the parse time saved. Partials
+    are only parsed when they look like a whole command, and at most once
+    per ``partial_interval`` seconds until the line is sent: a stale
+    speculation can hold the model while the real line waits (see
+    Speculator), so a chatty client must not keep it busy.
+    """
+
+    def __init__(
+        self,
+        game_dir: str,
+        parser_factory: Callable[[], ParserInterface] = FallbackParser,
+        save_dir: str = "saves",
+        debug: bool = False,
+        region_budget: int | None = None,
+        cache_path: str | None = None,
+        partial_interval: float = PARTIAL_INTERVAL,
+    ):
+        self.game_dir = game_dir
+        self.save_dir = save_dir
+        self.debug = debug
+        self.runtime = GameRuntime.load(
+            game_dir, region_budget=region_budget, cache_path=cache_path
+        )
+        self.world = self.runtime.world
+        self.parser = parser_factory()
+        self.sessions: dict[int, GameSession] = {}
+        self.speculation_stats = SpeculationStats()
+        self.partial_interval = partial_interval
+        # Session id -> time.monotonic() of its last speculation this line
+        self._last_speculation: dict[int, float] = {}
+        self._next_session_id = 1
+        self._servers: list = []
+
+    # --- Session handling (transport independent) ---
+
+    def open_session(self) -> tuple[int, str]:
+        """Start a new player session. Returns (session_id, intro text)."""
+        session_id = self._next_session_id
+        self._next_session_id += 1
+        # Session ids restart with the server; a random save directory keeps
+        # a new player from restoring a previous player's saves
+        session = self.runtime.new_session(
+            self.parser,
+            save_dir=os.path.join(self.save_dir, f"session_{uuid.uuid4().hex}"),
+            debug=self.debug,
+            speculation_stats=self.speculation_stats,
+        )
+        self.sessions[session_id] = session
+        title = self.world.config.title
+        return session_id, f"{title}\n\n{session.start_game()}"
+
+    def close_session(self, session_id: int):
+        session = self.sessions.pop(session_id, None)
+        self._last_speculation.pop(session_id, None)
+        if session is not None:
+            session.speculator.cancel()
+
+    def handle_input(self, session_id: int, input_text: str) -> tuple[str, bool]:
+        """Run one command for a session. Returns (output, session_finished)."""
+        session = self.sessions[session_id]
+        self._last_speculation.pop(session_id, None)
+        return self._finish_turn(session, session.process_input(input_text))
+
+    async def handle_input_async(self, session_id: int, input_text: str) -> tuple[str, bool]:
+        """``handle_input`` that awaits the parser, so a slow model never
+        stalls other connections."""
+        session = self.sessions[session_id]
+        self._last_speculation.pop(session_id, None)
+        return self._finish_turn(session, await session.process_input_async(input_text))
+
+    def handle_partial(self, session_id: int, partial_text: str):
+        """Note what a session's player has typed so far; call on the event loop."""
+        now = time.monotonic()
+        last = self._last_speculation.get(session_id)
+        if last is not None and now - last < self.partial_interval:
+            logger.debug("Session %d: ignoring partial input, too soon", session_id)
+            return
+        if self.sessions[session_id].speculate_async(partial_text):
+            self._last_speculation[session_id] = now
+
+    def _finish_turn(self, session: GameSession, output: str) -> tuple[str, bool]:
+        if output == "__QUIT__":
+            return f"{self._score_text(session)}\nThank you for playing!", True
+        if not session.state.player_alive:
+            output = (
+                f"{output}\n\n   **** You have died ****\n\n"
+                f"{self._score_text(session)}\n"
+                "Type 'restore' to load a saved game or 'quit' to leave."
+            )
+        return output, False
+
+    def _score_text(self, session: GameSession) -> str:
+        state = session.state
+        return (
+            f"Your score is {state.score} (out of {self.world.config.max_score}), "
+            f"in {state.turns} turns.\n"
+            f"This gives you the rank of {session.scoring.get_rank(state)}."
+        )
+
+    # --- Transports ---
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 4000, ws_port: int | None = None
+    ):
+        """Start listening. Use port 0 to pick a free port (see ``addresses``)."""
+        tcp_server = await asyncio.start_server(
+            self._handle_tcp, host, port, limit=MAX_LINE_BYTES, backlog=LISTEN_BACKLOG
+        )
+        self._servers.append(tcp_server)
+        if ws_port is not None:
+            if websockets is None:
+                raise ImportError(
+                    "websockets is required for the WebSocket listener. "
+                    "Install with: pip install websockets"
+                )
+            ws_server = await websockets.serve(
+                self._handle_websocket, host, ws_port, max_size=MAX_LINE_BYTES
+            )
+            self._servers.append(ws_server)
+
+    @property
+    def addresses(self) -> list[tuple[str, int]]:
+        """(host, port) of each listener, TCP first."""
+        return [
+            sock.getsockname()[:2]
+            for server in self._servers
+            for sock in server.sockets
+        ]
+
+    async def serve_forever(self):
+        await asyncio.gather(*(server.wait_closed() for server in self._servers))
+
+    def log_stats(self):
+        """Log what speculation and the parser chain saved since startup."""
+        stats = self.speculation_stats
+        if stats.started:
+            logger.info(
+                "Speculative parses: %.0f%% hit rate, %.0f ms of parsing done before Enter",
+                stats.hit_rate * 100,
+                stats.saved_seconds * 1000,
+            )
+        for line in self.parser.stats():
+            logger.info("%s", line)
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+
+    async def _handle_tcp(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        session_id, intro = self.open_session()
+        try:
+            writer.write(f"{intro}\n{PROMPT}".encode())
+            await writer.drain()
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b"Input too long.\n")
+                    break
+                if not line:
+                    break
+                input_text = line.decode("utf-8", errors="replace").strip()
+                if line.startswith(PARTIAL_PREFIX.encode()):
+                    self.handle_partial(session_id, input_text[len(PARTIAL_PREFIX):])
+                    continue
+                if not input_text:
+                    writer.write(PROMPT.encode())
+                    continue
+                output, finished = await self.handle_input_async(session_id, input_text)
+                if finished:
+                    writer.write(f"{output}\n".encode())
+                    break
+                writer.write(f"{output}\n{PROMPT}".encode())
+                await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.close_session(session_id)
+            writer.close()
+
+    async def _handle_websocket(self, connection):
+        session_id, intro = self.open_session()
+        try:
+            await connection.send(intro)
+            async for message in connection:
+                if isinstance(message, bytes):
+                    message = message.decode("utf-8", errors="replace")
+                if message.startswith(PARTIAL_PREFIX):
+                    self.handle_partial(session_id, message[len(PARTIAL_PREFIX):])
+                    continue
+                input_text = message.strip()
+                if not input_text:
+                    continue
+                output, finished = await self.handle_input_async(session_id, input_text)
+                await connection.send(output)
+                if finished:
+                    break
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.close_session(session_id)
+            await connection.close()
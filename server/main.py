@@ -0,0 +1,129 @@
+"""Server entry point: host a game for many players over the network."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from cli.main import (
+    add_few_shot_arg,
+    add_parse_cache_args,
+    add_world_cache_arg,
+    create_parser_from_args,
+)
+from server.game_server import GameServer
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Adventure Game Server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    arg_parser.add_argument(
+        "game_dir",
+        help="Path to game data directory",
+    )
+    arg_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on (default: 127.0.0.1)",
+    )
+    arg_parser.add_argument(
+        "--port",
+        type=int,
+        default=4000,
+        help="TCP port for line-based clients, 0 for any free port (default: 4000)",
+    )
+    arg_parser.add_argument(
+        "--ws-port",
+        type=int,
+        default=None,
+        help="Also accept WebSocket clients on this port (requires websockets)",
+    )
+    arg_parser.add_argument(
+        "--parser",
+        choices=["fallback", "llm", "hybrid"],
+        default="fallback",
+        help="Parser to use; hybrid only calls the LLM for input the "
+             "keyword parser is unsure of (default: fallback)",
+    )
+    arg_parser.add_argument(
+        "--model",
+        help="Path to LLM model file (required for --parser llm/hybrid "
+             "unless --llm-server-url is given)",
+    )
+    arg_parser.add_argument(
+        "--llm-server-url",
+        metavar="URL",
+        help="Parse on a llama.cpp server started with --parallel 8 instead "
+             "of loading the model; requests from all sessions are batched",
+    )
+    arg_parser.add_argument(
+        "--intent-model",
+        help="Intent model from scripts/train_intent.py, tried before the parser",
+    )
+    arg_parser.add_argument(
+        "--llm-workers",
+        type=int,
+        default=None,
+        help="Run the model in this many worker processes shared by all "
+             "sessions; sessions fall back to the keyword parser when all are busy",
+    )
+    add_few_shot_arg(arg_parser)
+    add_parse_cache_args(arg_parser)
+    add_world_cache_arg(arg_parser)
+    arg_parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Show debug output (parsed commands, state changes)",
+    )
+    arg_parser.add_argument(
+        "--save-dir",
+        default="saves",
+        help="Directory for save files, one subdirectory per session (default: saves)",
+    )
+
+    arg_parser.add_argument(
+        "--region-budget-mb",
+        type=float,
+        default=None,
+        help="Load rooms lazily by region, keeping about this many MB of room files resident",
+    )
+
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    try:
+        server = GameServer(
+            game_dir=args.game_dir,
+            parser_factory=lambda: create_parser_from_args(args),
+            save_dir=args.save_dir,
+            debug=args.debug,
+            region_budget=(
+                None if args.region_budget_mb is None
+                else int(args.region_budget_mb * 1024 * 1024)
+            ),
+            cache_path=args.world_cache,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Failed to load game: {e}")
+        sys.exit(1)
+
+    async def run():
+        await server.start(args.host, args.port, ws_port=args.ws_port)
+        for host, port in server.addresses:
+            print(f"Listening on {host}:{port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.log_stats()
+
+
+if __name__ == "__main__":
+    main()
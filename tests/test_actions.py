@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import pytest
+
 from engine.actions.builtin_actions import registry
+from engine.actions.effects import EffectApplier
+from engine.actions.event_compiler import EventCompiler
+from engine.actions.preconditions import PreconditionChecker
 from engine.models.command import ParsedCommand
-from engine.models.enums import ObjectProperty
+from engine.models.enums import ConditionType, EffectType, ObjectProperty
+from engine.models.event import Condition, Effect, Event
 
 
 class TestLook:
@@ -211,3 +217,76 @@ class TestAttack:
         # With 5 damage sword vs 5 health guard, should be dead
         assert not state.npc_states["guard"].alive
         assert "guard_dead" in state.flags
+
+
+class TestEventCompiler:
+    CONDITIONS = [
+        Condition(type=ConditionType.PLAYER_IN_ROOM, target="start_room"),
+        Condition(type=ConditionType.PLAYER_IN_ROOM, target="east_room"),
+        Condition(type=ConditionType.PLAYER_HAS_ITEM, target="key"),
+        Condition(type=ConditionType.OBJECT_IN_ROOM, target="lamp"),
+        Condition(type=ConditionType.OBJECT_IN_ROOM, target="sword", value="east_room"),
+        Condition(type=ConditionType.OBJECT_HAS_PROPERTY, target="box", value="openable"),
+        Condition(type=ConditionType.FLAG_SET, target="door_unlocked"),
+        Condition(type=ConditionType.FLAG_NOT_SET, target="door_unlocked"),
+        Condition(type=ConditionType.COUNTER_GTE, target="moves", value=2),
+        Condition(type=ConditionType.COUNTER_LTE, target="moves", value="2"),
+        Condition(type=ConditionType.COUNTER_EQ, target="moves", value=3),
+        Condition(type=ConditionType.ACTION_IS, target="take"),
+        Condition(type=ConditionType.ACTION_TARGET_IS, target="key"),
+    ]
+
+    def test_conditions_match_checker(self, state):
+        compiler = EventCompiler()
+        checker = PreconditionChecker()
+        state.counters["moves"] = 3
+        state.inventory.append("key")
+        for condition in self.CONDITIONS:
+            fn = compiler.compile_condition(condition)
+            for verb_id, obj_id in [("take", "key"), ("drop", None)]:
+                expected = checker.check(
+                    condition, state, verb_id=verb_id, direct_object_id=obj_id
+                )
+                assert fn(state, verb_id, obj_id) == expected, condition
+
+    def test_effects_match_applier(self, state, world):
+        effects = [
+            Effect(type=EffectType.PRINT_MESSAGE, value="Hello."),
+            Effect(type=EffectType.MOVE_OBJECT, target="key", value="player"),
+            Effect(type=EffectType.MOVE_OBJECT, target="apple", value="east_room"),
+            Effect(type=EffectType.SET_FLAG, target="f"),
+            Effect(type=EffectType.INCREMENT_COUNTER, target="c"),
+            Effect(type=EffectType.INCREMENT_COUNTER, target="c", value=4),
+            Effect(type=EffectType.SET_COUNTER, target="d", value="7"),
+            Effect(type=EffectType.ADD_SCORE, value=3),
+            Effect(type=EffectType.SET_OBJECT_PROPERTY, target="box", value="open"),
+            Effect(type=EffectType.DESTROY_OBJECT, target="book"),
+            Effect(type=EffectType.MOVE_PLAYER, target="east_room"),
+            Effect(type=EffectType.KILL_PLAYER),
+        ]
+        expected_state = state.model_copy(deep=True)
+        expected = EffectApplier().apply_all(effects, expected_state)
+        event = Event(id="e", trigger="after_action", effects=effects)
+        actual = EventCompiler().compile_event(event).apply(state)
+        assert actual == expected
+        assert state.model_dump() == expected_state.model_dump()
+
+    def test_bad_operand_raises_only_when_evaluated(self, state):
+        compiler = EventCompiler()
+        fn = compiler.compile_condition(
+            Condition(type=ConditionType.OBJECT_HAS_PROPERTY, target="box", value="shiny")
+        )
+        with pytest.raises(ValueError):
+            fn(state, None, None)
+
+    def test_compiled_event_short_circuits(self, state):
+        event = Event(
+            id="e",
+            trigger="before_action",
+            conditions=[
+                Condition(type=ConditionType.ACTION_IS, target="take"),
+                Condition(type=ConditionType.COUNTER_EQ, target="c", value="not a number"),
+            ],
+        )
+        compiled = EventCompiler().compile_event(event)
+        assert not compiled.check(state, "drop", None)
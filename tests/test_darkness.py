@@ -58,3 +58,53 @@ class TestDarkness:
         assert msg is not None
         assert "run out" in msg.lower()
         assert not state.has_object_property("lamp", ObjectProperty.LIT)
+
+    def test_lighting_schedules_timers(self, state, world):
+        ds = DarknessSystem()
+        state.inventory.append("lamp")
+        state.add_object_property("lamp", ObjectProperty.LIT)
+        state.turns = 1
+        assert ds.tick_light_sources(state, world) is None
+        # 50 units of fuel: dim at 20 left, out after the 50th tick
+        assert state.timers == {"burnout:lamp": 50, "dim:lamp": 30}
+
+    def test_dim_then_burnout(self, state, world):
+        ds = DarknessSystem()
+        state.inventory.append("lamp")
+        state.add_object_property("lamp", ObjectProperty.LIT)
+        messages = []
+        for turn in range(1, 51):
+            state.turns = turn
+            messages.append(ds.tick_light_sources(state, world))
+        assert messages[:29] == [None] * 29
+        assert messages[29:49] == ["The lamp is getting dim."] * 20
+        assert messages[49] == "The lamp has run out of power."
+        assert not state.has_object_property("lamp", ObjectProperty.LIT)
+        assert state.timers == {}
+
+    def test_turning_off_banks_fuel(self, state, world):
+        ds = DarknessSystem()
+        state.inventory.append("lamp")
+        state.add_object_property("lamp", ObjectProperty.LIT)
+        for turn in range(1, 11):
+            state.turns = turn
+            ds.tick_light_sources(state, world)
+        state.remove_object_property("lamp", ObjectProperty.LIT)
+        state.turns = 11
+        ds.tick_light_sources(state, world)
+        assert state.timers == {}
+        assert state.counters["fuel_lamp"] == 40
+
+    def test_timers_survive_save_and_load(self, state, world, tmp_path):
+        from engine.state.state_manager import StateManager
+        ds = DarknessSystem()
+        state.inventory.append("lamp")
+        state.add_object_property("lamp", ObjectProperty.LIT)
+        state.turns = 1
+        ds.tick_light_sources(state, world)
+
+        manager = StateManager(tmp_path)
+        manager.save(state, "lamp")
+        loaded = manager.load("lamp")
+        loaded.turns = 50
+        assert ds.tick_light_sources(loaded, world) == "The lamp has run out of power."
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from engine.game_engine import GameRuntime
+from engine.parser.fallback_parser import FallbackParser
+
 
 class TestEngineStartup:
     def test_start_game(self, engine):
@@ -67,6 +70,15 @@ class TestEngineMeta:
         engine.process_input("restore")
         assert "key" in engine.state.inventory
 
+    def test_save_rejects_path_in_slot(self, engine, tmp_path):
+        engine.state_manager.save_dir = tmp_path / "saves"
+        engine.start_game()
+        output = engine.process_input("save ../../pwned")
+        assert "not a valid save slot" in output
+        assert not list(tmp_path.rglob("*.json"))
+        output = engine.process_input("restore ../pwned")
+        assert "not a valid save slot" in output
+
     def test_turn_counter(self, engine):
         engine.start_game()
         engine.process_input("look")
@@ -85,3 +97,74 @@ class TestEngineScoring:
         output = engine.process_input("score")
         assert "0" in output
         assert "Beginner" in output
+
+
+class TestGameSession:
+    def test_sessions_share_runtime_but_not_state(self, tiny_world_dir):
+        runtime = GameRuntime.load(tiny_world_dir)
+        parser = FallbackParser()
+        first = runtime.new_session(parser)
+        second = runtime.new_session(parser)
+        assert first.world is second.world
+
+        first.start_game()
+        second.start_game()
+        first.process_input("take key")
+        first.process_input("north")
+        assert "key" in first.state.inventory
+        assert first.state.current_room == "north_room"
+        assert "key" not in second.state.inventory
+        assert second.state.current_room == "start_room"
+        assert "key" in second.state.objects_in_room("start_room")
+        assert runtime.initial_state.turns == 0
+        assert "key" not in runtime.initial_state.inventory
+
+    def test_seeded_sessions_roll_the_same(self, tiny_world_dir):
+        runtime = GameRuntime.load(tiny_world_dir)
+        outputs = []
+        for _ in range(2):
+            session = runtime.new_session(FallbackParser(), seed=7)
+            session.start_game()
+            session.process_input("east")
+            outputs.append([session.process_input("wait") for _ in range(10)])
+        assert outputs[0] == outputs[1]
+
+
+class TestParserContextCache:
+    def test_reused_while_nothing_changes(self, engine):
+        engine.start_game()
+        first = engine._build_parser_context()
+        engine.process_input("look")
+        engine.process_input("examine box")
+        assert engine._build_parser_context() is first
+
+    def test_rebuilt_after_take(self, engine):
+        engine.start_game()
+        first = engine._build_parser_context()
+        engine.process_input("take key")
+        context = engine._build_parser_context()
+        assert context is not first
+        assert context.version != first.version
+        assert "brass key" in context.inventory
+        assert "brass key" not in context.visible_objects
+
+    def test_rebuilt_after_opening_container(self, engine):
+        engine.start_game()
+        assert "gold coin" not in engine._build_parser_context().visible_objects
+        engine.process_input("open box")
+        assert "gold coin" in engine._build_parser_context().visible_objects
+
+    def test_rebuilt_after_moving_and_restore(self, engine):
+        engine.start_game()
+        engine.process_input("save")
+        start = engine._build_parser_context()
+        engine.process_input("north")
+        assert engine._build_parser_context().exits != start.exits
+        engine.process_input("restore")
+        assert engine._build_parser_context().exits == start.exits
+
+    def test_verbs_built_once_per_world(self, engine):
+        engine.start_game()
+        context = engine._build_parser_context()
+        assert context.valid_verbs is engine.world.parser_verbs
+        assert "look" in context.valid_verbs
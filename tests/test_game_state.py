@@ -7,7 +7,7 @@ import tempfile
 from pathlib import Path
 
 from engine.models.enums import ObjectProperty
-from engine.state.game_state import GameState, ObjectState
+from engine.state.game_state import GameState, NPCState, ObjectState
 from engine.state.state_manager import StateManager
 
 
@@ -55,6 +55,162 @@ class TestGameState:
         assert "coin" in state.objects_in_container("box")
 
 
+class TestLocationIndex:
+    def test_set_object_location_moves_between_rooms(self):
+        state = GameState(current_room="room1")
+        state.set_object_location("key", "room1")
+        state.set_object_location("key", "room2")
+        assert state.objects_in_room("room1") == []
+        assert state.objects_in_room("room2") == ["key"]
+
+    def test_set_object_parent_leaves_room(self):
+        state = GameState(current_room="room1")
+        state.set_object_location("coin", "room1")
+        state.set_object_parent("coin", "box")
+        assert state.objects_in_room("room1") == []
+        assert state.objects_in_container("box") == ["coin"]
+        state.set_object_location("coin", "room1")
+        assert state.objects_in_container("box") == []
+
+    def test_direct_field_mutation(self):
+        state = GameState(current_room="room1")
+        state.object_states["lamp"] = ObjectState(location="room1")
+        state.object_states["lamp"].location = "room2"
+        assert state.objects_in_room("room2") == ["lamp"]
+        assert state.objects_in_room("room1") == []
+
+    def test_replace_and_delete_entries(self):
+        state = GameState(current_room="room1")
+        state.object_states["lamp"] = ObjectState(location="room1")
+        state.object_states["lamp"] = ObjectState(location="room2")
+        assert state.objects_in_room("room1") == []
+        del state.object_states["lamp"]
+        assert state.objects_in_room("room2") == []
+
+    def test_order_matches_object_states(self):
+        state = GameState(current_room="room1")
+        for oid in ["a", "b", "c"]:
+            state.object_states[oid] = ObjectState(location="room1")
+        state.set_object_location("a", None)
+        state.set_object_location("a", "room1")
+        assert state.objects_in_room("room1") == ["a", "b", "c"]
+
+    def test_npc_moves_and_dies(self):
+        state = GameState(current_room="room1")
+        state.npc_states["troll"] = NPCState(location="room1")
+        assert state.npc_in_room("room1") == ["troll"]
+        state.npc_states["troll"].location = "room2"
+        assert state.npc_in_room("room1") == []
+        assert state.npc_in_room("room2") == ["troll"]
+        state.npc_states["troll"].alive = False
+        assert state.npc_in_room("room2") == []
+
+    def test_changed_objects(self):
+        state = GameState(current_room="room1")
+        state.object_states["box"] = ObjectState(location="room1")
+        state.object_states["coin"] = ObjectState(location="room1")
+        assert state.pop_changed_objects() == {"box", "coin"}
+        assert state.pop_changed_objects() == set()
+        state.set_object_parent("coin", "box")
+        state.inventory.append("key")
+        assert state.pop_changed_objects() == {"coin", "key"}
+
+    def test_timers(self):
+        state = GameState(current_room="room1")
+        state.schedule_timer("a", 3)
+        state.schedule_timer("b", 1)
+        state.schedule_timer("c", 2)
+        state.cancel_timer("c")
+        state.schedule_timer("a", 2)
+        state.turns = 2
+        assert state.pop_due_timers() == ["b", "a"]
+        assert state.pop_due_timers() == []
+        assert state.timers == {}
+
+    def test_light_changes(self):
+        state = GameState(current_room="room1")
+        state.object_states["lamp"] = ObjectState(properties={ObjectProperty.LIT})
+        state.object_states["torch"] = ObjectState()
+        assert state.pop_light_changes() == {"lamp"}
+        state.add_object_property("torch", ObjectProperty.LIT)
+        state.remove_object_property("lamp", ObjectProperty.LIT)
+        state.add_object_property("torch", ObjectProperty.OPEN)
+        assert state.pop_light_changes() == {"lamp", "torch"}
+
+    def test_reassigning_state_dict_reindexes(self):
+        state = GameState(current_room="room1")
+        state.object_states = {"key": ObjectState(location="room3")}
+        assert state.objects_in_room("room3") == ["key"]
+        state.object_states["key"].location = "room4"
+        assert state.objects_in_room("room4") == ["key"]
+
+    def test_clone_is_independent(self):
+        state = GameState(current_room="room1", timers={"dim:lamp": 5})
+        state.object_states["lamp"] = ObjectState(
+            location="room1", properties={ObjectProperty.LIT}
+        )
+        state.npc_states["thief"] = NPCState(location="room1", inventory=["coin"])
+        copy = state.clone()
+        assert copy == state
+
+        copy.object_states["lamp"].location = "room2"
+        copy.object_states["lamp"].properties.add(ObjectProperty.OPEN)
+        copy.npc_states["thief"].inventory.append("gem")
+        copy.inventory.append("key")
+        assert copy.objects_in_room("room2") == ["lamp"]
+        assert state.objects_in_room("room1") == ["lamp"]
+        assert state.object_states["lamp"].properties == {ObjectProperty.LIT}
+        assert state.npc_states["thief"].inventory == ["coin"]
+        assert state.inventory == []
+        assert copy.pop_due_timers() == []
+        copy.turns = 5
+        assert copy.pop_due_timers() == ["dim:lamp"]
+        assert state.timers == {"dim:lamp": 5}
+
+    def test_version_tracks_context_changes(self):
+        state = GameState(current_room="room1", inventory=["key"])
+        state.object_states["box"] = ObjectState(location="room1")
+        state.npc_states["troll"] = NPCState(location="room1")
+        seen = [state.version]
+        for change in (
+            lambda: state.inventory.remove("key"),
+            lambda: state.inventory.append("key"),
+            lambda: state.set_object_location("box", "room2"),
+            lambda: state.add_object_property("box", ObjectProperty.OPEN),
+            lambda: state.remove_object_property("box", ObjectProperty.OPEN),
+            lambda: setattr(state.npc_states["troll"], "alive", False),
+            lambda: setattr(state, "inventory", []),
+        ):
+            change()
+            assert state.version > seen[-1]
+            seen.append(state.version)
+        state.score += 10
+        assert state.version == seen[-1]
+
+    def test_inventory_replacement_reports_both_items(self):
+        state = GameState(current_room="room1", inventory=["key", "lamp", "coin"])
+        state.pop_changed_objects()
+        state.inventory[0] = "sword"
+        assert state.pop_changed_objects() == {"key", "sword"}
+        state.inventory[1:] = (item for item in ["gem"])
+        assert state.inventory == ["sword", "gem"]
+        assert state.pop_changed_objects() == {"lamp", "coin", "gem"}
+
+    def test_reordering_inventory_changes_version(self):
+        state = GameState(current_room="room1", inventory=["lamp", "key"])
+        for change in (
+            lambda: state.inventory.sort(),
+            lambda: state.inventory.reverse(),
+        ):
+            version = state.version
+            change()
+            assert state.version > version
+        state.pop_changed_objects()
+        state.inventory *= 2
+        assert state.inventory == ["lamp", "key", "lamp", "key"]
+        assert state.pop_changed_objects() == {"lamp", "key"}
+
+
 class TestStateManager:
     def test_save_and_load(self):
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -72,6 +228,23 @@ class TestStateManager:
             assert "test_flag" in loaded.flags
             assert "key" in loaded.inventory
 
+    def test_index_survives_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = StateManager(tmpdir)
+            state = GameState(current_room="room1")
+            state.object_states["box"] = ObjectState(location="room1")
+            state.object_states["coin"] = ObjectState(parent_object="box")
+            state.npc_states["troll"] = NPCState(location="room1")
+
+            manager.save(state, "test")
+            loaded = manager.load("test")
+
+            assert loaded.objects_in_room("room1") == ["box"]
+            assert loaded.objects_in_container("box") == ["coin"]
+            assert loaded.npc_in_room("room1") == ["troll"]
+            loaded.set_object_location("coin", "room1")
+            assert loaded.objects_in_room("room1") == ["box", "coin"]
+
     def test_load_nonexistent(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             manager = StateManager(tmpdir)
@@ -88,3 +261,14 @@ class TestStateManager:
             saves = manager.list_saves()
             assert "save1" in saves
             assert "save2" in saves
+
+    def test_rejects_slots_outside_save_dir(self, tmp_path):
+        import pytest
+        manager = StateManager(tmp_path / "saves")
+        state = GameState(current_room="test")
+        for slot in ("../escaped", "/tmp/escaped", "a/b", "..", ""):
+            with pytest.raises(ValueError):
+                manager.save(state, slot)
+            with pytest.raises(ValueError):
+                manager.load(slot)
+        assert not list(tmp_path.rglob("*.json"))
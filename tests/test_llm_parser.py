@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+import os
+import time
+from unittest.mock import MagicMock
 
 import pytest
 
-from engine.models.command import ParsedCommand
 from engine.parser.parser_interface import ParserContext
 from engine.parser.prompt_builder import PromptBuilder
 
@@ -103,30 +105,71 @@ class TestPromptBuilder:
         assert prompt.strip().endswith("Output:")
 
 
+class TestExampleSelection:
+    def test_selects_similar_examples(self):
+        from engine.parser.example_selector import ExampleSelector
+
+        selected = ExampleSelector().select("please light the lamp", k=2)
+        assert selected[0]["input"] in ("light the lantern", "turn on the lamp")
+        assert len(selected) == 2
+
+    def test_candidate_verbs(self):
+        from engine.parser.example_selector import ExampleSelector
+
+        selector = ExampleSelector()
+        verbs = selector.candidate_verbs("stab the troll with my sword", ["look", "attack", "take", "go"])
+        assert verbs[0] == "attack"
+        assert "go" not in verbs
+        # Named verbs come first; with no clue at all every verb is kept
+        assert selector.candidate_verbs("look", ["go", "look"])[0] == "look"
+        assert selector.candidate_verbs("qqqq", ["go", "look"]) == ["go", "look"]
+
+    def test_selected_prompt(self, context):
+        from engine.parser.example_selector import ExampleSelector
+
+        builder = PromptBuilder(ExampleSelector(), k=3)
+        system = builder.build_system_prompt(context)
+        assert "Examples:" not in system
+        assert ", ".join(context.valid_verbs) not in system
+        user = builder.build_user_prompt("hit the troll with my sword", context)
+        assert user.count("Input:") == 3
+        assert "Likely verbs: attack" in user
+        assert 'Player input: "hit the troll with my sword"' in user
+
+    def test_selected_prompt_is_shorter(self, context):
+        from engine.parser.example_selector import ExampleSelector
+        from engine.parser.prompt_builder import estimate_tokens
+
+        def size(builder):
+            return estimate_tokens(
+                builder.build_system_prompt(context)
+                + builder.build_user_prompt("open the mailbox", context)
+            )
+
+        assert size(PromptBuilder(ExampleSelector(), k=3)) < size(PromptBuilder())
+
+    def test_parser_few_shot(self, context):
+        from engine.parser.llm_parser import LLMParser
+
+        llm = MagicMock()
+        llm.create_chat_completion.return_value = _make_llm_response({"verb": "open", "direct_object": "small mailbox"})
+        parser = LLMParser(llm=llm, prefix_cache=False, few_shot=2)
+        assert parser.parse("open the mailbox", context).verb == "open"
+        messages = llm.create_chat_completion.call_args.kwargs["messages"]
+        assert messages[1]["content"].count("Input:") == 2
+
+
 class TestLLMParserMocked:
     """Test LLMParser with mocked Llama class."""
 
     def _make_parser(self, mock_llama_cls):
         """Create an LLMParser with a mocked Llama instance."""
-        with patch.dict("sys.modules", {"llama_cpp": MagicMock()}):
-            # We need to re-import to pick up the mock
-            import importlib
-            import engine.parser.llm_parser as llm_module
-            importlib.reload(llm_module)
-
-            mock_instance = MagicMock()
-            mock_llama_cls.return_value = mock_instance
-
-            # Patch Llama at module level
-            llm_module.Llama = mock_llama_cls
-            parser = llm_module.LLMParser.__new__(llm_module.LLMParser)
-            parser.llm = mock_instance
-            parser.prompt_builder = PromptBuilder()
-            parser._schema = ParsedCommand.model_json_schema()
-            from engine.parser.fallback_parser import FallbackParser
-            parser._fallback = FallbackParser()
-
-            return parser, mock_instance
+        from engine.parser.llm_parser import LLMParser
+
+        mock_instance = MagicMock()
+        mock_llama_cls.return_value = mock_instance
+        parser = LLMParser(llm=mock_instance, prefix_cache=False)
+        return parser, mock_instance
 
     def test_successful_parse(self, context):
         mock_llama_cls = MagicMock()
@@ -180,7 +223,8 @@ class TestLLMParserMocked:
         # Should fall back to FallbackParser — "take lamp" is understood by keyword parser
         result = parser.parse("take lamp", context)
         assert result.verb == "take"
-        assert result.direct_object == "lamp"
+        assert result.direct_object == "brass lantern"
+        assert result.fell_back
 
     def test_fallback_on_exception(self, context):
         mock_llama_cls = MagicMock()
@@ -222,3 +266,521 @@ class TestLLMParserMocked:
         assert result.direct_object == "troll"
         assert result.indirect_object == "elvish sword"
         assert result.preposition == "with"
+
+
+class TestPrefixCache:
+    def _make_parser(self):
+        from engine.parser.llm_parser import LLMParser
+
+        mock_llm = MagicMock()
+        mock_llm.create_chat_completion.return_value = _make_llm_response({"verb": "look"})
+        mock_llm.save_state.side_effect = lambda: object()
+        return LLMParser(llm=mock_llm), mock_llm
+
+    def test_prefix_evaluated_once(self, context):
+        parser, mock_llm = self._make_parser()
+        parser.parse("look", context)
+        parser.parse("look around", context)
+        parser.parse("l", context)
+
+        # One priming call plus one call per parse
+        assert mock_llm.create_chat_completion.call_count == 4
+        assert mock_llm.save_state.call_count == 1
+        assert mock_llm.load_state.call_count == 2
+        priming = mock_llm.create_chat_completion.call_args_list[0].kwargs
+        assert priming["messages"][1]["content"] == ""
+        assert priming["max_tokens"] == 1
+
+    def test_snapshot_per_system_prompt(self, context):
+        parser, mock_llm = self._make_parser()
+        other = ParserContext(valid_verbs=["look", "dance"])
+        parser.parse("look", context)
+        parser.parse("look", other)
+        parser.parse("look", context)
+
+        assert mock_llm.save_state.call_count == 2
+        restored = mock_llm.load_state.call_args.args[0]
+        system_prompt = parser.prompt_builder.build_system_prompt(context)
+        assert restored is parser._prefix_states[system_prompt]
+
+    def test_snapshots_are_bounded(self):
+        from engine.parser.llm_parser import PREFIX_CACHE_SIZE
+
+        parser, _ = self._make_parser()
+        for i in range(PREFIX_CACHE_SIZE + 2):
+            parser.parse("look", ParserContext(valid_verbs=["look", f"verb{i}"]))
+        assert len(parser._prefix_states) == PREFIX_CACHE_SIZE
+
+
+class TestInferenceScheduler:
+    class _Backend:
+        def __init__(self, max_batch, fail=False):
+            self.max_batch = max_batch
+            self.fail = fail
+            self.batches = []
+
+        def complete_batch(self, requests):
+            self.batches.append(len(requests))
+            if self.fail:
+                raise RuntimeError("backend down")
+            return [json.dumps({"verb": r["messages"][-1]["content"]}) for r in requests]
+
+    def _submit(self, scheduler, verb):
+        return scheduler.submit(messages=[{"role": "user", "content": verb}])
+
+    def test_collects_requests_into_batches(self):
+        from engine.parser.batching import InferenceScheduler
+
+        backend = self._Backend(max_batch=4)
+        scheduler = InferenceScheduler(backend, window_ms=200)
+        futures = [self._submit(scheduler, f"verb{i}") for i in range(6)]
+        results = [json.loads(f.result(timeout=5))["verb"] for f in futures]
+        scheduler.close()
+
+        assert results == [f"verb{i}" for i in range(6)]
+        assert backend.batches == [4, 2]
+        assert scheduler.mean_batch_size == 3
+
+    def test_backend_errors_reach_callers(self):
+        from engine.parser.batching import InferenceScheduler
+
+        scheduler = InferenceScheduler(self._Backend(max_batch=2, fail=True), window_ms=0)
+        future = self._submit(scheduler, "look")
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        scheduler.close()
+
+    def test_expired_requests_are_dropped(self):
+        from engine.parser.batching import InferenceScheduler
+
+        backend = self._Backend(max_batch=4)
+        scheduler = InferenceScheduler(backend, window_ms=100)
+        expired = scheduler.submit(
+            deadline=time.monotonic(), messages=[{"role": "user", "content": "look"}]
+        )
+        live = self._submit(scheduler, "take")
+        with pytest.raises(TimeoutError):
+            expired.result(timeout=5)
+        assert json.loads(live.result(timeout=5))["verb"] == "take"
+        scheduler.close()
+        assert backend.batches == [1]
+
+    def test_parser_uses_scheduler(self, context):
+        from engine.parser.batching import InferenceScheduler
+        from engine.parser.llm_parser import LLMParser
+
+        class Backend(self._Backend):
+            def complete_batch(self, requests):
+                self.batches.append(len(requests))
+                return [json.dumps({"verb": "take", "direct_object": "brass lantern"})] * len(requests)
+
+        backend = Backend(max_batch=8)
+        scheduler = InferenceScheduler(backend, window_ms=0)
+        parser = LLMParser(scheduler=scheduler)
+        result = parser.parse("grab the lamp", context)
+        scheduler.close()
+
+        assert result.verb == "take"
+        assert result.raw_input == "grab the lamp"
+        assert backend.batches == [1]
+
+    def test_server_url_option_builds_batching_parser(self):
+        import argparse
+
+        from cli.main import create_parser_from_args
+        from engine.parser.batching import InferenceScheduler, LlamaServerBackend
+
+        args = argparse.Namespace(
+            parser="llm", model=None, llm_server_url="http://127.0.0.1:8080/",
+            parse_cache=False, parse_cache_file=None,
+        )
+        parser = create_parser_from_args(args)
+        assert isinstance(parser.scheduler, InferenceScheduler)
+        assert isinstance(parser.scheduler.backend, LlamaServerBackend)
+        assert parser.scheduler.backend.url == "http://127.0.0.1:8080/v1/chat/completions"
+        parser.scheduler.close()
+
+    def test_parser_falls_back_when_scheduler_fails(self, context):
+        from engine.parser.batching import InferenceScheduler
+        from engine.parser.llm_parser import LLMParser
+
+        scheduler = InferenceScheduler(self._Backend(max_batch=2, fail=True), window_ms=0)
+        result = LLMParser(scheduler=scheduler).parse("look", context)
+        scheduler.close()
+        assert result.verb == "look"
+
+
+class TestAsyncParse:
+    def test_parse_async(self, context):
+        from engine.parser.llm_parser import LLMParser
+
+        llm = MagicMock()
+        llm.create_chat_completion.return_value = _make_llm_response(
+            {"verb": "take", "direct_object": "brass lantern"}
+        )
+        parser = LLMParser(llm=llm, prefix_cache=False)
+        result = asyncio.run(parser.parse_async("grab the lamp", context))
+        assert result.verb == "take"
+        assert result.raw_input == "grab the lamp"
+
+    def test_loop_keeps_running_during_inference(self, context):
+        from engine.parser.llm_parser import LLMParser
+
+        def slow_completion(**kwargs):
+            time.sleep(0.2)
+            return _make_llm_response({"verb": "look"})
+
+        llm = MagicMock()
+        llm.create_chat_completion.side_effect = slow_completion
+        parser = LLMParser(llm=llm, prefix_cache=False)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async def scenario():
+            task = asyncio.create_task(ticker())
+            result = await parser.parse_async("look", context)
+            task.cancel()
+            return result
+
+        assert asyncio.run(scenario()).verb == "look"
+        assert ticks >= 5
+
+    def test_timeout_falls_back(self, context, monkeypatch):
+        from engine.parser import llm_parser
+        from engine.parser.llm_parser import LLMParser
+
+        monkeypatch.setattr(llm_parser, "TIMEOUT_SECONDS", 0.05)
+
+        def slow_completion(**kwargs):
+            time.sleep(0.2)
+            return _make_llm_response({"verb": "attack"})
+
+        llm = MagicMock()
+        llm.create_chat_completion.side_effect = slow_completion
+        parser = LLMParser(llm=llm, prefix_cache=False)
+        result = asyncio.run(parser.parse_async("take lamp", context))
+        assert result.verb == "take"
+
+    def test_deadline_stops_generation_off_main_thread(self, context, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from engine.parser import llm_parser
+        from engine.parser.llm_parser import LLMParser
+
+        monkeypatch.setattr(llm_parser, "TIMEOUT_SECONDS", 0.1)
+        llm = _StreamingLlama('{"verb": "attack", "direct_object": "troll"', delay=0.02)
+        parser = LLMParser(llm=llm, prefix_cache=False)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(parser.parse, "take lamp", context).result()
+        assert time.monotonic() - start < 0.5
+        assert result.verb == "take"
+        assert llm.chunks_sent < 10
+        assert llm.stopping_criteria[0](None, None)
+
+    def test_speculates_off_main_thread(self, context):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from engine.parser.llm_parser import LLMParser
+        from engine.parser.speculation import Speculator
+
+        llm = MagicMock()
+        llm.create_chat_completion.return_value = _make_llm_response(
+            {"verb": "take", "direct_object": "brass lantern"}
+        )
+        speculator = Speculator(LLMParser(llm=llm, prefix_cache=False))
+
+        def typing_then_enter():
+            assert speculator.speculate("grab the lamp", context)
+            return speculator.parse("grab the lamp", context)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(typing_then_enter).result(timeout=5)
+        assert result.direct_object == "brass lantern"
+        assert speculator.stats.hits == 1
+        assert llm.create_chat_completion.call_count == 1
+
+    def test_retry_gets_remaining_budget(self, context, monkeypatch):
+        from engine.parser import llm_parser
+        from engine.parser.llm_parser import LLMParser
+
+        monkeypatch.setattr(llm_parser, "TIMEOUT_SECONDS", 0.1)
+        responses = [_make_bad_response("not json"), _make_llm_response({"verb": "attack"})]
+
+        def slow_completion(**kwargs):
+            time.sleep(0.08)
+            return responses.pop(0)
+
+        llm = MagicMock()
+        llm.create_chat_completion.side_effect = slow_completion
+        result = LLMParser(llm=llm, prefix_cache=False).parse("take lamp", context)
+        # The second answer came after the parse's budget was spent
+        assert result.verb == "take"
+        assert llm.create_chat_completion.call_count == 2
+
+    def test_parse_async_with_scheduler(self, context):
+        from engine.parser.batching import InferenceScheduler
+        from engine.parser.llm_parser import LLMParser
+
+        class Backend:
+            max_batch = 4
+
+            def complete_batch(self, requests):
+                return [json.dumps({"verb": "look"})] * len(requests)
+
+        scheduler = InferenceScheduler(Backend(), window_ms=0)
+        result = asyncio.run(LLMParser(scheduler=scheduler).parse_async("l", context))
+        scheduler.close()
+        assert result.verb == "look"
+
+
+class TestGrammar:
+    def test_grammar_lists_context_names(self, context):
+        from engine.parser.grammar import build_grammar
+
+        grammar = build_grammar(context)
+        assert '"\\"brass lantern\\""' in grammar
+        assert '"\\"elvish sword\\""' in grammar
+        assert '"\\"troll\\""' in grammar
+        assert '"\\"attack\\""' in grammar
+        assert "grue" not in grammar
+
+    def test_names_are_escaped(self):
+        from engine.parser.grammar import build_grammar
+
+        grammar = build_grammar(ParserContext(visible_objects=['the "odd" box']))
+        assert r'"\"the \\\"odd\\\" box\""' in grammar
+
+    def test_request_carries_grammar(self, context):
+        from engine.parser.llm_parser import LLMParser
+
+        llm = MagicMock()
+        llm.create_chat_completion.return_value = _make_llm_response({"verb": "look"})
+        LLMParser(llm=llm, prefix_cache=False).parse("look", context)
+        kwargs = llm.create_chat_completion.call_args.kwargs
+        assert "object ::=" in kwargs["grammar"]
+        assert "response_format" not in kwargs
+
+    def test_schema_without_grammar(self, context):
+        from engine.parser.llm_parser import LLMParser
+
+        llm = MagicMock()
+        llm.create_chat_completion.return_value = _make_llm_response({"verb": "look"})
+        LLMParser(llm=llm, prefix_cache=False, grammar=False).parse("look", context)
+        kwargs = llm.create_chat_completion.call_args.kwargs
+        assert "grammar" not in kwargs
+        assert kwargs["response_format"]["type"] == "json_object"
+
+    def test_grammar_text_cached_per_context(self, context):
+        from engine.parser.grammar import GrammarCache
+
+        cache = GrammarCache()
+        first = cache.text(context)
+        reordered = ParserContext(
+            visible_objects=list(reversed(context.visible_objects)),
+            inventory=context.inventory,
+            exits=context.exits,
+            valid_verbs=context.valid_verbs,
+            npc_names=context.npc_names,
+            object_aliases=context.object_aliases,
+        )
+        assert cache.text(reordered) is first
+
+
+class _StreamingLlama:
+    """Streams ``text`` a few characters per chunk, then whitespace forever."""
+
+    def __init__(self, text: str, delay: float = 0.0):
+        self.text = text
+        self.delay = delay
+        self.chunks_sent = 0
+        self.stopping_criteria = None
+
+    def create_chat_completion(self, stream=False, stopping_criteria=None, **kwargs):
+        assert stream
+        self.stopping_criteria = stopping_criteria
+        return self._chunks()
+
+    def _chunks(self):
+        yield {"choices": [{"delta": {"role": "assistant"}}]}
+        pieces = [self.text[i:i + 3] for i in range(0, len(self.text), 3)]
+        for piece in pieces + [" \n"] * 200:
+            time.sleep(self.delay)
+            self.chunks_sent += 1
+            yield {"choices": [{"delta": {"content": piece}}]}
+
+
+class TestStreaming:
+    def test_stops_when_object_closes(self):
+        from engine.parser.streaming import stream_content
+
+        text = '{"verb": "take", "direct_object": "brass lantern"}'
+        llm = _StreamingLlama(text)
+        assert stream_content(llm, {"messages": []}) == text
+        assert llm.chunks_sent == (len(text) + 2) // 3
+
+    def test_grammar_stops_after_last_field(self):
+        from engine.parser.streaming import stream_content
+
+        llm = _StreamingLlama('{"verb": "go", "direction": "north"   }')
+        content = stream_content(llm, {"messages": [], "grammar": "root ::= ..."})
+        assert json.loads(content) == {"verb": "go", "direction": "north"}
+        assert llm.chunks_sent == 12
+
+    def test_grammar_stops_after_slot_name(self):
+        from engine.parser.streaming import CommandStream
+
+        stream = CommandStream(grammar=True)
+        assert not stream.feed('{"verb": "take", "direct_object": "sword"')
+        stream = CommandStream(grammar=True)
+        assert stream.feed('{"verb": "save", "direct_object": "slot1"')
+        assert json.loads(stream.content)["direct_object"] == "slot1"
+
+    def test_braces_and_escapes_inside_strings(self):
+        from engine.parser.streaming import CommandStream
+
+        stream = CommandStream()
+        assert not stream.feed('{"verb": "say", "direct_object": "a \\"}\\" b')
+        assert stream.feed('"} trailing')
+        assert json.loads(stream.content)["direct_object"] == 'a "}" b'
+
+    def test_parser_streams(self, context):
+        from engine.parser.llm_parser import LLMParser
+
+        llm = _StreamingLlama('{"verb": "attack", "direct_object": "troll"}')
+        result = LLMParser(llm=llm, prefix_cache=False).parse("kill the troll", context)
+        assert result.verb == "attack"
+        assert result.direct_object == "troll"
+        assert llm.chunks_sent < 20
+
+
+class _EchoLlama:
+    """Worker-side model for the pool tests; answers with the user prompt as verb."""
+
+    def create_chat_completion(self, messages, **kwargs):
+        verb = messages[-1]["content"]
+        if verb == "crash":
+            os._exit(1)
+        if verb == "hang":
+            time.sleep(60)
+        if verb == "ramble" and kwargs.get("stream"):
+            return self._ramble()
+        return _make_llm_response({"verb": verb})
+
+    def _ramble(self):
+        yield {"choices": [{"delta": {"content": '{"verb": "'}}]}
+        while True:
+            time.sleep(0.05)
+            yield {"choices": [{"delta": {"content": "a"}}]}
+
+
+def _broken_llama():
+    raise OSError("no such model")
+
+
+class TestLLMWorkerPool:
+    def _submit(self, pool, verb):
+        return pool.submit(messages=[{"role": "user", "content": verb}])
+
+    def test_requests_run_in_workers(self):
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        pool = LLMWorkerPool(workers=2, llm_factory=_EchoLlama)
+        try:
+            futures = [self._submit(pool, f"verb{i}") for i in range(6)]
+            results = [json.loads(f.result(timeout=30))["verb"] for f in futures]
+        finally:
+            pool.close()
+        assert results == [f"verb{i}" for i in range(6)]
+        assert pool.completed == 6
+
+    def test_saturated_pool_rejects(self):
+        from engine.parser.batching import SchedulerBusyError
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        # The worker is still loading, so nothing leaves the queue
+        pool = LLMWorkerPool(workers=1, max_queue=2, llm_factory=_EchoLlama)
+        try:
+            self._submit(pool, "look")
+            self._submit(pool, "look")
+            with pytest.raises(SchedulerBusyError):
+                self._submit(pool, "look")
+        finally:
+            pool.close()
+        assert pool.rejected == 1
+
+    def test_crashed_worker_is_restarted(self):
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        pool = LLMWorkerPool(workers=1, llm_factory=_EchoLlama)
+        try:
+            with pytest.raises(RuntimeError):
+                self._submit(pool, "crash").result(timeout=30)
+            assert json.loads(self._submit(pool, "look").result(timeout=30))["verb"] == "look"
+        finally:
+            pool.close()
+        assert pool.restarts == 1
+
+    def test_stuck_worker_is_restarted(self):
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        pool = LLMWorkerPool(workers=1, job_timeout=0.5, llm_factory=_EchoLlama)
+        try:
+            with pytest.raises(RuntimeError):
+                self._submit(pool, "hang").result(timeout=30)
+        finally:
+            pool.close()
+        assert pool.restarts == 1
+
+    def test_worker_stops_at_deadline(self):
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        pool = LLMWorkerPool(workers=1, llm_factory=_EchoLlama)
+        try:
+            assert pool.wait_ready(timeout=30)
+            start = time.monotonic()
+            future = pool.submit(
+                deadline=start + 0.5, messages=[{"role": "user", "content": "ramble"}]
+            )
+            with pytest.raises(RuntimeError, match="timed out"):
+                future.result(timeout=30)
+            assert time.monotonic() - start < 5
+            # The worker is free again without being restarted
+            assert json.loads(self._submit(pool, "look").result(timeout=30))["verb"] == "look"
+        finally:
+            pool.close()
+        assert pool.restarts == 0
+
+    def test_expired_queued_request_is_skipped(self):
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        # The worker is still loading, so the request waits past its deadline
+        pool = LLMWorkerPool(workers=1, llm_factory=_EchoLlama)
+        try:
+            future = pool.submit(
+                deadline=time.monotonic(), messages=[{"role": "user", "content": "look"}]
+            )
+            with pytest.raises(TimeoutError, match="expired"):
+                future.result(timeout=30)
+        finally:
+            pool.close()
+        assert pool.completed == 0
+
+    def test_parser_falls_back_when_pool_unavailable(self, context):
+        from engine.parser.llm_parser import LLMParser
+        from engine.parser.worker_pool import LLMWorkerPool
+
+        pool = LLMWorkerPool(workers=1, llm_factory=_broken_llama)
+        try:
+            deadline = time.monotonic() + 30
+            while not pool._workers[0].failed and time.monotonic() < deadline:
+                time.sleep(0.05)
+            result = LLMParser(scheduler=pool).parse("take lamp", context)
+        finally:
+            pool.close()
+        assert result.verb == "take"
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import io
+import json
+
 import pytest
 
 from engine.loader import GameLoader, Validator
+from engine.loader.game_loader import iter_json_array
 
 
 class TestGameLoader:
@@ -42,3 +46,50 @@ class TestValidator:
         errors = validator.validate(game_data)
         assert len(errors) > 0
         assert "nonexistent" in errors[0].message
+
+
+class TestParallelAndStreamingLoad:
+    def _ids(self, data):
+        return [item.id for items in (data.rooms, data.objects, data.npcs, data.verbs, data.events)
+                for item in items]
+
+    def test_stats_per_category(self, tiny_world_dir):
+        progress = []
+        loader = GameLoader(tiny_world_dir, progress=lambda *args: progress.append(args))
+        data = loader.load()
+        assert loader.stats["rooms"].items == len(data.rooms)
+        assert loader.stats["rooms"].files >= 1
+        assert loader.stats["rooms"].bytes > 0
+        assert progress[-1][0] == "events"
+        assert progress[-1][1] == progress[-1][2]
+
+    def test_parallel_matches_sequential(self, tiny_world_dir):
+        sequential = GameLoader(tiny_world_dir).load()
+        parallel = GameLoader(tiny_world_dir, workers=2).load()
+        assert self._ids(parallel) == self._ids(sequential)
+        assert parallel.rooms == sequential.rooms
+
+    def test_streams_large_files(self, tiny_world_dir, monkeypatch):
+        from engine.loader import game_loader
+        sequential = GameLoader(tiny_world_dir).load()
+        monkeypatch.setattr(game_loader, "STREAM_THRESHOLD", 0)
+        monkeypatch.setattr(game_loader, "_STREAM_CHUNK_SIZE", 7)
+        streamed = GameLoader(tiny_world_dir).load()
+        assert self._ids(streamed) == self._ids(sequential)
+        assert streamed.objects == sequential.objects
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+    def test_matches_json_load(self, chunk_size):
+        text = ' [ {"a": [1, 2, {"b": "],"}]}, 12345, "x\\"y", null, -1.5e3 ,[]] '
+        items = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+        assert items == json.loads(text)
+
+    def test_empty_array(self):
+        assert list(iter_json_array(io.StringIO("[ ]"), chunk_size=1)) == []
+
+    @pytest.mark.parametrize("text", ['{"a": 1}', "[1, 2", "[1 2]", '[{"a": }]'])
+    def test_rejects_malformed(self, text):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(text), chunk_size=2))
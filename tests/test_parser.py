@@ -1,8 +1,13 @@
-"""Tests for the fallback parser."""
+"""Tests for the fallback parser and parse cache."""
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+
 from engine.parser.fallback_parser import FallbackParser
+from engine.parser.parse_cache import CachingParser, ParseCache, context_key, normalize_input
 from engine.parser.parser_interface import ParserContext
 
 
@@ -102,3 +107,425 @@ class TestFallbackParser:
         assert cmd.verb == "take_from"
         assert cmd.direct_object == "coin"
         assert cmd.preposition == "from"
+
+
+class TestNameMatching:
+    def setup_method(self):
+        self.parser = FallbackParser()
+        self.context = ParserContext(
+            visible_objects=["brass lantern", "small wooden box", "large wooden box"],
+            inventory=["elvish sword"],
+            npc_names=["troll"],
+            object_aliases={"brass lantern": ["lamp"], "elvish sword": ["blade"]},
+        )
+
+    def test_alias(self):
+        assert self.parser.parse("take the lamp", self.context).direct_object == "brass lantern"
+
+    def test_extra_adjectives(self):
+        cmd = self.parser.parse("take the shiny brass lantern", self.context)
+        assert cmd.direct_object == "brass lantern"
+
+    def test_partial_name(self):
+        assert self.parser.parse("open small box", self.context).direct_object == "small wooden box"
+
+    def test_ambiguous_partial_name_left_to_resolver(self):
+        assert self.parser.parse("open wooden box", self.context).direct_object == "wooden box"
+
+    def test_indirect_alias(self):
+        cmd = self.parser.parse("attack troll with blade", self.context)
+        assert cmd.direct_object == "troll"
+        assert cmd.indirect_object == "elvish sword"
+
+    def test_follows_context_changes(self):
+        self.parser.parse("take lamp", self.context)
+        moved = ParserContext(visible_objects=["rusty lamp"], inventory=["brass lantern"])
+        assert self.parser.parse("take lamp", moved).direct_object == "rusty lamp"
+        assert self.parser.parse("take blade", moved).direct_object == "blade"
+
+
+class _CountingParser(FallbackParser):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse(self, input_text, context):
+        self.calls += 1
+        return super().parse(input_text, context)
+
+
+class TestParseCache:
+    def setup_method(self):
+        self.context = ParserContext(
+            visible_objects=["brass key", "lamp"],
+            exits=["north", "east"],
+            valid_verbs=["take", "drop", "look", "go"],
+        )
+
+    def test_normalize_input(self):
+        assert normalize_input("  Take   the LAMP! ") == "take the lamp"
+
+    def test_context_key_ignores_order(self):
+        reordered = ParserContext(
+            visible_objects=["lamp", "brass key"],
+            exits=["east", "north"],
+            valid_verbs=["take", "drop", "look", "go"],
+        )
+        assert context_key(reordered) == context_key(self.context)
+        assert context_key(ParserContext(visible_objects=["lamp"])) != context_key(self.context)
+
+    def test_repeated_command_hits(self):
+        inner = _CountingParser()
+        parser = CachingParser(inner, ParseCache())
+        first = parser.parse("take lamp", self.context)
+        second = parser.parse("Take  lamp.", self.context)
+        assert inner.calls == 1
+        assert second.verb == first.verb == "take"
+        assert second.direct_object == "lamp"
+        assert second.raw_input == "Take  lamp."
+        assert parser.cache.hits == 1
+        assert parser.cache.misses == 1
+        assert parser.cache.hit_rate == 0.5
+
+    def test_context_change_misses(self):
+        inner = _CountingParser()
+        parser = CachingParser(inner, ParseCache())
+        parser.parse("take lamp", self.context)
+        parser.parse("take lamp", ParserContext(visible_objects=["lamp"]))
+        assert inner.calls == 2
+
+    def test_lru_bound(self):
+        inner = _CountingParser()
+        parser = CachingParser(inner, ParseCache(max_entries=2))
+        for text in ("north", "east", "look", "north"):
+            parser.parse(text, self.context)
+        assert inner.calls == 4
+
+    def test_ttl_expiry(self):
+        inner = _CountingParser()
+        parser = CachingParser(inner, ParseCache(ttl_seconds=-1))
+        parser.parse("look", self.context)
+        parser.parse("look", self.context)
+        assert inner.calls == 2
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "parse_cache.sqlite")
+        cache = ParseCache(path=path)
+        CachingParser(_CountingParser(), cache).parse("take brass key", self.context)
+        cache.close()
+
+        inner = _CountingParser()
+        parser = CachingParser(inner, ParseCache(path=path))
+        command = parser.parse("take brass key", self.context)
+        assert inner.calls == 0
+        assert command.direct_object == "brass key"
+
+    def test_fallback_results_are_not_cached(self, tmp_path):
+        class FailingParser(_CountingParser):
+            def parse(self, input_text, context):
+                command = super().parse(input_text, context)
+                command.fell_back = True
+                return command
+
+            async def parse_async(self, input_text, context):
+                return self.parse(input_text, context)
+
+        inner = FailingParser()
+        cache = ParseCache(path=str(tmp_path / "parse_cache.sqlite"))
+        parser = CachingParser(inner, cache)
+        parser.parse("take lamp", self.context)
+        asyncio.run(parser.parse_async("take lamp", self.context))
+        parser.parse("take lamp", self.context)
+        assert inner.calls == 3
+        assert cache.hits == 0
+        cache.close()
+        assert ParseCache(path=cache.path).get(parser._key("take lamp", self.context)) is None
+
+    def test_async_disk_write_runs_off_the_loop(self, tmp_path, monkeypatch):
+        threads = []
+        store = ParseCache._store
+
+        def recording_store(cache, *args):
+            threads.append(threading.current_thread())
+            store(cache, *args)
+
+        monkeypatch.setattr(ParseCache, "_store", recording_store)
+        path = str(tmp_path / "parse_cache.sqlite")
+        cache = ParseCache(path=path)
+        asyncio.run(CachingParser(_CountingParser(), cache).parse_async("look", self.context))
+        cache.close()
+        assert threads and threads[0] is not threading.main_thread()
+
+        inner = _CountingParser()
+        CachingParser(inner, ParseCache(path=path)).parse("look", self.context)
+        assert inner.calls == 0
+
+    def test_async_disk_read_runs_off_the_loop(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "parse_cache.sqlite")
+        cache = ParseCache(path=path)
+        CachingParser(_CountingParser(), cache).parse("look", self.context)
+        cache.close()
+
+        threads = []
+        read = ParseCache._read
+
+        def recording_read(cache, key):
+            threads.append(threading.current_thread())
+            return read(cache, key)
+
+        monkeypatch.setattr(ParseCache, "_read", recording_read)
+        inner = _CountingParser()
+        cache = ParseCache(path=path)
+        parser = CachingParser(inner, cache)
+        command = asyncio.run(parser.parse_async("look", self.context))
+        assert command.verb == "look"
+        assert inner.calls == 0
+        assert threads and threads[0] is not threading.main_thread()
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_callers_cannot_change_cached_commands(self):
+        parser = CachingParser(_CountingParser(), ParseCache())
+        first = parser.parse("take lamp", self.context)
+        first.direct_object = "brass key"
+        assert parser.parse("take lamp", self.context).direct_object == "lamp"
+
+
+class TestHybridParser:
+    class _LLM:
+        def __init__(self):
+            self.inputs = []
+
+        def parse(self, input_text, context):
+            from engine.models.command import ParsedCommand
+            self.inputs.append(input_text)
+            return ParsedCommand(verb="take", direct_object="brass lantern", raw_input=input_text)
+
+    def setup_method(self):
+        from engine.parser.hybrid_parser import HybridParser
+        self.llm = self._LLM()
+        self.parser = HybridParser(self.llm)
+        self.context = ParserContext(
+            visible_objects=["brass lantern", "small mailbox"],
+            inventory=["sword"],
+            npc_names=["troll"],
+            exits=["north"],
+            object_aliases={"brass lantern": ["lamp", "lantern"]},
+        )
+
+    def test_plain_commands_skip_llm(self):
+        for text in ("n", "go north", "take brass lantern", "take the lamp",
+                     "open small mailbox", "attack troll with sword", "look", ""):
+            self.parser.parse(text, self.context)
+        assert self.llm.inputs == []
+        assert self.parser.fast_path_rate == 1.0
+
+    def test_unsure_input_escalates(self):
+        for text in ("uh pick up that shiny thing", "take the glowing orb",
+                     "i wanna go like west", "put lamp in box"):
+            self.parser.parse(text, self.context)
+        assert len(self.llm.inputs) == 4
+        assert self.parser.fast_path_turns == 0
+
+    def test_counts_turns(self):
+        self.parser.parse("take lamp", self.context)
+        result = self.parser.parse("grab that shiny thing over there", self.context)
+        assert result.direct_object == "brass lantern"
+        assert self.parser.turns == 2
+        assert self.parser.fast_path_rate == 0.5
+
+    def test_stats_cover_wrapped_parsers(self):
+        from engine.parser.hybrid_parser import HybridParser
+        parser = CachingParser(HybridParser(_CountingParser()), ParseCache())
+        assert parser.stats() == []
+        for text in ("take lamp", "take lamp", "grab that shiny thing"):
+            parser.parse(text, self.context)
+        lines = parser.stats()
+        assert lines[0].startswith("Parse cache: 33% hit rate")
+        assert lines[1] == "Keyword fast path: 50% of 2 parses"
+
+
+class TestIntentParser:
+    TRAINING = [
+        ("take the {o}", "take"), ("grab {o}", "take"), ("pick up the {o}", "take"),
+        ("uh get the {o}", "take"), ("i want the {o}", "take"),
+        ("drop the {o}", "drop"), ("put down the {o}", "drop"), ("get rid of the {o}", "drop"),
+        ("open the {o}", "open"), ("um open {o}", "open"), ("pry open the {o}", "open"),
+        ("go {d}", "go"), ("head {d}", "go"), ("walk {d}", "go"), ("uh go like {d}", "go"),
+        ("look", "look"), ("look around", "look"), ("where am i", "look"),
+        ("attack the {o} with the {i}", "attack"), ("hit {o} with {i}", "attack"),
+    ]
+
+    def _commands(self):
+        from engine.models.command import ParsedCommand
+        commands = []
+        for obj, other, direction in (("rope", "knife", "north"), ("bottle", "sword", "west"),
+                                      ("garlic", "axe", "up"), ("leaflet", "stick", "east")):
+            for template, verb in self.TRAINING:
+                text = template.format(o=obj, i=other, d=direction)
+                commands.append(ParsedCommand(
+                    verb=verb,
+                    direct_object=obj if "{o}" in template else None,
+                    indirect_object=other if "{i}" in template else None,
+                    preposition="with" if "{i}" in template else None,
+                    direction=direction if "{d}" in template else None,
+                    raw_input=text,
+                ))
+        return commands
+
+    def setup_method(self):
+        from engine.parser.intent_parser import IntentModel, IntentParser
+        self.model = IntentModel.train(self._commands())
+        self.next_parser = TestHybridParser._LLM()
+        self.parser = IntentParser(self.model, self.next_parser)
+        self.context = ParserContext(
+            visible_objects=["brass lantern", "small mailbox"],
+            inventory=["sword"],
+            npc_names=["troll"],
+            valid_verbs=["take", "drop", "open", "go", "look", "attack"],
+            object_aliases={"brass lantern": ["lamp"]},
+        )
+
+    def test_answers_with_context_names(self):
+        command = self.parser.parse("uh grab the lamp", self.context)
+        assert command.verb == "take"
+        assert command.direct_object == "brass lantern"
+        assert self.next_parser.inputs == []
+
+    def test_tags_indirect_object_and_preposition(self):
+        command = self.parser.parse("hit the troll with the sword", self.context)
+        assert command.verb == "attack"
+        assert command.direct_object == "troll"
+        assert command.indirect_object == "sword"
+        assert command.preposition == "with"
+
+    def test_direction(self):
+        command = self.parser.parse("head south", self.context)
+        assert command.verb == "go"
+        assert command.direction == "south"
+
+    def test_missing_object_passes_on(self):
+        self.parser.parse("take the glowing orb", self.context)
+        assert self.next_parser.inputs == ["take the glowing orb"]
+        assert self.parser.fast_path_rate == 0.0
+
+    def test_name_lookups_are_reused(self, monkeypatch):
+        from engine.parser import intent_parser
+        context = ParserContext(
+            visible_objects=["brass lantern"], valid_verbs=["take"], version=7
+        )
+        self.parser.parse("grab the brass lantern", context)
+        compiled = intent_parser._name_pattern.cache_info().currsize
+        monkeypatch.setattr(intent_parser, "_context_names", None)
+        command = self.parser.parse("pick up the brass lantern", context)
+        assert command.direct_object == "brass lantern"
+        assert intent_parser._name_pattern.cache_info().currsize == compiled
+
+    def test_save_and_load(self, tmp_path):
+        from engine.parser.intent_parser import IntentModel
+        path = str(tmp_path / "intent.json")
+        self.model.save(path)
+        loaded = IntentModel.load(path)
+        assert loaded.predict("pry open the <obj>") == self.model.predict("pry open the <obj>")
+
+
+class _SlowParser(_CountingParser):
+    """Counts parses, each taking ``delay`` seconds (sync and async)."""
+
+    def __init__(self, delay=0.05):
+        super().__init__()
+        self.delay = delay
+        self.cancelled = 0
+
+    def parse(self, input_text, context):
+        time.sleep(self.delay)
+        return super().parse(input_text, context)
+
+    async def parse_async(self, input_text, context):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return super().parse(input_text, context)
+
+
+class TestSpeculation:
+    def setup_method(self):
+        from engine.parser.speculation import Speculator
+
+        self.context = ParserContext(
+            visible_objects=["brass lantern"],
+            valid_verbs=["take", "drop", "look", "go"],
+            object_aliases={"brass lantern": ["lamp"]},
+        )
+        self.inner = _SlowParser()
+        self.speculator = Speculator(self.inner)
+
+    def test_likely_complete(self):
+        from engine.parser.speculation import likely_complete
+
+        assert likely_complete("take the brass lantern", self.context)
+        assert likely_complete("take lamp", self.context)
+        assert likely_complete("go north", self.context)
+        assert likely_complete("look", self.context)
+        assert not likely_complete("take the br", self.context)
+        assert not likely_complete("take the", self.context)
+        assert not likely_complete("", self.context)
+
+    def test_hit_reuses_parse(self):
+        self.speculator.speculate("take lamp", self.context)
+        time.sleep(0.1)
+        result = self.speculator.parse("Take lamp", self.context)
+        assert self.inner.calls == 1
+        assert result.direct_object == "brass lantern"
+        assert result.raw_input == "Take lamp"
+        stats = self.speculator.stats
+        assert (stats.hits, stats.misses, stats.hit_rate) == (1, 0, 1.0)
+        assert 0.04 < stats.saved_seconds < 0.1
+
+    def test_diverged_input_parses_again(self):
+        self.speculator.speculate("take lamp", self.context)
+        result = self.speculator.parse("drop lamp", self.context)
+        assert result.verb == "drop"
+        stats = self.speculator.stats
+        assert (stats.hits, stats.misses, stats.discarded) == (0, 1, 1)
+
+    def test_context_change_misses(self):
+        self.speculator.speculate("take lamp", self.context)
+        moved = ParserContext(visible_objects=["brass lantern"], valid_verbs=["take"])
+        self.speculator.parse("take lamp", moved)
+        assert self.speculator.stats.misses == 1
+
+    def test_async_cancels_stale_speculation(self):
+        async def scenario():
+            self.speculator.speculate_async("take lamp", self.context)
+            await asyncio.sleep(0)
+            self.speculator.speculate_async("drop lamp", self.context)
+            await asyncio.sleep(0.1)
+            return await self.speculator.parse_async("drop lamp", self.context)
+
+        result = asyncio.run(scenario())
+        assert result.verb == "drop"
+        assert self.inner.cancelled == 1
+        assert self.inner.calls == 1
+        assert self.speculator.stats.hits == 1
+
+    def test_parser_stats_count_only_used_speculations(self):
+        from engine.parser.hybrid_parser import HybridParser
+        from engine.parser.speculation import Speculator
+
+        hybrid = HybridParser(self.inner)
+        cache = ParseCache()
+        speculator = Speculator(CachingParser(hybrid, cache))
+        speculator.speculate("take lamp", self.context)
+        time.sleep(0.05)
+        speculator.parse("drop lamp", self.context)
+        # The discarded speculation is not counted
+        assert hybrid.turns == 1
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        speculator.speculate("look", self.context)
+        time.sleep(0.05)
+        speculator.parse("look", self.context)
+        assert hybrid.turns == 2
+        assert (cache.hits, cache.misses) == (0, 2)
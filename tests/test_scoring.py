@@ -36,3 +36,28 @@ class TestScoring:
         # Score again — should get 0
         points, msg = scoring.check_treasure_score(state)
         assert points == 0
+
+    def test_pickup_sets_flag(self, state, world):
+        scoring = ScoringSystem(world)
+        scoring.check_treasure_score(state)
+        state.inventory.append("coin")
+        points, _ = scoring.check_treasure_score(state)
+        assert points == 0
+        assert "picked_up_coin" in state.flags
+
+    def test_only_changed_objects_examined(self, state, world):
+        scoring = ScoringSystem(world)
+        scoring.check_treasure_score(state)
+        # A treasure already in the case is not rescanned on later turns
+        state.object_states["coin"].parent_object = "trophy_case"
+        state.pop_changed_objects()
+        points, msg = scoring.check_treasure_score(state)
+        assert points == 0
+        assert msg is None
+
+    def test_score_after_direct_parent_change(self, state, world):
+        scoring = ScoringSystem(world)
+        scoring.check_treasure_score(state)
+        state.object_states["coin"].parent_object = "trophy_case"
+        points, _ = scoring.check_treasure_score(state)
+        assert points == 5
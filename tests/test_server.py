@@ -0,0 +1,169 @@
+"""Tests for the multi-session game server."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from server.game_server import PROMPT, GameServer
+
+
+@pytest.fixture
+def server(tiny_world_dir, tmp_path):
+    return GameServer(tiny_world_dir, save_dir=str(tmp_path))
+
+
+async def _read_response(reader: asyncio.StreamReader) -> str:
+    data = await reader.readuntil(f"\n{PROMPT}".encode())
+    return data.decode()[: -len(PROMPT) - 1]
+
+
+class TestSessions:
+    def test_sessions_share_world(self, server):
+        first, _ = server.open_session()
+        second, _ = server.open_session()
+        assert server.sessions[first].world is server.sessions[second].world
+        assert server.sessions[first].state is not server.sessions[second].state
+
+    def test_sessions_are_independent(self, server):
+        first, intro = server.open_session()
+        second, _ = server.open_session()
+        assert "Start Room" in intro
+        output, finished = server.handle_input(first, "take key")
+        assert output == "Taken."
+        assert not finished
+        assert "key" not in server.sessions[second].state.inventory
+
+    def test_saves_do_not_outlive_restart(self, tiny_world_dir, tmp_path):
+        first = GameServer(tiny_world_dir, save_dir=str(tmp_path))
+        session_id, _ = first.open_session()
+        first.handle_input(session_id, "take key")
+        first.handle_input(session_id, "save")
+
+        # A restarted server numbers sessions from 1 again
+        second = GameServer(tiny_world_dir, save_dir=str(tmp_path))
+        session_id, _ = second.open_session()
+        output, _ = second.handle_input(session_id, "restore")
+        assert output == "No save found in slot 'quicksave'."
+
+    def test_log_stats(self, server, caplog):
+        server.speculation_stats.record(started=1, hits=1, saved_seconds=0.25)
+        with caplog.at_level("INFO", logger="server.game_server"):
+            server.log_stats()
+        assert "100% hit rate, 250 ms of parsing done before Enter" in caplog.text
+
+    def test_handle_input_async(self, server):
+        session_id, _ = server.open_session()
+        output, finished = asyncio.run(server.handle_input_async(session_id, "take key"))
+        assert output == "Taken."
+        assert not finished
+
+    def test_quit_finishes_session(self, server):
+        session_id, _ = server.open_session()
+        output, finished = server.handle_input(session_id, "quit")
+        assert finished
+        assert "Your score is 0" in output
+
+
+class TestTCP:
+    def test_play_over_tcp(self, server):
+        async def scenario():
+            await server.start("127.0.0.1", 0)
+            host, port = server.addresses[0]
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                intro = await _read_response(reader)
+                assert "Tiny World" in intro
+                assert "Start Room" in intro
+
+                writer.write(b"take key\n")
+                assert await _read_response(reader) == "Taken."
+
+                writer.write(b"quit\n")
+                farewell = await reader.read()
+                assert b"Thank you for playing!" in farewell
+            finally:
+                writer.close()
+                await server.stop()
+
+        asyncio.run(scenario())
+        assert server.sessions == {}
+
+    def test_partial_input_is_parsed_ahead(self, server):
+        async def scenario():
+            await server.start("127.0.0.1", 0)
+            host, port = server.addresses[0]
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                await _read_response(reader)
+                writer.write(b"/partial take the\n/partial take the key\ntake the key\n")
+                assert await _read_response(reader) == "Taken."
+                # A speculation is only a parse: the key is not dropped
+                writer.write(b"/partial drop key\ninventory\n")
+                assert "brass key" in await _read_response(reader)
+            finally:
+                writer.close()
+                await server.stop()
+
+        asyncio.run(scenario())
+        stats = server.speculation_stats
+        assert (stats.started, stats.hits, stats.misses, stats.discarded) == (2, 1, 1, 1)
+
+    def test_partials_are_rate_limited(self, tiny_world_dir, tmp_path):
+        server = GameServer(tiny_world_dir, save_dir=str(tmp_path), partial_interval=0.2)
+
+        async def scenario():
+            session_id, _ = server.open_session()
+            # A flood of complete-looking partials starts one speculation
+            for text in ("take key", "drop key", "take key", "look"):
+                server.handle_partial(session_id, text)
+            await asyncio.sleep(0.25)
+            server.handle_partial(session_id, "drop key")
+            # Sending the line starts the next one afresh
+            await server.handle_input_async(session_id, "drop key")
+            server.handle_partial(session_id, "take key")
+            await server.handle_input_async(session_id, "take key")
+
+        asyncio.run(scenario())
+        stats = server.speculation_stats
+        assert (stats.started, stats.hits) == (3, 2)
+
+    def test_concurrent_tcp_sessions(self, server):
+        async def player(host, port, command):
+            reader, writer = await asyncio.open_connection(host, port)
+            await _read_response(reader)
+            writer.write(f"{command}\n".encode())
+            response = await _read_response(reader)
+            writer.close()
+            return response
+
+        async def scenario():
+            await server.start("127.0.0.1", 0)
+            host, port = server.addresses[0]
+            try:
+                return await asyncio.gather(
+                    *(player(host, port, "take key") for _ in range(20))
+                )
+            finally:
+                await server.stop()
+
+        assert asyncio.run(scenario()) == ["Taken."] * 20
+
+
+class TestWebSocket:
+    def test_play_over_websocket(self, server):
+        websockets = pytest.importorskip("websockets")
+
+        async def scenario():
+            await server.start("127.0.0.1", 0, ws_port=0)
+            host, port = server.addresses[1]
+            try:
+                async with websockets.connect(f"ws://{host}:{port}") as ws:
+                    assert "Start Room" in await ws.recv()
+                    await ws.send("take key")
+                    assert await ws.recv() == "Taken."
+            finally:
+                await server.stop()
+
+        asyncio.run(scenario())
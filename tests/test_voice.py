@@ -0,0 +1,170 @@
+"""Tests for voice input: WAV reading, VAD chunking and the input thread."""
+
+from __future__ import annotations
+
+import threading
+import wave
+from array import array
+
+from cli.voice import (
+    FRAME_SAMPLES,
+    SAMPLE_RATE,
+    EnergyVAD,
+    VoiceInput,
+    VoiceInterface,
+    WavSource,
+    read_wav,
+)
+from tests.conftest import FIXTURES_DIR
+
+# 0.3 s silence, 0.5 s tone, 0.7 s silence, 0.4 s tone, 0.6 s silence
+TWO_UTTERANCES = str(FIXTURES_DIR / "audio" / "two_utterances.wav")
+
+
+class _ScriptedTranscriber:
+    """Returns (or raises) the given lines in order and records what it was given."""
+
+    def __init__(self, *lines: str | Exception):
+        self.lines = list(lines)
+        self.durations: list[float] = []
+
+    def transcribe(self, samples: array) -> str:
+        self.durations.append(len(samples) / SAMPLE_RATE)
+        line = self.lines.pop(0)
+        if isinstance(line, Exception):
+            raise line
+        return line
+
+
+class _TrackedSource:
+    """WavSource that records when it has been read to the end, and closes."""
+
+    def __init__(self, path: str):
+        self.wav = WavSource(path)
+        self.exhausted = threading.Event()
+        self.closed = 0
+
+    def __iter__(self):
+        yield from self.wav
+        self.exhausted.set()
+
+    def close(self):
+        self.closed += 1
+
+
+class TestAudio:
+    def test_read_wav(self):
+        samples = read_wav(TWO_UTTERANCES)
+        assert len(samples) == int(2.5 * SAMPLE_RATE)
+
+    def test_read_wav_mixes_down_and_resamples(self, tmp_path):
+        path = str(tmp_path / "stereo.wav")
+        with wave.open(path, "wb") as f:
+            f.setnchannels(2)
+            f.setsampwidth(2)
+            f.setframerate(32000)
+            f.writeframes(array("h", [1000, 3000] * 32000).tobytes())
+        samples = read_wav(path)
+        assert len(samples) == SAMPLE_RATE
+        assert set(samples) == {2000}
+
+    def test_wav_source_frames(self):
+        frames = list(WavSource(TWO_UTTERANCES))
+        assert all(len(f) == FRAME_SAMPLES for f in frames[:-1])
+        assert sum(len(f) for f in frames) == int(2.5 * SAMPLE_RATE)
+
+
+class TestVAD:
+    def test_splits_utterances(self):
+        vad = EnergyVAD()
+        utterances = [u for u in map(vad.feed, WavSource(TWO_UTTERANCES)) if u]
+        assert vad.flush() is None
+        assert len(utterances) == 2
+        # Speech plus up to the padding on each side
+        assert 0.5 <= utterances[0].duration <= 0.85
+        assert 0.4 <= utterances[1].duration <= 0.75
+
+    def test_drops_short_bursts(self):
+        vad = EnergyVAD(min_speech_ms=150)
+        click = array("h", [8000] * FRAME_SAMPLES)
+        quiet = array("h", [0] * FRAME_SAMPLES)
+        results = [vad.feed(f) for f in [click] + [quiet] * 20]
+        assert not any(results)
+
+    def test_flush_ends_speech_at_end_of_input(self):
+        vad = EnergyVAD()
+        loud = array("h", [8000] * FRAME_SAMPLES)
+        for _ in range(10):
+            assert vad.feed(loud) is None
+        utterance = vad.flush()
+        assert utterance is not None
+        assert utterance.duration == 10 * FRAME_SAMPLES / SAMPLE_RATE
+
+
+class TestVoiceInput:
+    def test_transcribes_in_order(self):
+        transcriber = _ScriptedTranscriber("take key", "north")
+        voice = VoiceInput(WavSource(TWO_UTTERANCES), transcriber)
+        first = voice.next_utterance(timeout=5)
+        second = voice.next_utterance(timeout=5)
+        assert (first.text, second.text) == ("take key", "north")
+        assert first.ended_at <= first.transcribed_at <= first.taken_at
+        assert voice.next_utterance(timeout=5) is None
+
+    def test_skips_empty_transcripts(self):
+        voice = VoiceInput(WavSource(TWO_UTTERANCES), _ScriptedTranscriber("", "look"))
+        assert voice.next_utterance(timeout=5).text == "look"
+        assert voice.next_utterance(timeout=5) is None
+
+    def test_transcription_error_skips_the_utterance(self, caplog):
+        transcriber = _ScriptedTranscriber(RuntimeError("decoder hiccup"), "north")
+        voice = VoiceInput(WavSource(TWO_UTTERANCES), transcriber)
+        assert voice.next_utterance(timeout=10).text == "north"
+        assert voice.next_utterance(timeout=10) is None
+        assert voice.error is None
+        assert voice.stop_reason == "Voice input ended."
+        assert "decoder hiccup" in caplog.text
+
+    def test_repeated_errors_stop_input_with_a_reason(self, monkeypatch, capsys):
+        monkeypatch.setattr("cli.voice.MAX_TRANSCRIPTION_ERRORS", 2)
+        transcriber = _ScriptedTranscriber(RuntimeError("model gone"), RuntimeError("model gone"))
+        voice = VoiceInput(WavSource(TWO_UTTERANCES), transcriber)
+        interface = VoiceInterface(voice)
+        assert interface.get_input() == "quit"
+        assert isinstance(voice.error, RuntimeError)
+        assert "Voice input stopped: model gone" in capsys.readouterr().out
+
+    def test_slow_transcription_does_not_stall_listening(self):
+        release = threading.Event()
+        source = _TrackedSource(TWO_UTTERANCES)
+
+        class Blocking(_ScriptedTranscriber):
+            def transcribe(self, samples):
+                release.wait(timeout=10)
+                return super().transcribe(samples)
+
+        voice = VoiceInput(source, Blocking("take key", "north"))
+        # The whole file is read while the first utterance is still decoding
+        assert source.exhausted.wait(timeout=5)
+        release.set()
+        assert voice.next_utterance(timeout=5).text == "take key"
+        assert voice.next_utterance(timeout=5).text == "north"
+
+    def test_interface_close_closes_the_source_once(self):
+        source = _TrackedSource(TWO_UTTERANCES)
+        interface = VoiceInterface(VoiceInput(source, _ScriptedTranscriber("look", "north")))
+        interface.close()
+        interface.close()
+        assert source.closed == 1
+
+    def test_interface_plays_a_session(self, engine):
+        voice = VoiceInput(WavSource(TWO_UTTERANCES), _ScriptedTranscriber("take key", "inventory"))
+        interface = VoiceInterface(voice)
+        outputs = []
+        while (text := interface.get_input()) != "quit":
+            outputs.append(engine.process_input(text))
+            interface.turn_done()
+        assert outputs[0] == "Taken."
+        assert "key" in outputs[1]
+        assert len(interface.latencies) == 2
+        assert all(latency >= 0 for latency in interface.latencies)
@@ -2,6 +2,13 @@
 
 from __future__ import annotations
 
+import json
+import shutil
+
+import pytest
+
+from engine.world.world_cache import WorldCache
+
 
 class TestWorld:
     def test_get_room(self, world):
@@ -49,3 +56,188 @@ class TestWorld:
     def test_config(self, world):
         assert world.config.title == "Tiny World"
         assert world.config.starting_room == "start_room"
+
+
+class TestEventIndex:
+    def _event(self, event_id, priority=0, **keys):
+        from engine.models import Condition, ConditionType, Event, TriggerType
+        conditions = []
+        if "verb" in keys:
+            conditions.append(Condition(type=ConditionType.ACTION_IS, target=keys["verb"]))
+        if "target" in keys:
+            conditions.append(Condition(type=ConditionType.ACTION_TARGET_IS, target=keys["target"]))
+        if "room" in keys:
+            conditions.append(Condition(type=ConditionType.PLAYER_IN_ROOM, target=keys["room"]))
+        return Event(
+            id=event_id,
+            trigger=TriggerType.AFTER_ACTION,
+            conditions=conditions,
+            priority=priority,
+        )
+
+    def _ids(self, index, *args, **kwargs):
+        return [index.events[pos].id for pos in index.candidates(*args, **kwargs)]
+
+    def test_world_builds_index(self, world):
+        from engine.models import TriggerType
+        index = world.get_event_index(TriggerType.AFTER_ACTION)
+        assert self._ids(index, "unlock", None, "east_room") == ["unlock_door"]
+        assert self._ids(index, "take", "key", "east_room") == []
+
+    def test_unknown_trigger_is_empty(self, world):
+        from engine.models import TriggerType
+        index = world.get_event_index(TriggerType.EACH_TURN)
+        assert index.candidates(None, None, "start_room") == []
+
+    def test_filters_and_preserves_order(self):
+        from engine.world.event_index import EventIndex
+        events = [
+            self._event("any"),
+            self._event("take_lamp", verb="take", target="lamp"),
+            self._event("in_cellar", room="cellar"),
+            self._event("take_anywhere", verb="take"),
+            self._event("open_box", verb="open", target="box"),
+        ]
+        index = EventIndex(events)
+        assert self._ids(index, "take", "lamp", "cellar") == [
+            "any", "take_lamp", "in_cellar", "take_anywhere",
+        ]
+        assert self._ids(index, "take", "key", "kitchen") == ["any", "take_anywhere"]
+        assert self._ids(index, None, None, "cellar") == ["any", "in_cellar"]
+
+    def test_start_skips_earlier_positions(self):
+        from engine.world.event_index import EventIndex
+        events = [self._event("a", room="r"), self._event("b"), self._event("c", room="r")]
+        index = EventIndex(events)
+        assert self._ids(index, None, None, "r", start=1) == ["b", "c"]
+
+
+class TestWorldCache:
+    @pytest.fixture
+    def game_dir(self, tmp_path, tiny_world_dir):
+        game_dir = tmp_path / "tiny_world"
+        shutil.copytree(tiny_world_dir, game_dir)
+        return game_dir
+
+    def test_round_trip(self, game_dir):
+        from engine.game_engine import compile_world, load_world
+        from engine.models import TriggerType
+        path = compile_world(str(game_dir))
+        assert path == game_dir.parent / "tiny_world.worldcache"
+
+        world = WorldCache(game_dir).load()
+        assert world is not None
+        assert world.get_room("start_room").name == "Start Room"
+        assert "key" in world.resolve_object_name("brass key")
+        index = world.get_event_index(TriggerType.AFTER_ACTION)
+        assert len(index.compiled) == len(index.events) > 0
+        assert load_world(str(game_dir)).get_object("key").name == "brass key"
+
+    def test_missing_cache(self, game_dir):
+        assert WorldCache(game_dir).load() is None
+
+    def test_stale_cache_is_ignored(self, game_dir):
+        from engine.game_engine import compile_world
+        compile_world(str(game_dir))
+        config_path = game_dir / "game.json"
+        config = json.loads(config_path.read_text())
+        config["title"] = "Renamed World"
+        config_path.write_text(json.dumps(config))
+        assert WorldCache(game_dir).load() is None
+
+    def test_corrupt_cache_is_ignored(self, game_dir):
+        cache = WorldCache(game_dir)
+        cache.path.write_bytes(b"not a cache")
+        assert cache.load() is None
+
+    def test_engine_uses_cache(self, game_dir):
+        from engine.game_engine import GameEngine, compile_world
+        from engine.parser.fallback_parser import FallbackParser
+        compile_world(str(game_dir))
+        engine = GameEngine(str(game_dir), FallbackParser())
+        engine.start_game()
+        assert "Taken" in engine.process_input("take key")
+        assert "key" in engine.state.inventory
+
+    def test_custom_cache_path(self, game_dir, tmp_path, monkeypatch):
+        from engine import game_engine
+        cache_path = str(tmp_path / "elsewhere.worldcache")
+        game_engine.compile_world(str(game_dir), cache_path)
+
+        def no_json_load(*args, **kwargs):
+            raise AssertionError("loaded the JSON sources instead of the cache")
+
+        monkeypatch.setattr(game_engine, "load_game_data", no_json_load)
+        world = game_engine.load_world(str(game_dir), cache_path=cache_path)
+        assert world.get_room("start_room").name == "Start Room"
+        runtime = game_engine.GameRuntime.load(str(game_dir), cache_path=cache_path)
+        assert runtime.world.get_object("key").name == "brass key"
+
+
+class TestRegionalWorld:
+    @pytest.fixture
+    def game_dir(self, tmp_path, tiny_world_dir):
+        # One region (rooms file) per room
+        game_dir = tmp_path / "tiny_world"
+        shutil.copytree(tiny_world_dir, game_dir)
+        rooms_path = game_dir / "rooms" / "rooms.json"
+        for room in json.loads(rooms_path.read_text()):
+            (game_dir / "rooms" / f"{room['id']}.json").write_text(json.dumps(room))
+        rooms_path.unlink()
+        return game_dir
+
+    def _runtime(self, game_dir, budget):
+        from engine.game_engine import GameRuntime
+        return GameRuntime.load(str(game_dir), region_budget=budget)
+
+    def test_rooms_load_on_demand(self, game_dir):
+        world = self._runtime(game_dir, budget=1 << 20).world
+        assert world.resident_regions() == []
+        assert world.get_room("north_room").name == "North Room"
+        assert world.resident_regions() == ["north_room.json"]
+        assert world.get_room("nowhere") is None
+        assert "key" in world.resolve_object_name("brass key")
+        assert {r.id for r in world.all_rooms()} == {"start_room", "north_room", "east_room"}
+
+    def test_index_is_reused_until_rooms_change(self, game_dir):
+        from engine.game_engine import load_regional_world
+        from engine.loader import GameLoader
+        from engine.world.regions import RegionIndex
+        load_regional_world(str(game_dir), memory_budget=0)
+        loader = GameLoader(game_dir)
+        index = RegionIndex.load(loader)
+        assert index is not None
+        assert index.room_regions["east_room"] == "east_room.json"
+
+        room_path = game_dir / "rooms" / "east_room.json"
+        room_path.write_text(room_path.read_text() + "\n")
+        assert RegionIndex.load(loader) is None
+
+    def test_non_room_edits_are_validated(self, game_dir):
+        from engine.game_engine import load_regional_world
+        from engine.loader import GameLoader
+        from engine.world.regions import RegionIndex
+        load_regional_world(str(game_dir), memory_budget=0)
+
+        objects_path = next((game_dir / "objects").glob("*.json"))
+        objects = json.loads(objects_path.read_text())
+        objects[0]["location"] = "no_such_room"
+        objects_path.write_text(json.dumps(objects))
+        assert RegionIndex.load(GameLoader(game_dir)) is None
+        with pytest.raises(ValueError):
+            load_regional_world(str(game_dir), memory_budget=0)
+
+    def test_evicts_unoccupied_regions(self, game_dir):
+        from engine.parser.fallback_parser import FallbackParser
+        runtime = self._runtime(game_dir, budget=0)
+        world = runtime.world
+        session = runtime.new_session(FallbackParser())
+        session.start_game()
+        world.get_room("north_room")
+        world.get_room("east_room")
+        # The session's region stays; the budget evicts the rest
+        assert world.resident_regions() == ["start_room.json", "east_room.json"]
+
+        assert "North Room" in session.process_input("north")
+        world.get_room("east_room")
+        assert world.resident_regions() == ["north_room.json", "east_room.json"]